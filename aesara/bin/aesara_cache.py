@@ -14,6 +14,7 @@ if sys.platform == "win32":
 import aesara
 import aesara.compile.compiledir
 from aesara import config
+from aesara.compile.function.cache import get_disk_cache
 from aesara.link.c.basic import get_module_cache
 
 
@@ -25,9 +26,22 @@ def print_help(exit_status):
         print(f"command \"{' '.join(sys.argv)}\" not recognized")
     print('Type "aesara-cache" to print the cache location')
     print('Type "aesara-cache help" to print this help')
-    print('Type "aesara-cache clear" to erase the cache')
+    print(
+        'Type "aesara-cache clear" to erase the cache, '
+        "including the cached rewritten graphs"
+    )
     print('Type "aesara-cache list" to print the cache content')
+    print(
+        'Type "aesara-cache warm <path>..." to compile the C modules needed by '
+        "pickled functions or graphs (or directories of them)"
+    )
     print('Type "aesara-cache unlock" to unlock the cache directory')
+    print('Type "aesara-cache index" to rebuild the index of the cache content')
+    print(
+        'Type "aesara-cache evict" to delete the least recently used modules '
+        "until the cache fits within config.cmodule__max_cache_size and "
+        "config.cmodule__max_cache_entries"
+    )
     print(
         'Type "aesara-cache cleanup" to delete keys in the old ' "format/code version"
     )
@@ -61,6 +75,7 @@ def main():
             cache.clear(
                 unversioned_min_age=-1, clear_base_files=True, delete_if_problem=True
             )
+            get_disk_cache().clear()
 
             # Print a warning if some cached modules were not removed, so that the
             # user knows he should manually delete them, or call
@@ -84,6 +99,33 @@ def main():
             aesara.compile.compiledir.cleanup()
             cache = get_module_cache(init_args=dict(do_refresh=False))
             cache.clear_old()
+        elif sys.argv[1] == "index":
+            cache = get_module_cache(init_args=dict(do_refresh=False))
+            n_modules = cache.rebuild_index()
+            print(f"Indexed {n_modules} modules in {cache.index.filename}")
+        elif sys.argv[1] == "evict":
+            if config.cmodule__max_cache_size <= 0 and (
+                config.cmodule__max_cache_entries <= 0
+            ):
+                print(
+                    "No limit is set: set config.cmodule__max_cache_size or "
+                    "config.cmodule__max_cache_entries, e.g. with "
+                    'AESARA_FLAGS="cmodule__max_cache_size=1024"'
+                )
+                sys.exit(1)
+            cache = get_module_cache(init_args=dict(do_refresh=False))
+            n_modules, n_bytes = cache.clear_lru()
+            print(
+                f"Deleted {n_modules} modules, " f"reclaiming {n_bytes / 2**20:.1f} MB"
+            )
+            stats = cache.load_stats()
+            n_requests = sum(stats.values())
+            if n_requests:
+                hit_rate = (stats["hits"] + stats["loads"]) / n_requests
+                print(
+                    f"Cache hit rate: {hit_rate:.1%} "
+                    f"({n_requests} modules requested)"
+                )
         elif sys.argv[1] == "unlock":
             aesara.compile.compilelock.force_unlock(config.compiledir)
             print("Lock successfully removed!")
@@ -94,6 +136,9 @@ def main():
             print(aesara.config.base_compiledir)
         else:
             print_help(exit_status=1)
+    elif len(sys.argv) >= 3 and sys.argv[1] == "warm":
+        n_modules = aesara.compile.compiledir.warm_cache(sys.argv[2:])
+        print(f"Compiled {n_modules} modules in {config.compiledir}")
     elif len(sys.argv) == 3 and sys.argv[1] == "basecompiledir":
         if sys.argv[2] == "list":
             aesara.compile.compiledir.basecompiledir_ls()
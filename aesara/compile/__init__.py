@@ -1,4 +1,4 @@
-from aesara.compile.function.pfunc import pfunc, rebuild_collect_shared
+from aesara.compile.function.pfunc import pfunc, pfunc_maker, rebuild_collect_shared
 from aesara.compile.function.types import (
     AliasedMemoryError,
     Function,
@@ -7,7 +7,9 @@ from aesara.compile.function.types import (
     UnusedInputError,
     alias_root,
     convert_function_input,
+    create_function,
     fgraph_updated_vars,
+    function_maker,
     get_info_on_inputs,
     infer_reuse_pattern,
     insert_deepcopy,
@@ -979,13 +979,14 @@ class OpFromGraph(Op, HasInnerGraph):
 
         return ret
 
-    @property
-    def fn(self):
-        """Lazily compile the inner function graph."""
+    def prepare_fn(self):
         if getattr(self, "_fn", None) is not None:
-            return self._fn
+            return None
 
-        from aesara.compile.function.pfunc import pfunc
+        if getattr(self, "_fn_maker", None) is not None:
+            return self._fn_maker
+
+        from aesara.compile.function.pfunc import pfunc_maker
 
         # We don't want calls/evaluations of this `Op` to change
         # the inner-graph, so we need to clone it
@@ -1008,14 +1009,27 @@ class OpFromGraph(Op, HasInnerGraph):
             )
             wrapped_inputs[in_idx] = updated_wrapped_input
 
-        self._fn = pfunc(
+        self._fn_maker = pfunc_maker(
             wrapped_inputs,
             wrapped_outputs,
             fgraph=fgraph,
             no_default_updates=True,
             **self.kwargs,
         )
+
+        return self._fn_maker
+
+    @property
+    def fn(self):
+        """Lazily compile the inner function graph."""
+        if getattr(self, "_fn", None) is not None:
+            return self._fn
+
+        from aesara.compile.function.types import create_function
+
+        self._fn = create_function(self.prepare_fn())
         self._fn.trust_input = True
+        self._fn_maker = None
 
         return self._fn
 
@@ -1034,7 +1048,8 @@ class OpFromGraph(Op, HasInnerGraph):
 
     def clone(self):
         res = copy(self)
-        res.fgraph = res.fgraph.clone()
+        res.fgraph = res.fgraph.clone(copy_on_write=True)
+        res._fn_maker = None
         return res
 
     def perform(self, node, inputs, outputs):
@@ -11,6 +11,7 @@ import numpy as np
 
 from aesara.configdefaults import config
 from aesara.graph.op import Op
+from aesara.graph.utils import MethodNotDefined
 from aesara.link.c.type import CType
 from aesara.utils import flatten
 
@@ -230,6 +231,78 @@ def print_compiledir_content():
     )
 
 
+def warm_cache(paths, n_workers=None):
+    r"""
+    Compile the C modules needed by pickled functions and graphs.
+
+    Parameters
+    ----------
+    paths
+        Paths to pickled `Function`\s or `FunctionGraph`\s, or to directories
+        containing such files.  Unpickling a `Function` compiles all of its
+        modules.  A `FunctionGraph` is expected to be already rewritten (e.g.
+        ``f.maker.fgraph``): the modules of its nodes are compiled as they
+        would be by the ``cvm`` and ``c|py`` linkers.
+    n_workers
+        The number of modules compiled at the same time.  Defaults to the
+        number of CPUs, or `config.cmodule__compile_workers` if it is larger.
+
+    Returns
+    -------
+    int
+        The number of modules that were compiled.
+
+    """
+    from aesara.compile.function.types import Function
+    from aesara.graph.fg import FunctionGraph
+    from aesara.link.c.basic import get_module_cache, node_clinkers
+
+    if n_workers is None:
+        n_workers = max(config.cmodule__compile_workers, os.cpu_count() or 1)
+
+    filenames = []
+    for path in paths:
+        if os.path.isdir(path):
+            filenames.extend(
+                os.path.join(path, name)
+                for name in sorted(os.listdir(path))
+                if os.path.isfile(os.path.join(path, name))
+            )
+        else:
+            filenames.append(path)
+
+    cache = get_module_cache()
+    n_compiled = cache.stats[2]
+    linkers = []
+    with config.change_flags(cmodule__compile_workers=n_workers):
+        for filename in filenames:
+            with open(filename, "rb") as f:
+                obj = pickle.load(f)
+            if isinstance(obj, FunctionGraph):
+                linkers.extend(node_clinkers(obj.toposort()))
+            elif not isinstance(obj, Function):
+                _logger.warning(
+                    f"Skipping {filename}: expected a pickled Function or "
+                    f"FunctionGraph, got {type(obj).__name__}"
+                )
+
+        # The graphs' modules are compiled together to keep all the workers
+        # busy
+        cache.compile_modules(linkers, n_workers=n_workers)
+        # Compile the modules that couldn't be compiled in parallel, if any,
+        # so that their errors are reported
+        for linker in linkers:
+            try:
+                key = linker.cmodule_key()
+                if key is not None:
+                    cache.module_from_key(key=key, lnk=linker)
+            except (KeyError, NotImplementedError, MethodNotDefined):
+                # These nodes fall back to their Python implementation
+                continue
+
+    return cache.stats[2] - n_compiled
+
+
 def compiledir_purge():
     shutil.rmtree(config.compiledir)
 
@@ -1,10 +1,12 @@
 """
-Locking mechanism to ensure no two compilations occur simultaneously
-in the same compilation directory (which can cause crashes).
+Locking mechanism to ensure no two compilations of the same module occur
+simultaneously, and that the content of a compilation directory isn't modified
+concurrently (which can cause crashes).
 """
+import hashlib
 import os
 import threading
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager
 from typing import Optional, Union
 
 import filelock
@@ -15,8 +17,16 @@ from aesara.configdefaults import config
 __all__ = [
     "force_unlock",
     "lock_ctx",
+    "module_lock_ctx",
 ]
 
+N_MODULE_LOCKS = 256
+"""
+The number of lock files the modules of a compilation directory are spread
+over by `module_lock_ctx`.
+
+"""
+
 
 class ThreadFileLocks(threading.local):
     def __init__(self):
@@ -38,15 +48,24 @@ def force_unlock(lock_dir: os.PathLike):
     fl = filelock.FileLock(os.path.join(lock_dir, ".lock"))
     fl.release(force=True)
 
-    dir_key = f"{lock_dir}-{os.getpid()}"
+    dir_key = _lock_key(lock_dir, ".lock")
 
     if dir_key in local_mem._locks:
         del local_mem._locks[dir_key]
 
 
+def _lock_key(lock_dir, lock_name):
+    if lock_name == ".lock":
+        return f"{lock_dir}-{os.getpid()}"
+    return f"{os.path.join(lock_dir, lock_name)}-{os.getpid()}"
+
+
 @contextmanager
 def lock_ctx(
-    lock_dir: Union[str, os.PathLike] = None, *, timeout: Optional[float] = None
+    lock_dir: Union[str, os.PathLike] = None,
+    *,
+    timeout: Optional[float] = None,
+    lock_name: str = ".lock",
 ):
     """Context manager that wraps around FileLock and SoftFileLock from filelock package.
 
@@ -58,6 +77,8 @@ def lock_ctx(
     timeout
         Timeout in seconds for waiting in lock acquisition.
         Defaults to `aesara.config.compile__timeout`.
+    lock_name
+        The name of the lock file in `lock_dir`.
     """
     if lock_dir is None:
         lock_dir = config.compiledir
@@ -66,11 +87,11 @@ def lock_ctx(
         timeout = config.compile__timeout
 
     # locks are kept in a dictionary to account for changing compiledirs
-    dir_key = f"{lock_dir}-{os.getpid()}"
+    dir_key = _lock_key(lock_dir, lock_name)
 
     if dir_key not in local_mem._locks:
         local_mem._locks[dir_key] = True
-        fl = filelock.FileLock(os.path.join(lock_dir, ".lock"))
+        fl = filelock.FileLock(os.path.join(lock_dir, lock_name))
         fl.acquire(timeout=timeout)
         try:
             yield
@@ -81,3 +102,60 @@ def lock_ctx(
                 del local_mem._locks[dir_key]
     else:
         yield
+
+
+@contextmanager
+def module_lock_ctx(
+    *module_hashes: str,
+    lock_dir: Union[str, os.PathLike] = None,
+    timeout: Optional[float] = None,
+):
+    """Context manager that prevents concurrent compilations of some modules.
+
+    Unlike `lock_ctx`, it doesn't prevent other modules from being compiled at
+    the same time, except for the ones that share a lock file: the modules are
+    spread over `N_MODULE_LOCKS` lock files, kept in the ``lock_dir``
+    sub-directory of `lock_dir`.
+
+    To avoid deadlocks, the lock acquired by `lock_ctx` on the same directory
+    must not be held when entering this context, unless it is held for the
+    whole duration of the context, in which case nothing more is locked.
+
+    Parameters
+    ----------
+    module_hashes
+        The hashes of the modules, as returned by
+        `aesara.link.c.cmodule.get_module_hash`.
+    lock_dir
+        The compilation directory of the modules.
+        Defaults to `aesara.config.compiledir`.
+    timeout
+        Timeout in seconds for waiting in lock acquisition.
+        Defaults to `aesara.config.compile__timeout`.
+    """
+    if lock_dir is None:
+        lock_dir = config.compiledir
+
+    if _lock_key(lock_dir, ".lock") in local_mem._locks:
+        # The whole directory is already locked by this thread
+        yield
+        return
+
+    modules_lock_dir = os.path.join(lock_dir, "lock_dir")
+    os.makedirs(modules_lock_dir, exist_ok=True)
+    lock_indices = {
+        int(hashlib.sha256(module_hash.encode()).hexdigest(), 16) % N_MODULE_LOCKS
+        for module_hash in module_hashes
+    }
+    with ExitStack() as stack:
+        # Locks are always acquired in the same order, so that processes
+        # locking several modules can't deadlock
+        for lock_idx in sorted(lock_indices):
+            stack.enter_context(
+                lock_ctx(
+                    modules_lock_dir,
+                    timeout=timeout,
+                    lock_name=f"module_{lock_idx}.lock",
+                )
+            )
+        yield
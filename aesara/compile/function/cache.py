@@ -0,0 +1,617 @@
+r"""Caches for rewritten `FunctionGraph`\s.
+
+Rewriting is usually the most expensive part of `aesara.function`'s
+compilation pipeline.  The objects in this module allow `FunctionMaker` to skip
+it entirely when a structurally identical graph has already been rewritten with
+the same `Mode` and configuration, and to start from the rewritten form of the
+outputs that it has already seen in other graphs.
+
+"""
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, cast
+
+import aesara
+from aesara.configdefaults import config
+from aesara.graph.basic import Variable, ancestors, clone_get_equiv, io_toposort
+from aesara.graph.destroyhandler import DestroyHandler
+from aesara.graph.features import Feature
+from aesara.graph.rewriting.basic import GraphRewriter
+from aesara.utils import hash_from_code
+
+
+if TYPE_CHECKING:
+    from aesara.compile.io import SymbolicInput
+    from aesara.compile.mode import Mode
+    from aesara.graph.fg import FunctionGraph
+
+
+_logger = logging.getLogger("aesara.compile.function.cache")
+
+RewriteCacheKey = Tuple[Any, ...]
+
+
+def graph_signature(
+    fgraph: "FunctionGraph", input_specs: Optional[Sequence["SymbolicInput"]] = None
+) -> Tuple[Any, ...]:
+    r"""Return a position-independent description of the graph in `fgraph`.
+
+    Two graphs that only differ in the identity of their `Variable`\s and
+    `Apply` nodes have equal signatures.  Inputs are referred to by their
+    position in `FunctionGraph.inputs`, intermediate values by the position of
+    their owner in the topological order and constants by their
+    `Constant.signature`.
+
+    Parameters
+    ----------
+    fgraph
+        The graph to describe.
+    input_specs
+        The wrapped inputs of `fgraph`.  They determine which inputs can be
+        destroyed by in-place rewrites, so they are part of the signature.
+
+    """
+    index: Dict[Variable, Tuple[Any, ...]] = {
+        inp: ("i", i) for i, inp in enumerate(fgraph.inputs)
+    }
+
+    def ref(var):
+        try:
+            return index[var]
+        except KeyError:
+            return ("c", var.signature())
+
+    nodes = []
+    for n_idx, node in enumerate(fgraph.toposort()):
+        nodes.append(
+            (
+                node.op,
+                tuple(ref(inp) for inp in node.inputs),
+                tuple(out.type for out in node.outputs),
+            )
+        )
+        for o_idx, out in enumerate(node.outputs):
+            index[out] = ("n", n_idx, o_idx)
+
+    if input_specs is None:
+        mutable: Tuple[bool, ...] = ()
+    else:
+        mutable = tuple(bool(spec.mutable) for spec in input_specs)
+
+    return (
+        tuple(inp.type for inp in fgraph.inputs),
+        tuple(nodes),
+        tuple(ref(out) for out in fgraph.outputs),
+        tuple(sorted(fgraph.update_mapping.items())),
+        mutable,
+    )
+
+
+def subgraph_signature(
+    fgraph: "FunctionGraph", output: Variable
+) -> Tuple[Tuple[Any, ...], List[Variable]]:
+    r"""Return a position-independent description of the graph of `output`.
+
+    Unlike `graph_signature`, the inputs are referred to by the order in which
+    the graph of `output` uses them, so the signature doesn't depend on the
+    other inputs and outputs of `fgraph`.
+
+    Returns
+    -------
+    signature
+        The description of the graph.
+    inputs
+        The inputs of `fgraph` used by the graph, in the order the signature
+        refers to them.
+
+    """
+    fgraph_inputs = set(fgraph.inputs)
+    inputs: List[Variable] = []
+    index: Dict[Variable, Tuple[Any, ...]] = {}
+
+    def ref(var):
+        try:
+            return index[var]
+        except KeyError:
+            pass
+        if var in fgraph_inputs:
+            index[var] = ("i", len(inputs))
+            inputs.append(var)
+            return index[var]
+        return ("c", var.signature())
+
+    nodes = []
+    for n_idx, node in enumerate(io_toposort(fgraph.inputs, [output])):
+        nodes.append(
+            (
+                node.op,
+                tuple(ref(inp) for inp in node.inputs),
+                tuple(out.type for out in node.outputs),
+            )
+        )
+        for o_idx, out in enumerate(node.outputs):
+            index[out] = ("n", n_idx, o_idx)
+
+    signature = (
+        tuple(inp.type for inp in inputs),
+        tuple(nodes),
+        ref(output),
+    )
+    return signature, inputs
+
+
+def rewrite_query_key(mode: "Mode") -> Optional[RewriteCacheKey]:
+    """Return a key that identifies the rewrites applied by `mode`.
+
+    ``None`` is returned when the rewrites applied by `mode` cannot be
+    identified reliably (e.g. when `mode` uses a custom rewriter or rewrite
+    database instead of a `RewriteDatabaseQuery` on the default ``optdb``).
+
+    """
+    from aesara.compile.mode import optdb
+    from aesara.graph.rewriting.db import RewriteDatabaseQuery
+
+    query = mode.provided_optimizer
+    if (
+        not isinstance(query, RewriteDatabaseQuery)
+        or query.extra_rewrites
+        or mode.optdb is not optdb
+    ):
+        return None
+
+    return (
+        aesara.__version__,
+        config.get_config_hash(c_key_only=False),
+        str(query),
+    )
+
+
+def rewrite_cache_key(
+    fgraph: "FunctionGraph",
+    input_specs: Sequence["SymbolicInput"],
+    mode: "Mode",
+) -> Optional[RewriteCacheKey]:
+    """Return the key under which the rewritten form of `fgraph` is cached.
+
+    ``None`` is returned when the rewrites applied by `mode` cannot be
+    identified reliably (see `rewrite_query_key`), or when the graph contains
+    values that cannot be compared.
+
+    """
+    query_key = rewrite_query_key(mode)
+    if query_key is None:
+        return None
+
+    try:
+        signature = graph_signature(fgraph, input_specs)
+    except Exception:
+        _logger.debug("Unable to compute the signature of the graph", exc_info=True)
+        return None
+
+    return query_key + (signature,)
+
+
+def keys_equal(key_1: RewriteCacheKey, key_2: RewriteCacheKey) -> bool:
+    """Compare two cache keys, treating comparison errors as inequality."""
+    try:
+        return bool(key_1 == key_2)
+    except Exception:
+        return False
+
+
+def install_rewritten_outputs(
+    fgraph: "FunctionGraph", outputs: Sequence[Variable], reason: str
+) -> None:
+    """Replace the outputs of `fgraph` with already rewritten `outputs`.
+
+    The graphs of `outputs` must only depend on ``fgraph.inputs`` and
+    constants.
+
+    """
+    if any(
+        out.owner and out.owner.op.destroy_map
+        for out in ancestors(outputs, blockers=fgraph.inputs)
+    ):
+        fgraph.attach_feature(DestroyHandler())
+
+    for i, out in enumerate(outputs):
+        fgraph.change_node_input("output", i, out, reason=reason)
+
+
+class RewrittenGraphCache:
+    """Base class for caches of rewritten graphs.
+
+    Entries map a key returned by `rewrite_cache_key` to the outputs of the
+    rewritten graph.  `RewrittenGraphCache.get` returns those outputs expressed
+    in terms of the inputs of the `FunctionGraph` that is being compiled.
+
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self, key: RewriteCacheKey, fgraph: "FunctionGraph"
+    ) -> Optional[List[Variable]]:
+        """Return the rewritten outputs cached under `key`, or ``None``."""
+        outputs = self._get(key, fgraph)
+        if outputs is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return outputs
+
+    def add(self, key: RewriteCacheKey, fgraph: "FunctionGraph") -> None:
+        """Cache the outputs of the rewritten graph `fgraph` under `key`."""
+        raise NotImplementedError()
+
+    def _get(
+        self, key: RewriteCacheKey, fgraph: "FunctionGraph"
+    ) -> Optional[List[Variable]]:
+        raise NotImplementedError()
+
+
+class _InputsPickler(pickle.Pickler):
+    """A pickler that stores the inputs of a graph by position."""
+
+    def __init__(self, file, inputs):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.input_positions = {id(inp): i for i, inp in enumerate(inputs)}
+
+    def persistent_id(self, obj):
+        if isinstance(obj, Variable):
+            pos = self.input_positions.get(id(obj))
+            if pos is not None:
+                return ("input", pos)
+        return None
+
+
+class _InputsUnpickler(pickle.Unpickler):
+    """An unpickler that binds the inputs stored by `_InputsPickler`."""
+
+    def __init__(self, file, inputs):
+        super().__init__(file)
+        self.inputs = inputs
+
+    def persistent_load(self, pid):
+        kind, pos = pid
+        if kind != "input":
+            raise pickle.UnpicklingError(f"Unsupported persistent id: {pid}")
+        return self.inputs[pos]
+
+
+class DiskRewrittenGraphCache(RewrittenGraphCache):
+    """A cache of rewritten graphs that persists across processes.
+
+    Each entry is stored in its own file under `dirname`, named after the
+    digest of its key.  Since keys are compared for equality when an entry is
+    loaded, a digest collision only ever results in a cache miss.
+
+    """
+
+    def __init__(self, dirname: str):
+        super().__init__()
+        self.dirname = dirname
+
+    def _filename(self, key: RewriteCacheKey) -> str:
+        digest = hash_from_code(pickle.dumps(key, protocol=pickle.HIGHEST_PROTOCOL))
+        return os.path.join(self.dirname, f"{digest}.pkl")
+
+    def _get(self, key, fgraph):
+        try:
+            filename = self._filename(key)
+            with open(filename, "rb") as f:
+                stored_key, outputs = _InputsUnpickler(f, fgraph.inputs).load()
+        except FileNotFoundError:
+            return None
+        except Exception:
+            _logger.debug("Unable to load a rewritten graph", exc_info=True)
+            return None
+
+        if not keys_equal(stored_key, key):
+            return None
+
+        # Update the access time, so that the age of an entry reflects its
+        # last use rather than its creation
+        try:
+            os.utime(filename)
+        except OSError:
+            pass
+
+        return outputs
+
+    def add(self, key, fgraph):
+        tmp_name = None
+        try:
+            filename = self._filename(key)
+            os.makedirs(self.dirname, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=self.dirname, suffix=".tmp", delete=False
+            ) as f:
+                tmp_name = f.name
+                _InputsPickler(f, fgraph.inputs).dump((key, list(fgraph.outputs)))
+            # The rename is atomic, so concurrent processes never see a
+            # partially written entry
+            os.replace(tmp_name, filename)
+        except Exception:
+            _logger.debug("Unable to store a rewritten graph", exc_info=True)
+            if tmp_name is not None and os.path.exists(tmp_name):
+                os.remove(tmp_name)
+
+    def clear(self) -> None:
+        """Delete all the entries of this cache."""
+        shutil.rmtree(self.dirname, ignore_errors=True)
+
+
+class MemoryRewrittenGraphCache(RewrittenGraphCache):
+    r"""A least-recently-used cache of rewritten graphs for the current process.
+
+    The cached graphs are clones of the rewritten graphs, so that they are not
+    affected by later changes to the `FunctionGraph`\s they were taken from.
+    Every hit returns a new clone bound to the inputs of the graph being
+    compiled.
+
+    """
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+        self.entries: OrderedDict = OrderedDict()
+
+    def _get(self, key, fgraph):
+        try:
+            entry = self.entries.get(key)
+        except TypeError:
+            # The key contains values that cannot be hashed
+            return None
+
+        if entry is None:
+            return None
+
+        self.entries.move_to_end(key)
+
+        stored_inputs, stored_outputs = entry
+        memo = dict(zip(stored_inputs, fgraph.inputs))
+        equiv = clone_get_equiv(
+            stored_inputs, stored_outputs, copy_inputs=False, memo=memo
+        )
+        return [equiv[out] for out in stored_outputs]
+
+    def add(self, key, fgraph):
+        if self.maxsize <= 0:
+            return
+
+        try:
+            hash(key)
+        except TypeError:
+            return
+
+        equiv = clone_get_equiv(fgraph.inputs, fgraph.outputs, copy_orphans=False)
+        self.entries[key] = (
+            [equiv[inp] for inp in fgraph.inputs],
+            [equiv[out] for out in fgraph.outputs],
+        )
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Delete all the entries of this cache."""
+        self.entries.clear()
+
+
+class SubgraphRewriteCache:
+    r"""A least-recently-used cache of the rewritten graphs of single outputs.
+
+    Entries map the signature of the graph of an output (see
+    `subgraph_signature`) and the rewrites applied to it (see
+    `rewrite_query_key`) to the form that graph had just before the in-place
+    rewrites, when it was last compiled.  `FunctionMaker` starts from that form
+    when the graph appears again, possibly among other outputs and inputs,
+    so that most of the rewrites have nothing left to do.
+
+    Like `MemoryRewrittenGraphCache`, the entries are clones, and every hit
+    returns a new clone.
+
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self, key: RewriteCacheKey, inputs: Sequence[Variable]
+    ) -> Optional[Variable]:
+        """Return the rewritten output cached under `key`, or ``None``.
+
+        The returned graph is expressed in terms of `inputs`.
+        """
+        try:
+            entry = self.entries.get(key)
+        except TypeError:
+            # The key contains values that cannot be hashed
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+
+        stored_inputs, stored_output = entry
+        memo = dict(zip(stored_inputs, inputs))
+        equiv = clone_get_equiv(
+            stored_inputs, [stored_output], copy_inputs=False, memo=memo
+        )
+        return cast(Variable, equiv[stored_output])
+
+    def add(
+        self, key: RewriteCacheKey, inputs: Sequence[Variable], output: Variable
+    ) -> None:
+        """Cache the rewritten graph of `output` under `key`."""
+        if self.maxsize <= 0:
+            return
+
+        try:
+            hash(key)
+        except TypeError:
+            return
+
+        equiv = clone_get_equiv(inputs, [output], copy_orphans=False)
+        self.entries[key] = ([equiv[inp] for inp in inputs], equiv[output])
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Delete all the entries of this cache."""
+        self.entries.clear()
+
+
+class PendingSubgraphs(Feature):
+    """Remember the outputs of a graph that are missing from a `SubgraphRewriteCache`.
+
+    `StoreRewrittenSubgraphs` stores their rewritten graphs and detaches this
+    `Feature`.
+
+    """
+
+    def __init__(
+        self,
+        cache: SubgraphRewriteCache,
+        pending: Dict[int, Tuple[RewriteCacheKey, List[Variable]]],
+    ):
+        self.cache = cache
+        # Map the index of an output to its key and inputs
+        self.pending = pending
+
+    def store(self, fgraph: "FunctionGraph") -> None:
+        for idx, (key, inputs) in self.pending.items():
+            output = fgraph.outputs[idx]
+            if any(
+                var.owner and var.owner.op.destroy_map
+                for var in ancestors([output], blockers=fgraph.inputs)
+            ):
+                continue
+            self.cache.add(key, inputs, output)
+
+
+class StoreRewrittenSubgraphs(GraphRewriter):
+    """Store the outputs remembered by `PendingSubgraphs` in their cache."""
+
+    def apply(self, fgraph):
+        for feature in list(fgraph._features):
+            if isinstance(feature, PendingSubgraphs):
+                feature.store(fgraph)
+                fgraph.remove_feature(feature)
+
+
+def lookup_rewritten_subgraphs(
+    fgraph: "FunctionGraph",
+    mode: "Mode",
+    cache: SubgraphRewriteCache,
+    reason: str = "subgraph_rewrite_cache",
+) -> Tuple[int, int]:
+    """Replace the outputs of `fgraph` with their cached rewritten graphs.
+
+    The outputs that are missing from `cache` are remembered by a
+    `PendingSubgraphs` `Feature`, so that `StoreRewrittenSubgraphs` adds them
+    to `cache` while `fgraph` is rewritten.
+
+    Returns
+    -------
+    The number of hits and misses.
+
+    """
+    query_key = rewrite_query_key(mode)
+    if query_key is None:
+        return 0, 0
+
+    hits = 0
+    pending: Dict[int, Tuple[RewriteCacheKey, List[Variable]]] = {}
+    for idx, output in enumerate(fgraph.outputs):
+        if output.owner is None:
+            continue
+
+        try:
+            signature, inputs = subgraph_signature(fgraph, output)
+        except Exception:
+            _logger.debug(
+                "Unable to compute the signature of a subgraph", exc_info=True
+            )
+            continue
+
+        key = query_key + (signature,)
+        rewritten_output = cache.get(key, inputs)
+        if rewritten_output is None:
+            pending[idx] = (key, inputs)
+        else:
+            hits += 1
+            fgraph.change_node_input("output", idx, rewritten_output, reason=reason)
+
+    if pending:
+        fgraph.attach_feature(PendingSubgraphs(cache, pending))
+
+    return hits, len(pending)
+
+
+_memory_cache: Optional[MemoryRewrittenGraphCache] = None
+_disk_cache: Optional[DiskRewrittenGraphCache] = None
+_subgraph_cache: Optional[SubgraphRewriteCache] = None
+
+
+def get_memory_cache() -> MemoryRewrittenGraphCache:
+    """Return the in-process cache of rewritten graphs."""
+    global _memory_cache
+    if _memory_cache is None:
+        _memory_cache = MemoryRewrittenGraphCache(
+            config.compile__rewrite_memory_cache_size
+        )
+    else:
+        _memory_cache.maxsize = config.compile__rewrite_memory_cache_size
+    return _memory_cache
+
+
+def get_disk_cache() -> DiskRewrittenGraphCache:
+    """Return the on-disk cache of rewritten graphs for `config.compiledir`."""
+    global _disk_cache
+    dirname = os.path.join(config.compiledir, "rewritten_graphs")
+    if _disk_cache is None or _disk_cache.dirname != dirname:
+        _disk_cache = DiskRewrittenGraphCache(dirname)
+    return _disk_cache
+
+
+def get_rewritten_graph_caches() -> List[RewrittenGraphCache]:
+    """Return the caches of rewritten graphs enabled by the configuration.
+
+    The caches are returned from the fastest to the slowest one.
+    """
+    caches: List[RewrittenGraphCache] = []
+    if config.compile__rewrite_memory_cache_size > 0:
+        caches.append(get_memory_cache())
+    if config.compile__rewrite_disk_cache:
+        caches.append(get_disk_cache())
+    return caches
+
+
+def get_subgraph_rewrite_cache() -> Optional[SubgraphRewriteCache]:
+    """Return the cache of rewritten output graphs, if it's enabled."""
+    global _subgraph_cache
+    maxsize = config.compile__subgraph_rewrite_cache_size
+    if maxsize <= 0:
+        return None
+    if _subgraph_cache is None:
+        _subgraph_cache = SubgraphRewriteCache(maxsize)
+    else:
+        _subgraph_cache.maxsize = maxsize
+    return _subgraph_cache
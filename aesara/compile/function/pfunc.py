@@ -6,7 +6,13 @@ Provide a simple user friendly API.
 from copy import copy
 from typing import Optional
 
-from aesara.compile.function.types import Function, UnusedInputError, orig_function
+from aesara.compile.function.types import (
+    Function,
+    FunctionMaker,
+    UnusedInputError,
+    create_function,
+    function_maker,
+)
 from aesara.compile.io import In, Out
 from aesara.compile.profiling import ProfileStats
 from aesara.compile.sharedvalue import SharedVariable, shared
@@ -343,6 +349,49 @@ def pfunc(
 
     """
 
+    return create_function(
+        pfunc_maker(
+            params,
+            outputs,
+            mode,
+            updates,
+            givens,
+            no_default_updates,
+            accept_inplace,
+            name,
+            rebuild_strict,
+            allow_input_downcast,
+            profile,
+            on_unused_input,
+            output_keys,
+            fgraph=fgraph,
+        )
+    )
+
+
+def pfunc_maker(
+    params,
+    outputs=None,
+    mode=None,
+    updates=None,
+    givens=None,
+    no_default_updates=False,
+    accept_inplace=False,
+    name=None,
+    rebuild_strict=True,
+    allow_input_downcast=None,
+    profile=None,
+    on_unused_input=None,
+    output_keys=None,
+    fgraph: Optional[FunctionGraph] = None,
+) -> FunctionMaker:
+    """Return the `FunctionMaker` used by `pfunc`.
+
+    The graph of the returned `FunctionMaker` is rewritten, but it isn't
+    linked: `create_function` does that.  The parameters are the same as
+    `pfunc`'s.
+
+    """
     if profile is None:
         profile = config.profile or config.print_global_stats
         if profile is False:
@@ -364,7 +413,7 @@ def pfunc(
         fgraph=fgraph,
     )
 
-    return orig_function(
+    return function_maker(
         inputs,
         cloned_outputs,
         mode,
@@ -5,6 +5,7 @@ import copyreg
 import logging
 import time
 import warnings
+from functools import cached_property
 from itertools import chain
 from typing import TYPE_CHECKING, Iterable, List, Literal, Optional, Tuple, Type, Union
 
@@ -12,6 +13,14 @@ import numpy as np
 
 import aesara
 import aesara.compile.profiling
+from aesara.compile.function.cache import (
+    PendingSubgraphs,
+    get_rewritten_graph_caches,
+    get_subgraph_rewrite_cache,
+    install_rewritten_outputs,
+    lookup_rewritten_subgraphs,
+    rewrite_cache_key,
+)
 from aesara.compile.io import In, Out, SymbolicInput, SymbolicOutput
 from aesara.compile.ops import deep_copy_op, update_placeholder, view_op
 from aesara.compile.profiling import ProfileStats
@@ -27,9 +36,10 @@ from aesara.graph.destroyhandler import DestroyHandler
 from aesara.graph.features import AlreadyThere, Feature, PreserveVariableAttributes
 from aesara.graph.fg import FunctionGraph
 from aesara.graph.op import HasInnerGraph
+from aesara.graph.rewriting.profiling import RewriteProfiler
 from aesara.graph.utils import InconsistencyError, get_variable_trace_string
 from aesara.link.basic import Container
-from aesara.link.utils import raise_with_op
+from aesara.link.utils import compile_function_src, raise_with_op
 
 
 if TYPE_CHECKING:
@@ -296,7 +306,8 @@ class Function:
 
     A `Function` instance has a `Function.trust_input` field that defaults to
     ``False``. When ``True``, the `Function` will skip all checks on the
-    inputs.
+    inputs.  `Function.fast_call` goes further and skips most of the work
+    done by `Function.__call__`.
 
     Attributes
     ----------
@@ -973,22 +984,7 @@ class Function:
             )
         except Exception:
             restore_defaults()
-            if hasattr(self.vm, "position_of_error"):
-                # this is a new vm-provided function or c linker
-                # they need this because the exception manipulation
-                # done by raise_with_op is not implemented in C.
-                thunk = None
-                if hasattr(self.vm, "thunks"):
-                    thunk = self.vm.thunks[self.vm.position_of_error]
-                raise_with_op(
-                    self.maker.fgraph,
-                    node=self.vm.nodes[self.vm.position_of_error],
-                    thunk=thunk,
-                    storage_map=getattr(self.vm, "storage_map", None),
-                )
-            else:
-                # old-style linkers raise their own exceptions
-                raise
+            self._raise_vm_error()
 
         dt_fn = time.perf_counter() - t0_fn
         self.maker.mode.fn_time += dt_fn
@@ -1070,6 +1066,90 @@ class Function:
             else:
                 return [outputs[i] for i in output_subset]
 
+    @cached_property
+    def fast_call(self):
+        r"""Evaluate the function with as little overhead as possible.
+
+        This is meant for small functions that are called many times.  It's a
+        function generated for this `Function` on first access: its positional
+        arguments are put straight in the input storage, as when
+        `Function.trust_input` is ``True``, the `VM` is called and the list of
+        the output values is returned.
+
+        Nothing is checked: all the explicit inputs must be given, in order and
+        with the exact types expected by the function.  Keyword arguments,
+        ``output_subset``, profiling and the unpacking of the outputs aren't
+        supported.  The function keeps references to the inputs and outputs of
+        the last call until the next one.
+
+        """
+        n_args = sum(not c.implicit for c in self.input_storage)
+        global_env = {
+            "vm": self.vm,
+            "output_cells": [c.storage for c in self.output_storage],
+            "on_error": self._fast_call_error,
+            "restore_defaults": self._restore_refeed_defaults,
+        }
+        args = ", ".join(f"i{i}" for i in range(n_args))
+        src = f"def fast_call({args}):\n"
+        for i, c in enumerate(self.input_storage[:n_args]):
+            global_env[f"cell_{i}"] = c.storage
+            src += f"    cell_{i}[0] = i{i}\n"
+        src += """    try:
+        outputs = vm()
+    except Exception:
+        on_error()
+    if outputs is None:
+        outputs = [cell[0] for cell in output_cells]
+"""
+        if getattr(self.vm, "need_update_inputs", True):
+            for i, (input, c) in enumerate(
+                reversed(list(zip(self.maker.expanded_inputs, self.input_storage)))
+            ):
+                if input.update is not None:
+                    global_env[f"update_cell_{i}"] = c.storage
+                    src += f"    update_cell_{i}[0] = outputs.pop()\n"
+        elif self.n_returned_outputs < len(self.output_storage):
+            src += f"    outputs = outputs[:{self.n_returned_outputs}]\n"
+        if any(refeed for _, refeed, _ in self.defaults):
+            src += "    restore_defaults()\n"
+        src += "    return outputs\n"
+
+        return compile_function_src(src, "fast_call", global_env)
+
+    def _fast_call_error(self):
+        self._restore_refeed_defaults()
+        self._raise_vm_error()
+
+    def _restore_refeed_defaults(self):
+        for i, (required, refeed, value) in enumerate(self.defaults):
+            if refeed:
+                if isinstance(value, Container):
+                    value = value.storage[0]
+                self[i] = value
+
+    def _raise_vm_error(self):
+        """Re-raise the exception raised by the `VM`, with the node that caused it.
+
+        This must be called while handling the exception.
+        """
+        if hasattr(self.vm, "position_of_error"):
+            # this is a new vm-provided function or c linker
+            # they need this because the exception manipulation
+            # done by raise_with_op is not implemented in C.
+            thunk = None
+            if hasattr(self.vm, "thunks"):
+                thunk = self.vm.thunks[self.vm.position_of_error]
+            raise_with_op(
+                self.maker.fgraph,
+                node=self.vm.nodes[self.vm.position_of_error],
+                thunk=thunk,
+                storage_map=getattr(self.vm, "storage_map", None),
+            )
+        else:
+            # old-style linkers raise their own exceptions
+            raise
+
     value = property(
         lambda self: self._value,
         None,  # this property itself is not settable
@@ -1420,18 +1500,76 @@ class FunctionMaker:
 
         rewriter = mode.optimizer
 
+        caches = get_rewritten_graph_caches()
+        cache_key = None
+        cached_outputs = None
+
         try:
             start_rewriter = time.perf_counter()
 
             rewriter_profile = None
             rewrite_time = None
 
+            if caches:
+                cache_key = rewrite_cache_key(fgraph, inputs, mode)
+
+            missed_caches = []
+            if cache_key is not None:
+                for cache in caches:
+                    cached_outputs = cache.get(cache_key, fgraph)
+                    if cached_outputs is not None:
+                        break
+                    missed_caches.append(cache)
+
+                if profile:
+                    if cached_outputs is None:
+                        profile.rewrite_cache_misses += 1
+                    else:
+                        profile.rewrite_cache_hits += 1
+
             with config.change_flags(
                 mode=mode,
                 compute_test_value=config.compute_test_value_opt,
                 traceback__limit=config.traceback__compile_limit,
             ):
-                rewriter_profile = rewriter(fgraph)
+                subgraph_cache = None
+                if cached_outputs is None:
+                    subgraph_cache = get_subgraph_rewrite_cache()
+
+                if subgraph_cache is not None:
+                    hits, misses = lookup_rewritten_subgraphs(
+                        fgraph, mode, subgraph_cache
+                    )
+                    if profile:
+                        profile.subgraph_rewrite_cache_hits += hits
+                        profile.subgraph_rewrite_cache_misses += misses
+
+                if cached_outputs is not None:
+                    install_rewritten_outputs(
+                        fgraph, cached_outputs, reason="rewritten_graph_cache"
+                    )
+                elif profile and config.profile_optimizer:
+                    rewrite_profiler = RewriteProfiler()
+                    fgraph.attach_feature(rewrite_profiler)
+                    try:
+                        rewriter_profile = rewriter(fgraph)
+                    finally:
+                        fgraph.remove_feature(rewrite_profiler)
+                    if profile.rewrite_profiler is None:
+                        profile.rewrite_profiler = rewrite_profiler
+                    else:
+                        profile.rewrite_profiler.merge(rewrite_profiler)
+                else:
+                    rewriter_profile = rewriter(fgraph)
+
+                # The rewriter may not have included `StoreRewrittenSubgraphs`
+                for feature in list(fgraph._features):
+                    if isinstance(feature, PendingSubgraphs):
+                        fgraph.remove_feature(feature)
+
+                # Populate the caches that didn't have the rewritten graph
+                for cache in missed_caches:
+                    cache.add(cache_key, fgraph)
 
                 end_rewriter = time.perf_counter()
                 rewrite_time = end_rewriter - start_rewriter
@@ -1486,7 +1624,7 @@ class FunctionMaker:
 
                 profile.rewriting_time += rewrite_time
 
-                if config.profile_optimizer:
+                if config.profile_optimizer and cached_outputs is None:
                     profile.rewriter_profile = (rewriter, rewriter_profile)
             elif config.profile_optimizer and profile is not False:
                 # If False, it means the profiling for that function was
@@ -1561,10 +1699,14 @@ class FunctionMaker:
 
         indices = [[input, None, [input]] for input in inputs]
 
+        start_fgraph = time.perf_counter()
         fgraph, found_updates = std_fgraph(
             inputs, outputs, accept_inplace, fgraph=fgraph
         )
 
+        if profile:
+            profile.fgraph_time += time.perf_counter() - start_fgraph
+
         if fgraph.profile is None:
             fgraph.profile = profile
 
@@ -1703,8 +1845,10 @@ class FunctionMaker:
         # Get a function instance
         start_linker = time.perf_counter()
         start_import_time = aesara.link.c.cmodule.import_time
+        start_compile_time = aesara.link.c.cmodule.compile_time
 
         with config.change_flags(traceback__limit=config.traceback__compile_limit):
+            prepare_inner_functions(self)
             _fn, _i, _o = self.linker.make_thunk(
                 input_storage=input_storage_lists, storage_map=storage_map
             )
@@ -1719,6 +1863,8 @@ class FunctionMaker:
             _fn.time_thunks = self.profile.flag_time_thunks
             import_time = aesara.link.c.cmodule.import_time - start_import_time
             self.profile.import_time += import_time
+            c_compile_time = aesara.link.c.cmodule.compile_time - start_compile_time
+            self.profile.c_compile_time += c_compile_time
 
         fn = self.function_builder(
             _fn,
@@ -1780,7 +1926,38 @@ def orig_function(
         from cloned `outputs`.
 
     """
+    maker = function_maker(
+        inputs,
+        outputs,
+        mode,
+        accept_inplace=accept_inplace,
+        name=name,
+        profile=profile,
+        on_unused_input=on_unused_input,
+        output_keys=output_keys,
+        fgraph=fgraph,
+    )
+    return create_function(maker)
+
+
+def function_maker(
+    inputs,
+    outputs,
+    mode=None,
+    accept_inplace=False,
+    name=None,
+    profile=None,
+    on_unused_input=None,
+    output_keys=None,
+    fgraph: Optional[FunctionGraph] = None,
+) -> FunctionMaker:
+    """Return the `FunctionMaker` used by `orig_function`.
 
+    The graph of the returned `FunctionMaker` is rewritten, but it isn't
+    linked: `create_function` does that.  The parameters are the same as
+    `orig_function`'s.
+
+    """
     t1 = time.perf_counter()
     mode = aesara.compile.mode.get_mode(mode)
 
@@ -1792,37 +1969,111 @@ def orig_function(
         else:
             outputs = FunctionMaker.wrap_out(outputs)
 
-    defaults = [getattr(input, "value", None) for input in inputs]
-
     if isinstance(mode, (list, tuple)):
         raise ValueError("We do not support the passing of multiple modes")
 
+    Maker = getattr(mode, "function_maker", FunctionMaker)
+    m = Maker(
+        inputs,
+        outputs,
+        mode,
+        accept_inplace=accept_inplace,
+        profile=profile,
+        on_unused_input=on_unused_input,
+        output_keys=output_keys,
+        name=name,
+        fgraph=fgraph,
+    )
+
+    if profile:
+        profile.compile_time += time.perf_counter() - t1
+
+    return m
+
+
+def create_function(maker: FunctionMaker) -> Function:
+    """Link the graph of a `FunctionMaker` returned by `function_maker`."""
+    t1 = time.perf_counter()
+    defaults = [getattr(input, "value", None) for input in maker.inputs]
+
     fn = None
     try:
-        Maker = getattr(mode, "function_maker", FunctionMaker)
-        m = Maker(
-            inputs,
-            outputs,
-            mode,
-            accept_inplace=accept_inplace,
-            profile=profile,
-            on_unused_input=on_unused_input,
-            output_keys=output_keys,
-            name=name,
-            fgraph=fgraph,
-        )
         with config.change_flags(compute_test_value="off"):
-            fn = m.create(defaults)
+            fn = maker.create(defaults)
     finally:
         t2 = time.perf_counter()
-        if fn and profile:
-            profile.compile_time += t2 - t1
+        if fn and maker.profile:
+            maker.profile.compile_time += t2 - t1
             # TODO: append
-            profile.nb_nodes = len(fn.maker.fgraph.apply_nodes)
+            maker.profile.nb_nodes = len(fn.maker.fgraph.apply_nodes)
 
     return fn
 
 
+def prepare_inner_functions(maker: FunctionMaker) -> int:
+    r"""Rewrite the inner graphs of `maker` and compile their C modules together.
+
+    The `Op`\s of `maker`'s graph that implement `HasInnerGraph.prepare_fn`
+    (e.g. `Scan` and `OpFromGraph`) have their inner graphs rewritten,
+    recursively.  The C modules of all these inner graphs, and of the outer
+    graph, are then compiled in parallel by `ModuleCache.compile_modules`, and
+    the linkers of these graphs are marked so that they don't look for them
+    again when the functions are created.
+
+    Nothing is done unless `config.cmodule__compile_workers` is greater than
+    one, or when the linker of `maker` doesn't use the inner functions of the
+    `Op`\s (e.g. `JITLinker`\s).
+
+    Returns
+    -------
+    int
+        The number of modules that were compiled.
+
+    """
+    # Imported here to avoid an import cycle
+    from aesara.link.basic import JITLinker
+    from aesara.link.c.basic import OpWiseCLinker, compile_node_cmodules
+    from aesara.link.vm import VMLinker
+
+    if (
+        config.cmodule__compile_workers < 2
+        or isinstance(maker.linker, JITLinker)
+        # This is an inner function prepared with its outer function
+        or getattr(maker, "_inner_functions_prepared", False)
+    ):
+        return 0
+
+    c_nodes = []
+    no_recycling = []
+    seen_ops = set()
+    makers = [maker]
+    while makers:
+        m = makers.pop()
+        m._inner_functions_prepared = True
+        linker = m.linker
+        if (
+            isinstance(linker, VMLinker) and linker.c_thunks is not False
+        ) or isinstance(linker, OpWiseCLinker):
+            c_nodes.extend(m.fgraph.toposort())
+            if isinstance(linker, OpWiseCLinker):
+                # It's part of the modules' keys
+                no_recycling.extend(linker.no_recycling)
+            # The linker doesn't need to look for the modules again
+            linker.cmodules_compiled = True
+        for node in m.fgraph.apply_nodes:
+            op = node.op
+            if not isinstance(op, HasInnerGraph) or id(op) in seen_ops:
+                continue
+            seen_ops.add(id(op))
+            inner_maker = op.prepare_fn()
+            if inner_maker is not None and not isinstance(
+                inner_maker.linker, JITLinker
+            ):
+                makers.append(inner_maker)
+
+    return compile_node_cmodules(c_nodes, None, None, no_recycling)
+
+
 def convert_function_input(input):
     """
     Upgrade a input shortcut to an In instance.
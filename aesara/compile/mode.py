@@ -7,7 +7,9 @@ import logging
 import warnings
 from typing import Literal, Optional, Tuple, Union
 
+from aesara.compile.function.cache import StoreRewrittenSubgraphs
 from aesara.compile.function.types import Supervisor
+from aesara.compile.rewrite_costs import expensive_rewrites
 from aesara.configdefaults import config
 from aesara.graph.destroyhandler import DestroyHandler
 from aesara.graph.rewriting.basic import (
@@ -46,6 +48,8 @@ predefined_linkers = {
     "cvm": VMLinker(use_cloop=True),  # Use allow_gc Aesara flag
     "vm_nogc": VMLinker(allow_gc=False, use_cloop=False),
     "cvm_nogc": VMLinker(allow_gc=False, use_cloop=True),
+    # The C thunks hold the GIL, so the Python implementations are used
+    "vm_parallel": VMLinker(use_cloop=False, c_thunks=False, parallel=True),
     "jax": JAXLinker(),
     "numba": NumbaLinker(),
 }
@@ -89,6 +93,11 @@ OPT_O2.name = "OPT_O2"
 OPT_O3.name = "OPT_O3"
 OPT_UNSAFE.name = "OPT_UNSAFE"
 
+# The `fast_run` rewrites, minus those whose measured compile-time cost
+# outweighs their run-time benefit (see `aesara.compile.rewrite_costs`)
+OPT_BALANCED = OPT_FAST_RUN.excluding(*sorted(expensive_rewrites()))
+OPT_BALANCED.name = "OPT_BALANCED"
+
 predefined_optimizers = {
     None: OPT_NONE,
     "None": OPT_NONE,
@@ -102,6 +111,7 @@ predefined_optimizers = {
     "fast_run": OPT_FAST_RUN,
     "fast_run_stable": OPT_FAST_RUN_STABLE,
     "stabilize": OPT_STABILIZE,
+    "balanced": OPT_BALANCED,
 }
 
 
@@ -256,6 +266,15 @@ optdb.register(
 # especially constant merge
 optdb.register("merge2", MergeOptimizer(), "fast_run", "merge", position=49)
 
+# Keep the rewritten graphs of new outputs, before any in-place rewrite
+optdb.register(
+    "store_rewritten_subgraphs",
+    StoreRewrittenSubgraphs(),
+    "fast_run",
+    "fast_compile",
+    position=49.4,
+)
+
 optdb.register(
     "add_destroy_handler", AddDestroyHandler(), "fast_run", "inplace", position=49.5
 )
@@ -313,7 +332,7 @@ class Mode:
 
         if db is None:
             global optdb
-            self.optdb = optdb
+            self.optdb: RewriteDatabase = optdb
         else:
             self.optdb = db
 
@@ -442,8 +461,10 @@ class Mode:
 FAST_COMPILE = Mode(VMLinker(use_cloop=False, c_thunks=False), "fast_compile")
 if config.cxx:
     FAST_RUN = Mode("cvm", "fast_run")
+    BALANCED = Mode("cvm", "balanced")
 else:
     FAST_RUN = Mode("vm", "fast_run")
+    BALANCED = Mode("vm", "balanced")
 
 JAX = Mode(
     JAXLinker(),
@@ -458,6 +479,7 @@ NUMBA = Mode(
 predefined_modes = {
     "FAST_COMPILE": FAST_COMPILE,
     "FAST_RUN": FAST_RUN,
+    "BALANCED": BALANCED,
     "JAX": JAX,
     "NUMBA": NUMBA,
 }
@@ -484,6 +506,11 @@ def get_mode(orig_string):
         if instantiated_default_mode.__class__.__name__ == default_mode_class:
             return instantiated_default_mode
 
+    if string == "DEBUG_MODE" and string not in predefined_modes:
+        # need to import later to break circular dependency; the module
+        # registers `DEBUG_MODE` when it is imported.
+        from . import debugmode  # noqa: F401
+
     if string in ("Mode", "DebugMode", "NanGuardMode"):
         if string == "DebugMode":
             # need to import later to break circular dependency.
@@ -23,6 +23,7 @@ import numpy as np
 import aesara
 from aesara.configdefaults import config
 from aesara.graph.basic import Apply, Constant, Variable
+from aesara.graph.rewriting.profiling import RewriteProfiler
 from aesara.link.utils import get_destroy_dependencies
 
 
@@ -100,7 +101,13 @@ def _atexit_print_fn():
                         "linker_time",
                         "validate_time",
                         "import_time",
+                        "c_compile_time",
+                        "fgraph_time",
                         "linker_node_make_thunks",
+                        "rewrite_cache_hits",
+                        "rewrite_cache_misses",
+                        "subgraph_rewrite_cache_hits",
+                        "subgraph_rewrite_cache_misses",
                     ]:
                         setattr(cum, attr, getattr(cum, attr) + getattr(ps, attr))
 
@@ -138,10 +145,28 @@ def _atexit_print_fn():
                     n_apply_to_print=config.profiling__n_apply,
                 )
 
+    if config.profiling__rewrites_destination:
+        dump_rewrite_profiles(config.profiling__rewrites_destination)
+
     if config.print_global_stats:
         print_global_stats()
 
 
+def dump_rewrite_profiles(destination: str):
+    """Write the combined rewrite profiles of the profiled functions to `destination`."""
+    profiler = RewriteProfiler()
+    for ps in _atexit_print_list:
+        if ps.rewrite_profiler is not None:
+            profiler.merge(ps.rewrite_profiler)
+
+    if destination.endswith(".speedscope.json"):
+        profiler.dump(destination, format="speedscope")
+    elif destination.endswith(".json"):
+        profiler.dump(destination, format="json")
+    else:
+        profiler.dump(destination, format="collapsed")
+
+
 def print_global_stats():
     """
     Print the following stats:
@@ -258,6 +283,9 @@ class ProfileStats:
     # Variable -> offset
     #
 
+    fgraph_time: float = 0.0
+    # time spent constructing the FunctionGraph (FunctionMaker.__init__)
+
     rewriting_time: float = 0.0
     # time spent rewriting graph (FunctionMaker.__init__)
 
@@ -266,12 +294,28 @@ class ProfileStats:
     # This is a subset of rewriting_time that is dominated by toposort()
     # when the destorymap feature is included.
 
+    rewrite_cache_hits: int = 0
+    # number of rewritten graphs reused from a cache (FunctionMaker.__init__)
+
+    rewrite_cache_misses: int = 0
+    # number of graphs that were looked up in a cache and had to be rewritten
+
+    subgraph_rewrite_cache_hits: int = 0
+    # number of outputs whose rewritten graph was reused from a cache
+
+    subgraph_rewrite_cache_misses: int = 0
+    # number of outputs that were looked up in a cache and had to be rewritten
+
     linker_time: float = 0.0
     # time spent linking graph (FunctionMaker.create)
 
     import_time: float = 0.0
     # time spent in importing compiled python module.
 
+    c_compile_time: float = 0.0
+    # time spent running the C compiler while linking.  The modules compiled
+    # in parallel all add their compilation time.
+
     linker_node_make_thunks: float = 0.0
 
     linker_make_thunk_time: Dict = {}
@@ -286,6 +330,9 @@ class ProfileStats:
     rewriter_profile = None
     # None or tuple (the rewriter, the profile it returned)
 
+    rewrite_profiler: Optional[RewriteProfiler] = None
+    # The structured profile of the rewrites, when profile_optimizer is set
+
     # param is called flag_time_thunks because most other attributes with time
     # in the name are times *of* something, rather than configuration flags.
     def __init__(self, atexit_print=True, flag_time_thunks=None, **kwargs):
@@ -802,8 +849,22 @@ class ProfileStats:
                 )
         print(f"  Total compilation time: {self.compile_time:e}s", file=file)
         print(f"    Number of Apply nodes: {int(self.nb_nodes)}", file=file)
+        print(f"    FunctionGraph construction time: {self.fgraph_time:e}s", file=file)
         print(f"    Aesara rewrite time: {self.rewriting_time:e}s", file=file)
         print(f"       Aesara validate time: {self.validate_time:e}s", file=file)
+        if self.rewrite_cache_hits or self.rewrite_cache_misses:
+            print(
+                "       Rewritten graph cache: "
+                f"{self.rewrite_cache_hits} hits, {self.rewrite_cache_misses} misses",
+                file=file,
+            )
+        if self.subgraph_rewrite_cache_hits or self.subgraph_rewrite_cache_misses:
+            print(
+                "       Rewritten subgraph cache: "
+                f"{self.subgraph_rewrite_cache_hits} hits, "
+                f"{self.subgraph_rewrite_cache_misses} misses",
+                file=file,
+            )
         print(
             (
                 "    Aesara Linker time (includes C, CUDA code "
@@ -811,6 +872,7 @@ class ProfileStats:
             ),
             file=file,
         )
+        print(f"       C compilation time {self.c_compile_time:e}s", file=file)
         print(f"       Import time {self.import_time:e}s", file=file)
         print(
             f"       Node make_thunk time {self.linker_node_make_thunks:e}s", file=file
@@ -877,6 +939,9 @@ class ProfileStats:
         min_max_peak = 0
         min_peak_time = 0
 
+        # track peak memory usage with the VM memory planner
+        max_planned_memory = 0
+
         def count_running_memory(order, fgraph, nodes_mem, ignore_dmap=False):
             """
             Calculate memory with specific node order.
@@ -1025,6 +1090,32 @@ class ProfileStats:
                 node_memory_saved_by_view,
             ]
 
+        def count_planned_memory(order, fgraph, nodes_mem):
+            """
+            Calculate memory used by the buffers of `calculate_storage_plan`.
+
+            The buffers are kept between calls, so this is the peak memory
+            with ``vm__memory_planner=True`` and ``allow_gc=False``.  A shared
+            buffer is counted once, with the size of its largest variable.
+
+            """
+            from aesara.link.vm import calculate_storage_plan
+
+            plan = calculate_storage_plan(order, fgraph)
+            buffers_size = {}
+            memory_size = 0
+            for node in order:
+                aliased = set(node.op.destroy_map) | set(node.op.view_map)
+                for idx, (out, v) in enumerate(zip(node.outputs, nodes_mem[node])):
+                    if idx in aliased:
+                        continue
+                    if out in plan:
+                        buffer = plan[out]
+                        buffers_size[buffer] = max(buffers_size.get(buffer, 0), v)
+                    else:
+                        memory_size += v
+            return memory_size + sum(buffers_size.values())
+
         def count_minimum_peak(node_list, fgraph, nodes_mem):
             global mem_count, mem_bound, max_mem_count
             node_list = list(node_list)
@@ -1295,6 +1386,10 @@ class ProfileStats:
 
                 stats[i] = compute_max_stats(running_memory, stats[i])
 
+            max_planned_memory = max(
+                max_planned_memory, count_planned_memory(order, fgraph, nodes_mem)
+            )
+
             # Config: whether print min memory peak
             if config.profiling__min_peak_memory:
                 node_list = fgraph.apply_nodes
@@ -1369,6 +1464,14 @@ class ProfileStats:
             f"        CPU + GPU: {int(round(new_max_node_memory_size[0] / 1024.0))}KB",
             file=file,
         )
+        print(
+            "    Max peak memory if vm__memory_planner=True and allow_gc=False",
+            file=file,
+        )
+        print(
+            f"        CPU: {int(round(max_planned_memory / 1024.0))}KB",
+            file=file,
+        )
         print("---", file=file)
 
         if min_max_peak:
@@ -0,0 +1,371 @@
+"""Measured compile-time costs and run-time benefits of the ``fast_run`` rewrites.
+
+`REWRITE_COSTS` maps the name of a rewrite registered in ``optdb`` to a pair
+``(compile_cost, runtime_benefit)`` measured on a corpus of representative
+graphs:
+
+- ``compile_cost`` is the share of the ``fast_run`` compilation time that is
+  saved when the rewrite is excluded.  It includes the time spent in the
+  linker, so excluding a rewrite that reduces the number of nodes (e.g. the
+  fusion of elementwise operations) can make the compilation slower; such
+  rewrites have no cost, i.e. the negative costs are clamped to ``0``;
+- ``runtime_benefit`` is the average relative slowdown of the compiled
+  functions when the rewrite is excluded (e.g. ``0.25`` means that the
+  functions run 25% slower without it).
+
+Both are medians over repeated measurements, which are needed to tell the
+small costs apart from the noise of the machine.
+
+`expensive_rewrites` uses this table to select the rewrites that are excluded
+from the ``"balanced"`` preset registered in :mod:`aesara.compile.mode`.
+
+The table is regenerated by running this module as a script::
+
+    python -m aesara.compile.rewrite_costs > costs.txt
+
+which measures the rewrites against `benchmark_graphs` and prints a new
+`REWRITE_COSTS` definition.
+
+"""
+import gc
+import statistics
+import time
+import timeit
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, cast
+
+
+# Generated by `python -m aesara.compile.rewrite_costs`.
+REWRITE_COSTS: Dict[str, Tuple[float, float]] = {
+    "composite_elemwise_fusion": (0.168, 0.011),
+    "constant_folding_for_scan2": (0.015, 0.033),
+    "gemm_optimizer": (0.000, 0.013),
+    "inline_ofg_expansion": (0.045, 0.009),
+    "inplace_elemwise_opt": (0.065, 0.014),
+    "local_add_mul_fusion": (0.026, 0.005),
+    "local_add_neg_to_sub": (0.049, 0.015),
+    "local_add_specialize": (0.000, 0.027),
+    "local_addsd_ccode": (0.049, 0.025),
+    "local_alloc_unary": (0.000, 0.039),
+    "local_div_to_reciprocal": (0.000, 0.057),
+    "local_dot22_to_dot22scalar": (0.000, 0.028),
+    "local_dot_to_dot22": (0.000, 0.006),
+    "local_elemwise_alloc": (0.016, 0.020),
+    "local_elemwise_sub_zeros": (0.105, 0.013),
+    "local_gemm_to_gemv": (0.000, 0.089),
+    "local_inplace_AdvancedIncSubtensor": (0.000, 0.010),
+    "local_inplace_AdvancedIncSubtensor1": (0.000, 0.005),
+    "local_inplace_addsd_ccode": (0.069, 0.031),
+    "local_inplace_remove0": (0.000, 0.040),
+    "local_inplace_setsubtensor": (0.000, 0.005),
+    "local_mul_specialize": (0.056, 0.109),
+    "local_pow_specialize": (0.038, 0.075),
+    "local_uint_constant_indices": (0.000, 0.119),
+    "local_usmm": (0.000, 0.024),
+    "random_make_inplace": (0.000, 0.019),
+    "scan_make_inplace": (0.119, 0.014),
+    "scan_merge": (0.000, 0.103),
+    "scan_merge_inouts": (0.000, 0.018),
+    "scan_pushout_add": (0.016, 0.011),
+    "scan_pushout_dot1": (0.025, 0.018),
+    "scan_pushout_nonseqs_ops": (0.000, 0.019),
+    "scan_pushout_seqs_ops": (0.000, 0.024),
+    "scan_remove_constants_and_unused_inputs0": (0.000, 0.038),
+    "scan_remove_constants_and_unused_inputs1": (0.046, 0.092),
+    "scan_remove_constants_and_unused_inputs2": (0.000, 0.064),
+    "scan_remove_constants_and_unused_inputs3": (0.063, 0.022),
+    "scan_save_mem": (0.328, 0.085),
+    "scipy_blas": (0.003, 0.013),
+    "use_c_blas": (0.000, 0.111),
+}
+
+
+def expensive_rewrites(
+    costs: Optional[Dict[str, Tuple[float, float]]] = None,
+    min_compile_cost: float = 0.02,
+    min_runtime_benefit: float = 0.05,
+) -> Set[str]:
+    """Return the names of the rewrites that cost more than they bring.
+
+    Parameters
+    ----------
+    costs
+        A ``dict`` in the format of `REWRITE_COSTS`, which is used by default.
+    min_compile_cost
+        Rewrites with a smaller compile-time cost are never returned.
+    min_runtime_benefit
+        Rewrites with a smaller run-time benefit are returned if they are
+        expensive enough.
+
+    """
+    if costs is None:
+        costs = REWRITE_COSTS
+    return {
+        name
+        for name, (compile_cost, runtime_benefit) in costs.items()
+        if compile_cost >= min_compile_cost and runtime_benefit < min_runtime_benefit
+    }
+
+
+def benchmark_graphs() -> List[Tuple[list, list, Callable[[], list]]]:
+    """Return a corpus of representative graphs.
+
+    Each entry is a tuple ``(inputs, outputs, make_values)``, where
+    ``make_values`` returns a list of values for `inputs`.
+
+    """
+    import numpy as np
+
+    import aesara.tensor as at
+    from aesara.configdefaults import config
+    from aesara.gradient import grad
+    from aesara.graph.basic import Variable
+    from aesara.scan.basic import scan
+    from aesara.tensor.random.utils import RandomStream
+
+    rng = np.random.default_rng(2393)
+    floatX = config.floatX
+
+    def values(*shapes):
+        return lambda: [rng.normal(size=shape).astype(floatX) for shape in shapes]
+
+    graphs = []
+
+    # Gradient of a logistic regression
+    X, w, y = at.matrix("X"), at.vector("w"), at.vector("y")
+    p = at.sigmoid(X @ w)
+    cost = -(y * at.log(p) + (1 - y) * at.log(1 - p)).mean()
+    graphs.append(([X, w, y], [cost, grad(cost, w)], values((500, 50), (50,), (500,))))
+
+    # Forward and backward passes of a two-layer perceptron
+    X, W1, W2 = at.matrix("X"), at.matrix("W1"), at.matrix("W2")
+    h = at.tanh(X @ W1)
+    out = at.special.log_softmax(h @ W2, axis=-1)
+    cost = -out[:, 0].mean()
+    graphs.append(
+        (
+            [X, W1, W2],
+            [cost] + cast(List[Variable], grad(cost, [W1, W2])),
+            values((200, 100), (100, 100), (100, 10)),
+        )
+    )
+
+    # A long chain of elementwise operations
+    x, y = at.vector("x"), at.vector("y")
+    z = x
+    for i in range(10):
+        z = at.exp(-(z**2)) * y + at.sin(z) / (1 + at.abs(y))
+    graphs.append(([x, y], [z], values((10000,), (10000,))))
+
+    # Numerically unstable expressions
+    x = at.vector("x")
+    outs = [at.log(1 + at.exp(x)), at.log(1 - at.sigmoid(x)), at.exp(x) - 1]
+    graphs.append(([x], outs, values((10000,))))
+
+    # Reductions, indexing and shapes
+    x = at.matrix("x")
+    s = x[1:, ::2].sum(axis=0) * x.shape[0] + x.T.max(axis=1)[: x.shape[1] // 2]
+    graphs.append(([x], [s, (x - x.mean(axis=0)) ** 2], values((300, 300))))
+
+    # Gradient of a recurrent network, whose step has computations that only
+    # depend on the sequence or on the non-sequences
+    X, W, U = at.matrix("X"), at.matrix("W"), at.matrix("U")
+
+    def step(x_t, h_tm1, W, U):
+        return at.tanh(at.exp(x_t) @ W + h_tm1 @ U + (W**2).sum(axis=0))
+
+    h, _ = scan(
+        step, sequences=X, outputs_info=at.zeros_like(W[0]), non_sequences=[W, U]
+    )
+    cost = h[-1].sum() + h.mean()
+    graphs.append(
+        (
+            [X, W, U],
+            [cost] + cast(List[Variable], grad(cost, [W, U])),
+            values((100, 20), (20, 30), (30, 30)),
+        )
+    )
+
+    # Random sampling, with the updates of the random number generators
+    srng = RandomStream(2393)
+    X, W = at.matrix("X"), at.matrix("W")
+    h = at.tanh(X @ W)
+    h = h * srng.binomial(1, 0.5, size=h.shape) + srng.normal(0, 0.1, size=h.shape)
+    graphs.append(([X, W], [h.sum(axis=0)], values((200, 100), (100, 100))))
+
+    return graphs
+
+
+def _registered_rewrites(db) -> Dict[str, object]:
+    """Return the rewrites registered in `db` and its sub-databases, by name."""
+    from aesara.graph.rewriting.db import ProxyDB, RewriteDatabase, TopoDB
+
+    res = {}
+    for name in db._names:
+        (rewriter,) = db.__db__[name]
+        res[name] = rewriter
+        if isinstance(rewriter, (ProxyDB, TopoDB)):
+            rewriter = rewriter.db
+        if isinstance(rewriter, RewriteDatabase):
+            res.update(_registered_rewrites(rewriter))
+    return res
+
+
+def excludable_rewrites() -> Set[str]:
+    """Return the names of the rewrites of ``optdb`` that can be measured and excluded.
+
+    Whole sub-databases, merge rewrites, the rewriters that attach features
+    used by other rewrites and the rewrites of the ``"canonicalize"`` and
+    ``"stabilize"`` databases are never excluded.  The latter change the
+    numerical results of the functions, and not only their speed, and they
+    rely on the canonical forms produced by the former.
+
+    """
+    from aesara.compile.mode import AddDestroyHandler, AddFeatureOptimizer, optdb
+    from aesara.graph.rewriting.basic import MergeOptimizer
+    from aesara.graph.rewriting.db import RewriteDatabase
+    from aesara.tensor.rewriting.shape import ShapeOptimizer, UnShapeOptimizer
+
+    protected = (
+        RewriteDatabase,
+        MergeOptimizer,
+        AddDestroyHandler,
+        AddFeatureOptimizer,
+        ShapeOptimizer,
+        UnShapeOptimizer,
+    )
+    stable = set(_registered_rewrites(optdb["canonicalize"]))
+    stable.update(_registered_rewrites(optdb["stabilize"]))
+    return {
+        name
+        for name, rewriter in _registered_rewrites(optdb).items()
+        if not isinstance(rewriter, protected) and name not in stable
+    }
+
+
+def _run_time(fn, vals, number: int, repeat: int) -> float:
+    fn(*vals)
+    times = timeit.repeat(lambda: fn(*vals), number=number, repeat=repeat)
+    return statistics.median(times) / number
+
+
+def _compile(graph, mode):
+    """Compile `graph` and return the function and the compilation time."""
+    from aesara.compile.function import function
+
+    inputs, outputs, _ = graph
+    # Like `timeit`, don't let the garbage collections add noise
+    gc.collect()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        t0 = time.perf_counter()
+        fn = function(inputs, outputs, mode=mode)
+        return fn, time.perf_counter() - t0
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def measure_rewrite_costs(
+    graphs: Optional[Sequence[Tuple[list, list, Callable[[], list]]]] = None,
+    candidates: Optional[Iterable[str]] = None,
+    max_candidates: int = 40,
+    compile_repeat: int = 5,
+    number: int = 20,
+    repeat: int = 5,
+) -> Dict[str, Tuple[float, float]]:
+    """Measure the compile-time costs and run-time benefits of the ``fast_run`` rewrites.
+
+    Parameters
+    ----------
+    graphs
+        The graphs to compile, in the format of `benchmark_graphs`, which is
+        used by default.
+    candidates
+        The names of the rewrites to measure.  By default, the
+        `max_candidates` rewrites returned by `excludable_rewrites` that take
+        the largest share of the rewriting time are measured.
+    max_candidates
+        See `candidates`.
+    compile_repeat
+        The number of compilations of each graph, of which the median time is
+        used.  The graphs are compiled with and without the rewrite in turn,
+        so that both are equally affected by the load of the machine.
+    number
+        The number of calls in each run-time measurement.
+    repeat
+        The number of run-time measurements, of which the median is used.
+
+    Returns
+    -------
+    A ``dict`` in the format of `REWRITE_COSTS`.
+
+    """
+    from aesara.compile.function import function
+    from aesara.compile.mode import OPT_FAST_RUN, get_mode
+    from aesara.compile.profiling import ProfileStats
+    from aesara.configdefaults import config
+
+    if graphs is None:
+        graphs = benchmark_graphs()
+
+    mode = get_mode("FAST_RUN")
+
+    if candidates is None:
+        rewrite_times: Dict[str, float] = {}
+        for inputs, outputs, _ in graphs:
+            profile = ProfileStats(atexit_print=False, gpu_checks=False)
+            with config.change_flags(profile_optimizer=True):
+                function(inputs, outputs, mode=mode, profile=profile)
+            assert profile.rewrite_profiler is not None
+            for stack, t in profile.rewrite_profiler.self_times().items():
+                rewrite_times[stack[-1]] = rewrite_times.get(stack[-1], 0.0) + t
+        excludable = excludable_rewrites()
+        candidates = sorted(
+            (name for name in rewrite_times if name in excludable),
+            key=lambda name: -rewrite_times[name],
+        )[:max_candidates]
+
+    # Fill the cache of compiled C modules first
+    base_fns = [_compile(graph, mode)[0] for graph in graphs]
+
+    costs = {}
+    for name in candidates:
+        excluding_mode = mode.clone(optimizer=OPT_FAST_RUN.excluding(name))
+        fns = [_compile(graph, excluding_mode)[0] for graph in graphs]
+
+        base_compile_time = 0.0
+        compile_time = 0.0
+        for graph in graphs:
+            base_times = []
+            times = []
+            for i in range(compile_repeat):
+                base_times.append(_compile(graph, mode)[1])
+                times.append(_compile(graph, excluding_mode)[1])
+            base_compile_time += statistics.median(base_times)
+            compile_time += statistics.median(times)
+
+        benefit = 0.0
+        for graph, base_fn, fn in zip(graphs, base_fns, fns):
+            vals = graph[2]()
+            # Time both functions together, so that they are equally affected
+            # by the load of the machine
+            base_run_time = _run_time(base_fn, vals, number, repeat)
+            run_time = _run_time(fn, vals, number, repeat)
+            benefit += max(run_time / base_run_time - 1, 0.0) / len(graphs)
+        costs[name] = (max(1 - compile_time / base_compile_time, 0.0), benefit)
+
+    return costs
+
+
+def main():
+    """Print a new `REWRITE_COSTS` definition measured on `benchmark_graphs`."""
+    costs = measure_rewrite_costs()
+    print("REWRITE_COSTS: Dict[str, Tuple[float, float]] = {")
+    for name, (compile_cost, runtime_benefit) in sorted(costs.items()):
+        print(f'    "{name}": ({compile_cost:.3f}, {runtime_benefit:.3f}),')
+    print("}")
+
+
+if __name__ == "__main__":
+    main()
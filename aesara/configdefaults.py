@@ -104,6 +104,7 @@ def _filter_mode(val):
         "FAST_RUN",
         "NanGuardMode",
         "FAST_COMPILE",
+        "BALANCED",
         "DEBUG_MODE",
         "JAX",
         "NUMBA",
@@ -461,7 +462,17 @@ def add_compile_configvars():
             "linker",
             "Default linker used if the aesara flags mode is Mode",
             EnumStr(
-                "cvm", ["c|py", "py", "c", "c|py_nogc", "vm", "vm_nogc", "cvm_nogc"]
+                "cvm",
+                [
+                    "c|py",
+                    "py",
+                    "c",
+                    "c|py_nogc",
+                    "vm",
+                    "vm_nogc",
+                    "cvm_nogc",
+                    "vm_parallel",
+                ],
             ),
             in_c_key=False,
         )
@@ -471,7 +482,7 @@ def add_compile_configvars():
         config.add(
             "linker",
             "Default linker used if the aesara flags mode is Mode",
-            EnumStr("vm", ["py", "vm_nogc"]),
+            EnumStr("vm", ["py", "vm_nogc", "vm_parallel"]),
             in_c_key=False,
         )
         if type(config).cxx.is_default:
@@ -501,7 +512,17 @@ def add_compile_configvars():
         "Default optimizer. If not None, will use this optimizer with the Mode",
         EnumStr(
             "o4",
-            ["o3", "o2", "o1", "unsafe", "fast_run", "fast_compile", "merge", "None"],
+            [
+                "o3",
+                "o2",
+                "o1",
+                "unsafe",
+                "fast_run",
+                "fast_compile",
+                "balanced",
+                "merge",
+                "None",
+            ],
         ),
         in_c_key=False,
     )
@@ -589,6 +610,39 @@ def add_compile_configvars():
         in_c_key=False,
     )
 
+    config.add(
+        "cmodule__index",
+        "If True, keep an index of the compiled modules in the compiledir, so "
+        "that loading the module cache doesn't read every module directory.",
+        BoolParam(True),
+        in_c_key=False,
+    )
+
+    config.add(
+        "cmodule__compile_workers",
+        "The number of C modules that can be compiled at the same time when "
+        "making the thunks of a function.",
+        IntParam(1, validate=_is_gt_0),
+        in_c_key=False,
+    )
+
+    config.add(
+        "cmodule__max_cache_size",
+        "In megabytes. If positive, the least recently used compiled c modules "
+        "are deleted when the process exits, until their total size is below "
+        "this limit.",
+        IntParam(0, validate=_is_greater_or_equal_0),
+        in_c_key=False,
+    )
+
+    config.add(
+        "cmodule__max_cache_entries",
+        "If positive, the least recently used compiled c modules are deleted "
+        "when the process exits, until there are at most this many of them.",
+        IntParam(0, validate=_is_greater_or_equal_0),
+        in_c_key=False,
+    )
+
     config.add(
         "cmodule__debug",
         "If True, define a DEBUG macro (if not exists) for any compiled C code.",
@@ -614,6 +668,35 @@ def add_compile_configvars():
         in_c_key=False,
     )
 
+    config.add(
+        "compile__rewrite_disk_cache",
+        "If True, rewritten graphs are stored in the compiledir and reused "
+        "by later compilations of structurally identical graphs, including "
+        "in other processes.",
+        BoolParam(False),
+        in_c_key=False,
+    )
+
+    config.add(
+        "compile__rewrite_memory_cache_size",
+        "Maximum number of rewritten graphs kept in memory and reused by "
+        "later compilations of structurally identical graphs in the same "
+        "process. The least recently used graphs are discarded first. "
+        "0 disables this cache.",
+        IntParam(0, validate=_is_greater_or_equal_0),
+        in_c_key=False,
+    )
+
+    config.add(
+        "compile__subgraph_rewrite_cache_size",
+        "Maximum number of rewritten output graphs kept in memory. Compiling "
+        "a graph with an output whose graph was already rewritten in the "
+        "same process starts from the previously rewritten graph. The least "
+        "recently used graphs are discarded first. 0 disables this cache.",
+        IntParam(0, validate=_is_greater_or_equal_0),
+        in_c_key=False,
+    )
+
     config.add(
         "ctc__root",
         "Directory which contains the root of Baidu CTC library. It is assumed \
@@ -640,6 +723,17 @@ def add_tensor_configvars():
         in_c_key=False,
     )
 
+    config.add(
+        "tensor__lazy_shape_feature",
+        (
+            "Make ShapeFeature build the shape graph of a node the first time "
+            "one of its outputs' shapes is needed, instead of when the node is "
+            "imported"
+        ),
+        BoolParam(False),
+        in_c_key=False,
+    )
+
     config.add(
         "tensor__local_elemwise_fusion",
         (
@@ -998,6 +1092,16 @@ def add_testvalue_and_checking_configvars():
         in_c_key=False,
     )
 
+    config.add(
+        "profiling__rewrites_destination",
+        """File to which the rewrite profiles of all the functions compiled
+        with profile_optimizer=True are written at exit.  The format is
+        speedscope for a .speedscope.json file, JSON for any other .json file,
+        and collapsed stacks otherwise.""",
+        StrParam(""),
+        in_c_key=False,
+    )
+
     config.add(
         "on_shape_error",
         "warn: print a warning and use the default" " value. raise: raise an error",
@@ -1107,6 +1211,13 @@ def add_optimizer_configvars():
         FloatParam(8),
         in_c_key=False,
     )
+    config.add(
+        "optdb__worklist",
+        "If True, the iterations of EquilibriumGraphRewriter after the first"
+        " one only visit the nodes affected by the previous changes.",
+        BoolParam(False),
+        in_c_key=False,
+    )
     config.add(
         "cycle_detection",
         "If cycle_detection is set to regular, most inplaces are allowed,"
@@ -1190,6 +1301,24 @@ def add_vm_configvars():
         in_c_key=False,
     )
 
+    config.add(
+        "vm__memory_planner",
+        "Useful only for the VM Linkers. When True, plan the storage of the"
+        " intermediate results before the thunks are created, so that results"
+        " with disjoint lifetimes share a storage cell and Ops that reuse their"
+        " output storage write into the buffer of a dead result.",
+        BoolParam(False),
+        in_c_key=False,
+    )
+
+    config.add(
+        "vm__parallel_threads",
+        "Number of threads used by the Parallel VM (linker=vm_parallel)."
+        " 0 means the number of CPUs.",
+        IntParam(0, validate=_is_greater_or_equal_0),
+        in_c_key=False,
+    )
+
 
 def add_deprecated_configvars():
     # TODO: remove this?
@@ -109,7 +109,7 @@ class AesaraConfigParser:
             print("    Value: ", cv.__get__(self, self.__class__), file=buf)
             print("", file=buf)
 
-    def get_config_hash(self):
+    def get_config_hash(self, c_key_only=True):
         """
         Return a string sha256 of the current config options. In the past,
         it was md5.
@@ -117,10 +117,12 @@ class AesaraConfigParser:
         The string should be such that we can safely assume that two different
         config setups will lead to two different strings.
 
-        We only take into account config options for which `in_c_key` is True.
+        By default, we only take into account config options for which
+        `in_c_key` is True.  When `c_key_only` is False, all the config
+        options are taken into account.
         """
         all_opts = sorted(
-            [c for c in self._config_var_dict.values() if c.in_c_key],
+            [c for c in self._config_var_dict.values() if c.in_c_key or not c_key_only],
             key=lambda cv: cv.name,
         )
         return hash_from_code(
@@ -65,6 +65,9 @@ class Node(MetaObject):
     keeps track of its parents via `Variable.owner` / `Apply.inputs`.
 
     """
+
+    __slots__: List = []
+
     name: Optional[str]
 
     def get_parents(self):
@@ -112,6 +115,10 @@ class Apply(Node, Generic[OpType]):
 
     """
 
+    # Graphs can hold millions of `Apply` nodes, so they don't carry a
+    # `__dict__` and their `tag` is only allocated when it's first used.
+    __slots__ = ("op", "inputs", "outputs", "_tag", "__weakref__")
+
     def __init__(
         self,
         op: OpType,
@@ -126,7 +133,7 @@ class Apply(Node, Generic[OpType]):
 
         self.op = op
         self.inputs: List[Variable] = []
-        self.tag = Scratchpad()
+        self._tag: Optional[Scratchpad] = None
 
         # filter inputs to make sure each element is a Variable
         for input in inputs:
@@ -163,16 +170,32 @@ class Apply(Node, Generic[OpType]):
         except MethodNotDefined:
             return NoParams
 
+    @property
+    def tag(self) -> Scratchpad:
+        if self._tag is None:
+            self._tag = Scratchpad()
+        return self._tag
+
+    @tag.setter
+    def tag(self, value: Scratchpad) -> None:
+        self._tag = value
+
     def __getstate__(self):
-        d = self.__dict__
-        # ufunc don't pickle/unpickle well
-        if hasattr(self.tag, "ufunc"):
-            d = copy(self.__dict__)
-            t = d["tag"]
-            del t.ufunc
+        d = {"op": self.op, "inputs": self.inputs, "outputs": self.outputs}
+        t = self._tag
+        if t is not None:
+            # ufunc don't pickle/unpickle well
+            if hasattr(t, "ufunc"):
+                t = copy(t)
+                del t.ufunc
             d["tag"] = t
         return d
 
+    def __setstate__(self, d):
+        self._tag = None
+        for k, v in d.items():
+            setattr(self, k, v)
+
     def default_output(self):
         """
         Returns the default output for this node.
@@ -233,7 +256,8 @@ class Apply(Node, Generic[OpType]):
         cp = self.__class__(
             new_op, self.inputs, [output.clone() for output in self.outputs]
         )
-        cp.tag = copy(self.tag)
+        if self._tag is not None:
+            cp.tag = copy(self._tag)
         return cp
 
     def clone_with_new_inputs(
@@ -286,7 +310,8 @@ class Apply(Node, Generic[OpType]):
                 new_op = new_op.clone()  # type: ignore
 
             new_node = new_op.make_node(*new_inputs)
-            new_node.tag = copy(self.tag).__update__(new_node.tag)
+            if self._tag is not None:
+                new_node.tag = copy(self._tag).__update__(new_node.tag)
         else:
             new_node = self.clone(clone_inner_graph=clone_inner_graph)
             new_node.inputs = new_inputs
@@ -11,14 +11,14 @@ from typing import Type as TypingType
 from typing import Union, cast
 
 from aesara.configdefaults import config
-from aesara.graph.basic import Constant
+from aesara.graph.basic import Apply, Constant
 from aesara.graph.features import AlreadyThere, Bookkeeper
 from aesara.graph.utils import InconsistencyError
 from aesara.misc.ordered_set import OrderedSet
 
 
 if TYPE_CHECKING:
-    from aesara.graph.basic import Apply, Variable
+    from aesara.graph.basic import Variable
     from aesara.graph.fg import FunctionGraph
 
 
@@ -37,6 +37,23 @@ def _contains_cycle(
     """
     Function to check if the given graph contains a cycle
 
+    See `_dependency_order`.
+
+    Returns
+    -------
+    bool
+        True if the graph contains a cycle, False otherwise.
+
+    """
+    return _dependency_order(fgraph, orderings) is None
+
+
+def _dependency_order(
+    fgraph: "FunctionGraph", orderings: Dict["Apply", Set["Apply"]]
+) -> Optional[List["Apply"]]:
+    """
+    Function to sort the `Apply` nodes of the given graph topologically
+
     Parameters
     ----------
     fgraph
@@ -55,8 +72,9 @@ def _contains_cycle(
 
     Returns
     -------
-    bool
-        True if the graph contains a cycle, False otherwise.
+    list or None
+        The `Apply` nodes in an order that respects their dependencies, or
+        ``None`` if the graph contains a cycle.
 
     """
     # These are lists of Variable instances
@@ -173,6 +191,7 @@ def _contains_cycle(
     # This is a standard cycle detection algorithm.
 
     visited = 0
+    order = []
     while visitable:
         # Since each node is inserted into the visitable queue exactly
         # once, it comes out of the queue exactly once
@@ -180,6 +199,8 @@ def _contains_cycle(
         # and increment the visited node count without double-counting
         node = visitable.popleft()
         visited += 1
+        if isinstance(node, Apply):
+            order.append(node)
         for client in node_to_children.get(node, []):
             parent_counts[client] -= 1
             # If all of a node's parents have been visited,
@@ -187,7 +208,9 @@ def _contains_cycle(
             if not parent_counts[client]:
                 visitable.append(client)
 
-    return visited != len(parent_counts)
+    if visited != len(parent_counts):
+        return None
+    return order
 
 
 def _build_droot_impact(
@@ -319,7 +342,8 @@ class DestroyHandler(Bookkeeper):
 
     It is a work in progress. The following data structures have been
     converted to use the incremental strategy:
-        <none>
+        the topological order of the `Apply` nodes used to detect cycles
+        (see `DestroyHandler.validate`)
 
     The following data structures remain to be converted:
         <unknown>
@@ -398,6 +422,20 @@ class DestroyHandler(Bookkeeper):
         ] = OrderedDict()
         fgraph.stale_droot: bool = True
 
+        # The positions of the `Apply` nodes in a topological order that
+        # respects both their inputs and the orderings of the last successful
+        # `validate`, kept up to date incrementally (see `update_order`).
+        fgraph._destroyhandler_order: Dict["Apply", float] = {}
+        fgraph._destroyhandler_next_order: int = 0
+        # Orderings that `_destroyhandler_order` respects
+        fgraph._destroyhandler_orderings: Dict["Apply", Set["Apply"]] = {}
+        # (owner, client) edges introduced by input changes since the last
+        # successful `validate`
+        fgraph._destroyhandler_new_edges: List[Tuple["Apply", "Apply"]] = []
+        # Nodes imported since the last successful `validate`
+        fgraph._destroyhandler_new_nodes: Set["Apply"] = set()
+        fgraph._destroyhandler_stale_order: bool = not self.do_imports_on_attach
+
         fgraph.debug_all_apps: Set["Apply"] = set()
 
         if self.do_imports_on_attach:
@@ -474,6 +512,12 @@ class DestroyHandler(Bookkeeper):
         del fgraph.view_o
         del fgraph._destroy_handler_clients
         del fgraph.stale_droot
+        del fgraph._destroyhandler_order
+        del fgraph._destroyhandler_next_order
+        del fgraph._destroyhandler_orderings
+        del fgraph._destroyhandler_new_edges
+        del fgraph._destroyhandler_new_nodes
+        del fgraph._destroyhandler_stale_order
         delattr(fgraph, "destroyers")
         delattr(fgraph, "has_destroyers")
         delattr(fgraph, "destroy_handler")
@@ -563,6 +607,11 @@ class DestroyHandler(Bookkeeper):
         for i, output in enumerate(app.outputs):
             fgraph._destroy_handler_clients.setdefault(output, OrderedDict())
 
+        # The inputs of `app` are imported before it, so it can go last
+        fgraph._destroyhandler_order[app] = fgraph._destroyhandler_next_order
+        fgraph._destroyhandler_next_order += 1
+        fgraph._destroyhandler_new_nodes.add(app)
+
         fgraph.stale_droot = True
 
     def on_prune(self, fgraph, app, reason):
@@ -599,6 +648,8 @@ class DestroyHandler(Bookkeeper):
             if not fgraph.view_o[i]:
                 del fgraph.view_o[i]
 
+        fgraph._destroyhandler_order.pop(app, None)
+
         fgraph.stale_droot = True
         if app in fgraph.fail_validate:
             del fgraph.fail_validate[app]
@@ -653,6 +704,9 @@ class DestroyHandler(Bookkeeper):
 
                     fgraph.view_o.setdefault(new_r, OrderedSet()).add(output)
 
+            if new_r.owner is not None:
+                fgraph._destroyhandler_new_edges.append((new_r.owner, app))
+
             if self.algo == "fast":
                 if app in fgraph.fail_validate:
                     del fgraph.fail_validate[app]
@@ -686,8 +740,7 @@ class DestroyHandler(Bookkeeper):
                         raise app_err_pairs[app]
             else:
                 ords = self.orderings(fgraph, ordered=False)
-                if _contains_cycle(fgraph, ords):
-                    raise InconsistencyError("Dependency graph contains cycles")
+                self.update_order(fgraph, ords)
         else:
             # James's Conjecture:
             # If there are no destructive ops, then there can be no cycles.
@@ -702,6 +755,117 @@ class DestroyHandler(Bookkeeper):
             pass
         return True
 
+    def update_order(self, fgraph, ords: Dict["Apply", Set["Apply"]]):
+        """Update the topological order of the `Apply` nodes with the new dependencies.
+
+        Only the dependencies added since the last successful call are checked.
+        When a new dependency ``u -> v`` contradicts the current order, the
+        ancestors of ``u`` that come after ``v`` in the order are searched; if
+        ``v`` is not among them, they are moved right before ``v``.  This is
+        the backward half of the Pearce-Kelly algorithm; the forward half is
+        avoided by giving the moved nodes fractional positions.
+
+        Parameters
+        ----------
+        ords
+            The orderings returned by `DestroyHandler.orderings`.
+
+        Raises
+        ------
+        InconsistencyError
+            If the dependencies contain a cycle.
+
+        """
+        order = fgraph._destroyhandler_order
+        old_ords = fgraph._destroyhandler_orderings
+        # Nodes can be pruned and imported again, at a new position
+        new_nodes = fgraph._destroyhandler_new_nodes
+
+        new_edges = [
+            (u, v)
+            for u, v in fgraph._destroyhandler_new_edges
+            if v in order and any(i.owner is u for i in v.inputs)
+        ]
+        for v, preds in ords.items():
+            if v in new_nodes:
+                new_edges.extend((u, v) for u in preds)
+            else:
+                old_preds = old_ords.get(v, ())
+                new_edges.extend(
+                    (u, v) for u in preds if u not in old_preds or u in new_nodes
+                )
+
+        if fgraph._destroyhandler_stale_order or any(
+            u not in order or v not in order for u, v in new_edges
+        ):
+            self._rebuild_order(fgraph, ords)
+        else:
+            for idx, (u, v) in enumerate(new_edges):
+                if order[u] < order[v]:
+                    continue
+                moved = self._move_before(fgraph, u, v, ords)
+                if moved is None:
+                    # The order is still valid for the edges added so far, so
+                    # only the others need to be checked again
+                    fgraph._destroyhandler_new_edges = new_edges[idx:]
+                    raise InconsistencyError("Dependency graph contains cycles")
+                if not moved:
+                    # There's no room left between the positions
+                    self._rebuild_order(fgraph, ords)
+                    break
+
+        fgraph._destroyhandler_orderings = ords
+        fgraph._destroyhandler_new_edges = []
+        fgraph._destroyhandler_new_nodes = set()
+
+    def _rebuild_order(self, fgraph, ords: Dict["Apply", Set["Apply"]]):
+        nodes = _dependency_order(fgraph, ords)
+        if nodes is None:
+            fgraph._destroyhandler_stale_order = True
+            raise InconsistencyError("Dependency graph contains cycles")
+        fgraph._destroyhandler_order = {node: i for i, node in enumerate(nodes)}
+        fgraph._destroyhandler_next_order = len(nodes)
+        fgraph._destroyhandler_stale_order = False
+
+    def _move_before(
+        self, fgraph, u: "Apply", v: "Apply", ords: Dict["Apply", Set["Apply"]]
+    ) -> Optional[bool]:
+        """Move `u` and its ancestors that come after `v` right before `v`.
+
+        Returns ``None`` if `v` is an ancestor of `u`, i.e. if the dependency
+        ``u -> v`` closes a cycle, and ``False`` if the positions between `v`
+        and its predecessor in the order are too close to be divided.
+
+        """
+        order = fgraph._destroyhandler_order
+        upper = order[v]
+        # The largest position of the ancestors that stay before `v`
+        lower = -1.0
+
+        ancestors = {u}
+        stack = [u]
+        while stack:
+            node = stack.pop()
+            preds = [i.owner for i in node.inputs if i.owner is not None]
+            preds.extend(ords.get(node, ()))
+            for pred in preds:
+                if pred is v:
+                    return None
+                pos = order[pred]
+                if pos > upper:
+                    if pred not in ancestors:
+                        ancestors.add(pred)
+                        stack.append(pred)
+                elif pos > lower:
+                    lower = pos
+
+        step = (upper - lower) / (len(ancestors) + 1)
+        if not lower < lower + step or not lower + step * len(ancestors) < upper:
+            return False
+        for i, node in enumerate(sorted(ancestors, key=order.__getitem__)):
+            order[node] = lower + step * (i + 1)
+        return True
+
     def orderings(self, fgraph, ordered: bool = True) -> Dict["Apply", Set["Apply"]]:
         """Return orderings induced by destructive operations.
 
@@ -133,6 +133,20 @@ class FunctionGraph(MetaObject):
         self.outputs: List[Variable] = []
         self.clients: Dict[Variable, List[ClientType]] = {}
 
+        # The result of the last call to `FunctionGraph.toposort`; it's reset
+        # whenever the graph, its outputs or its features change
+        self._toposort: Optional[List[Apply]] = None
+
+        # The nodes that may also belong to another `FunctionGraph` created by
+        # `FunctionGraph.clone_get_equiv` with ``copy_on_write=True``; they're
+        # copied before they're changed
+        self._shared_nodes: Set[Apply] = set()
+        # The copies that replaced some of these shared nodes in this graph.
+        # They're only kept while a `FunctionGraph.replace` is in progress,
+        # since its callers may still refer to the original nodes
+        self._node_copies: Dict[Apply, Apply] = {}
+        self._replace_depth = 0
+
         for f in features:
             self.attach_feature(f)
 
@@ -170,6 +184,7 @@ class FunctionGraph(MetaObject):
         self, var: Variable, reason: Optional[str] = None, import_missing: bool = False
     ):
         """Add a new variable as an output to this `FunctionGraph`."""
+        self._toposort = None
         self.outputs.append(var)
         self.import_var(var, reason=reason, import_missing=import_missing)
         self.clients[var].append(("output", len(self.outputs) - 1))
@@ -185,6 +200,7 @@ class FunctionGraph(MetaObject):
         if check and var in self.inputs:
             return
 
+        self._toposort = None
         self.inputs.append(var)
         self.setup_var(var)
 
@@ -282,6 +298,7 @@ class FunctionGraph(MetaObject):
                     apply_node.tag.removed_by.append(str(reason))
 
                     self.apply_nodes.remove(apply_node)
+                    self._toposort = None
 
                     self.variables.difference_update(apply_node.outputs)
 
@@ -353,10 +370,26 @@ class FunctionGraph(MetaObject):
             Add missing inputs instead of raising an exception.
         """
         # We import the nodes in topological order. We only are interested in
-        # new nodes, so we use all variables we know of as if they were the
-        # input set.  (The functions in the graph module only use the input set
-        # to know where to stop going down.)
-        new_nodes = io_toposort(self.variables, apply_node.outputs)
+        # new nodes, so we stop going down at the variables we already know
+        # of.  This is the same walk as `io_toposort(self.variables, ...)`,
+        # but it doesn't copy `self.variables`, which would make every import
+        # linear in the size of the graph.
+        variables = self.variables
+        computed: Set[Variable] = set()
+        new_nodes = []
+        todo = [apply_node]
+        while todo:
+            cur = todo.pop()
+            if cur.outputs[0] in variables or cur.outputs[0] in computed:
+                continue
+            if all(
+                i in variables or i in computed or i.owner is None for i in cur.inputs
+            ):
+                computed.update(cur.outputs)
+                new_nodes.append(cur)
+            else:
+                todo.append(cur)
+                todo.extend(i.owner for i in cur.inputs if i.owner)
 
         if check:
             for node in new_nodes:
@@ -382,6 +415,7 @@ class FunctionGraph(MetaObject):
         for node in new_nodes:
             assert node not in self.apply_nodes
             self.apply_nodes.add(node)
+            self._toposort = None
             if not hasattr(node.tag, "imported_by"):
                 node.tag.imported_by = []
             node.tag.imported_by.append(str(reason))
@@ -442,17 +476,27 @@ class FunctionGraph(MetaObject):
             self.outputs[i] = new_var
         else:
             assert isinstance(node, Apply)
+            # The caller may still refer to a shared node that was copied and
+            # removed (e.g. when the node uses the replaced variable twice)
+            while node not in self.apply_nodes and node in self._node_copies:
+                node = self._node_copies[node]
             r = node.inputs[i]
             if check and not r.type.is_super(new_var.type):
                 raise TypeError(
                     f"The type of the replacement ({new_var.type}) must be "
                     f"compatible with the type of the original Variable ({r.type})."
                 )
+            if node in self._shared_nodes and r is not new_var:
+                self._copy_on_write(node, i, new_var, reason, import_missing)
+                if not self._replace_depth:
+                    self._node_copies.clear()
+                return
             node.inputs[i] = new_var
 
         if r is new_var:
             return
 
+        self._toposort = None
         self.import_var(new_var, reason=reason, import_missing=import_missing)
         self.add_client(new_var, (node, i))
         self.remove_client(r, (node, i), reason=reason)
@@ -461,6 +505,44 @@ class FunctionGraph(MetaObject):
         # reverted later.
         self.execute_callbacks("on_change_input", node, i, r, new_var, reason=reason)
 
+    def _copy_on_write(
+        self,
+        node: Apply,
+        i: int,
+        new_var: Variable,
+        reason: Optional[str],
+        import_missing: bool,
+    ) -> None:
+        """Change ``node.inputs[i]`` when `node` is shared with another graph.
+
+        A copy of `node` that uses `new_var` is imported instead, and the
+        clients of `node` are moved to the copy.  The clients that are shared
+        too are copied in turn, so the other graphs never see the change.
+        """
+        copies = self._node_copies
+        todo: List[Tuple[ApplyOrOutput, int, Variable]] = [(node, i, new_var)]
+        while todo:
+            client, idx, var = todo.pop()
+            while client not in self.apply_nodes and client in copies:
+                client = copies[client]  # type: ignore
+
+            if client == "output" or client not in self._shared_nodes:
+                self.change_node_input(
+                    client, idx, var, reason=reason, import_missing=import_missing
+                )
+                continue
+
+            assert isinstance(client, Apply)
+            new_node = client.clone()
+            new_node.inputs[idx] = var
+            copies[client] = new_node
+            self.import_node(new_node, reason=reason, import_missing=import_missing)
+
+            for old_out, new_out in zip(client.outputs, new_node.outputs):
+                todo.extend(
+                    (c, c_idx, new_out) for c, c_idx in self.clients.get(old_out, ())
+                )
+
     def replace(
         self,
         var: Variable,
@@ -523,10 +605,16 @@ class FunctionGraph(MetaObject):
                         f"test value. Original: {tval_shape}, new: {new_tval_shape}"
                     )
 
-        for node, i in list(self.clients[var]):
-            self.change_node_input(
-                node, i, new_var, reason=reason, import_missing=import_missing
-            )
+        self._replace_depth += 1
+        try:
+            for node, i in list(self.clients[var]):
+                self.change_node_input(
+                    node, i, new_var, reason=reason, import_missing=import_missing
+                )
+        finally:
+            self._replace_depth -= 1
+            if not self._replace_depth:
+                self._node_copies.clear()
 
     def replace_all(self, pairs: Iterable[Tuple[Variable, Variable]], **kwargs) -> None:
         """Replace variables in the `FunctionGraph` according to ``(var, new_var)`` pairs in a list."""
@@ -549,6 +637,7 @@ class FunctionGraph(MetaObject):
         """
         old_idx_mappings = tuple((out, i) for i, out in enumerate(self.outputs))
         self.outputs.pop(idx)
+        self._toposort = None
 
         new_idx = 0
         for out, old_idx in old_idx_mappings:
@@ -581,6 +670,7 @@ class FunctionGraph(MetaObject):
             return
 
         self.apply_nodes.remove(node)
+        self._toposort = None
 
         if not hasattr(node.tag, "removed_by"):
             node.tag.removed_by = []
@@ -711,6 +801,7 @@ class FunctionGraph(MetaObject):
         self.execute_callbacks_times.setdefault(feature, 0.0)
 
         self._features.append(feature)
+        self._toposort = None
 
     def remove_feature(self, feature: Feature) -> None:
         """Remove a feature from the graph.
@@ -726,6 +817,7 @@ class FunctionGraph(MetaObject):
             return
 
         feature.on_detach(self)
+        self._toposort = None
 
     def execute_callbacks(self, name: str, *args, **kwargs) -> None:
         """Execute callbacks.
@@ -772,12 +864,26 @@ class FunctionGraph(MetaObject):
         * they satisfy the additional orderings provided by
           :meth:`FunctionGraph.orderings`.
 
+        The order is cached until the graph changes, so repeated calls on an
+        unchanged graph (e.g. by the linkers) are cheap.  `Feature`\s whose
+        :meth:`Feature.orderings` can change without any change to the graph
+        must call :meth:`FunctionGraph.invalidate_toposort`.
+
         """
-        if len(self.apply_nodes) < 2:
-            # No sorting is necessary
-            return list(self.apply_nodes)
+        if self._toposort is None:
+            if len(self.apply_nodes) < 2:
+                # No sorting is necessary
+                self._toposort = list(self.apply_nodes)
+            else:
+                self._toposort = io_toposort(
+                    self.inputs, self.outputs, self.orderings()
+                )
 
-        return io_toposort(self.inputs, self.outputs, self.orderings())
+        return list(self._toposort)
+
+    def invalidate_toposort(self) -> None:
+        """Discard the order cached by :meth:`FunctionGraph.toposort`."""
+        self._toposort = None
 
     def orderings(self) -> Dict[Apply, List[Apply]]:
         """Return a map of node to node evaluation dependencies.
@@ -881,17 +987,23 @@ class FunctionGraph(MetaObject):
     def __repr__(self):
         return f"FunctionGraph({', '.join(graph_as_string(self.inputs, self.outputs))})"
 
-    def clone(self, check_integrity=True) -> "FunctionGraph":
+    def clone(
+        self, check_integrity=True, copy_on_write: bool = False
+    ) -> "FunctionGraph":
         """Clone the graph."""
-        return self.clone_get_equiv(check_integrity)[0]
+        return self.clone_get_equiv(check_integrity, copy_on_write=copy_on_write)[0]
 
     def clone_get_equiv(
-        self, check_integrity: bool = True, attach_feature: bool = True, **kwargs
+        self,
+        check_integrity: bool = True,
+        attach_feature: bool = True,
+        copy_on_write: bool = False,
+        **kwargs,
     ) -> Tuple[
         "FunctionGraph",
         Dict[Union[Apply, Variable, "Op"], Union[Apply, Variable, "Op"]],
     ]:
-        """Clone the graph and return a ``dict`` that maps old nodes to new nodes.
+        r"""Clone the graph and return a ``dict`` that maps old nodes to new nodes.
 
         Parameters
         ----------
@@ -899,15 +1011,32 @@ class FunctionGraph(MetaObject):
             Whether or not to check the resulting graph's integrity.
         attach_feature
             Whether or not to attach `self`'s features to the cloned graph.
+        copy_on_write
+            If ``True``, the two graphs share their `Variable`\s and `Apply`
+            nodes, and a node is only copied when
+            :meth:`FunctionGraph.change_node_input` is about to change it in
+            either graph.  Changes made directly to the nodes (e.g. to their
+            tags) are seen by both graphs.
 
         Returns
         -------
         e
-            The cloned `FunctionGraph`. Every node in the cloned graph is cloned.
+            The cloned `FunctionGraph`. Every node in the cloned graph is
+            cloned, unless `copy_on_write` is ``True``.
         equiv
             A ``dict`` that maps old nodes to the new nodes.
         """
-        equiv = clone_get_equiv(self.inputs, self.outputs, **kwargs)
+        equiv: Dict[Union[Apply, Variable, "Op"], Union[Apply, Variable, "Op"]]
+        if copy_on_write:
+            if kwargs:
+                raise TypeError(
+                    "Cloning keywords can't be used with `copy_on_write=True`"
+                )
+            equiv = {v: v for v in self.variables}
+            equiv.update((v, v) for v in self.inputs + self.outputs)
+            equiv.update((n, n) for n in self.apply_nodes)
+        else:
+            equiv = clone_get_equiv(self.inputs, self.outputs, **kwargs)
 
         e = FunctionGraph(
             [cast(Variable, equiv[i]) for i in self.inputs],
@@ -916,6 +1045,10 @@ class FunctionGraph(MetaObject):
             update_mapping=self.update_mapping,
         )
 
+        if copy_on_write:
+            self._shared_nodes.update(self.apply_nodes)
+            e._shared_nodes = set(self.apply_nodes)
+
         if check_integrity:
             e.check_integrity()
 
@@ -935,9 +1068,15 @@ class FunctionGraph(MetaObject):
         if "execute_callbacks_times" in self_dict:
             del self_dict["execute_callbacks_times"]
 
+        self_dict["_toposort"] = None
+
         return self_dict
 
     def __setstate__(self, dct):
+        self._toposort = None
+        self._shared_nodes = set()
+        self._node_copies = {}
+        self._replace_depth = 0
         self.__dict__.update(dct)
         for feature in self._features:
             if hasattr(feature, "unpickle"):
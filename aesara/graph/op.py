@@ -31,7 +31,7 @@ from aesara.link.c.params_type import Params, ParamsType
 
 
 if TYPE_CHECKING:
-    from aesara.compile.function.types import Function
+    from aesara.compile.function.types import Function, FunctionMaker
     from aesara.graph.fg import FunctionGraph
     from aesara.graph.type import Type
 
@@ -642,6 +642,16 @@ class HasInnerGraph(ABC):
     def fn(self) -> "Function":
         """The compiled inner-graph function."""
 
+    def prepare_fn(self) -> Optional["FunctionMaker"]:
+        r"""Rewrite the inner graph of `HasInnerGraph.fn` without linking it.
+
+        The returned `FunctionMaker` is the one used by the next access to
+        `HasInnerGraph.fn`.  ``None`` is returned when the function was
+        already created, or by the `Op`\s that don't support this.
+
+        """
+        return None
+
     @property
     @abstractmethod
     def inner_inputs(self) -> List[Variable]:
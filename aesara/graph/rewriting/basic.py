@@ -1,7 +1,6 @@
 """This module defines the base classes for graph rewriting."""
 import abc
 import copy
-import functools
 import inspect
 import logging
 import pdb
@@ -15,7 +14,7 @@ from functools import _compose_mro, partial, reduce  # type: ignore
 from itertools import chain
 from typing import TYPE_CHECKING, Callable, Dict
 from typing import Iterable as IterableType
-from typing import List, Literal, Optional, Sequence, Tuple, Union, cast
+from typing import List, Literal, Optional, Sequence, Set, Tuple, Union, cast
 
 import aesara
 from aesara.configdefaults import config
@@ -32,6 +31,7 @@ from aesara.graph.basic import (
 from aesara.graph.features import AlreadyThere, Feature, NodeFinder
 from aesara.graph.fg import FunctionGraph
 from aesara.graph.op import Op
+from aesara.graph.rewriting.profiling import profiled_apply
 from aesara.graph.utils import AssocList, InconsistencyError
 from aesara.misc.ordered_set import OrderedSet
 from aesara.utils import flatten
@@ -126,7 +126,7 @@ class GraphRewriter(Rewriter):
 
         """
         self.add_requirements(fgraph)
-        return self.apply(fgraph, *args, **kwargs)
+        return profiled_apply(self, fgraph, *args, **kwargs)
 
     def __call__(self, fgraph):
         """Rewrite a `FunctionGraph`."""
@@ -154,10 +154,11 @@ class GraphRewriter(Rewriter):
 class NodeRewriter(Rewriter):
     """A `Rewriter` that is applied to an `Apply` node."""
 
-    def tracks(self) -> Optional[Sequence[Op]]:
+    def tracks(self) -> Optional[Sequence[Union[Op, type, Tuple[type, type]]]]:
         """Return the list of `Op` classes to which this rewrite applies.
 
-        Returns ``None`` when the rewrite applies to all nodes.
+        Returns ``None`` when the rewrite applies to all nodes.  See
+        `node_rewriter` for the entries this list can contain.
 
         """
         return None
@@ -297,7 +298,7 @@ class SequentialGraphRewriter(GraphRewriter, UserList):
                 try:
                     nb_nodes_before = len(fgraph.apply_nodes)
                     t0 = time.perf_counter()
-                    sub_prof = rewriter.apply(fgraph)
+                    sub_prof = profiled_apply(rewriter, fgraph)
                     l.append(float(time.perf_counter() - t0))
                     sub_profs.append(sub_prof)
                     nb_nodes.append((nb_nodes_before, len(fgraph.apply_nodes)))
@@ -520,6 +521,13 @@ class MergeFeature(Feature):
     That way, the `MergeOptimizer` can remember the result of the last
     merge-pass on the `FunctionGraph`.
 
+    The distinct nodes are hash-consed by their `Op` and the identities of
+    their inputs, and the distinct atomic variables by their
+    `AtomicVariable.merge_signature`, so that finding a merge candidate for
+    a new or changed node only takes a table lookup.  Equivalent nodes that
+    couldn't be merged (see `MergeFeature.blacklist`) share the same entry of
+    the table, so that each of them remains a candidate.
+
     """
 
     def on_attach(self, fgraph):
@@ -535,8 +543,10 @@ class MergeFeature(Feature):
         # For all Apply nodes
         # Set of distinct (not mergeable) nodes
         self.nodes_seen = set()
-        # Ordered set of distinct (not mergeable) nodes without any input
-        self.noinput_nodes = OrderedSet()
+        # Map from the merge keys of distinct nodes to those nodes, in the
+        # order they were seen, and back
+        self.node_table: Dict[Tuple[Op, Tuple[int, ...]], List[Apply]] = {}
+        self.node_keys: Dict[Apply, Tuple[Op, Tuple[int, ...]]] = {}
 
         # Each element of scheduled is a list of list of (out, new_out) pairs.
         # Each list of pairs represent the substitution needed to replace all
@@ -549,10 +559,10 @@ class MergeFeature(Feature):
         #     [(node.out1, cand3.out1), (node.out2, cand3.out2)]]]
         self.scheduled = []
 
-        # List of (node, candidate) pairs, where we tried to replace node by
+        # Set of (node, candidate) pairs, where we tried to replace node by
         # candidate, but it failed. This is used to avoid infinite loops
         # during the replacement phase.
-        self.blacklist = []
+        self.blacklist = set()
 
         for node in fgraph.toposort():
             self.on_import(fgraph, node, "on_attach")
@@ -564,7 +574,7 @@ class MergeFeature(Feature):
         if node in self.nodes_seen:
             # If inputs to a node change, it's not guaranteed that the node is
             # distinct from the other nodes in `self.nodes_seen`.
-            self.nodes_seen.discard(node)
+            self.forget_node(node)
             self.process_node(fgraph, node)
 
         if isinstance(new_r, AtomicVariable):
@@ -578,9 +588,7 @@ class MergeFeature(Feature):
         self.process_node(fgraph, node)
 
     def on_prune(self, fgraph, node, reason):
-        self.nodes_seen.discard(node)
-        if not node.inputs:
-            self.noinput_nodes.discard(node)
+        self.forget_node(node)
         for c in node.inputs:
             if isinstance(c, AtomicVariable) and len(fgraph.clients[c]) <= 1:
                 # This was the last node using this constant
@@ -589,6 +597,17 @@ class MergeFeature(Feature):
                 self.atomic_sig_inv.discard(sig)
                 self.seen_atomics.discard(id(c))
 
+    def forget_node(self, node):
+        """Remove `node` from the distinct nodes."""
+        self.nodes_seen.discard(node)
+        key = self.node_keys.pop(node, None)
+        if key is not None:
+            # The next equivalent node, if any, becomes the first candidate
+            bucket = self.node_table[key]
+            bucket.remove(node)
+            if not bucket:
+                del self.node_table[key]
+
     def process_atomic(self, fgraph, c):
         """Check if an atomic `c` can be merged, and queue that replacement."""
         if id(c) in self.seen_atomics:
@@ -610,69 +629,33 @@ class MergeFeature(Feature):
     def process_node(self, fgraph, node):
         r"""Check if a `node` can be merged, and queue that replacement.
 
-        When `node` is changed we check for other nodes (via the clients map)
-        that depend on the same inputs.  If any of those other nodes have the
-        same inputs and `Op` as `node`, they are queued to be merged.
+        The distinct nodes with the same `Op` and the same inputs as `node` are
+        looked up in the hash-consing table, and `node` is queued to be merged
+        into the first of them for which that didn't already fail.  The table
+        holds the nodes that are in the graph, so the input identities in its
+        keys can't be reused by other objects.
 
         """
 
         if node in self.nodes_seen:
             return
 
-        if node.inputs:
-            # We use the smallest clients list.  Some `Op`s like `Elemwise`
-            # have rewrites that put constants as the first inputs.  Since
-            # constants generally have more clients than other types of nodes,
-            # using `node.inputs[0]` will make us look at more nodes on
-            # average, so by picking the smallest clients list, we might speed
-            # things up?
-
-            clients = sorted(
-                (fgraph.clients[inp] for inp in node.inputs), key=lambda x: len(x)
-            )[0]
-            assert len(clients) > 0
-
-            merge_candidates = [c for c, i in clients if c in self.nodes_seen]
-        else:
-            # If two nodes have no input, but perform the same operation,
-            # they are not always constant-folded, so we want to merge them.
-            # In that case, the candidates are all the nodes without inputs.
-            merge_candidates = self.noinput_nodes
-
-        replacement_candidates = []
-        for candidate in merge_candidates:
-            if candidate is node:
-                continue
-            if len(node.inputs) != len(candidate.inputs):
-                continue
-
-            inputs_match = all(
-                node_in is cand_in
-                for node_in, cand_in in zip(node.inputs, candidate.inputs)
-            )
+        key = (node.op, tuple(id(inp) for inp in node.inputs))
+        bucket = self.node_table.setdefault(key, [])
 
-            if inputs_match and node.op == candidate.op:
-                if (node, candidate) in self.blacklist:
-                    # They were already tried, and there was an error
-                    continue
-
-                # Schedule transfer of clients from node to candidate
-                pairs = list(
-                    zip(
-                        node.outputs,
-                        candidate.outputs,
-                        ["merge"] * len(node.outputs),
-                    )
-                )
-
-                replacement_candidates.append(pairs)
+        replacement_candidates = [
+            # Schedule transfer of clients from node to candidate
+            list(zip(node.outputs, candidate.outputs, ["merge"] * len(node.outputs)))
+            for candidate in bucket
+            if candidate is not node and (node, candidate) not in self.blacklist
+        ]
 
         if replacement_candidates:
             self.scheduled.append(replacement_candidates)
         else:
             self.nodes_seen.add(node)
-            if not node.inputs:
-                self.noinput_nodes.add(node)
+            bucket.append(node)
+            self.node_keys[node] = key
 
 
 class MergeOptimizer(GraphRewriter):
@@ -707,8 +690,8 @@ class MergeOptimizer(GraphRewriter):
         nb_atomic = 0
         while sched:
             pairs_list = sched.pop()
-            success = True
             for pairs_ in pairs_list:
+                success = True
                 # We must check again the equivalence, as the graph could've
                 # changed. If so, doing the replacement can introduce a node
                 # that depends on itself.  Doing the full check of such cycles
@@ -773,7 +756,7 @@ class MergeOptimizer(GraphRewriter):
                 except InconsistencyError:
                     success = False
                     nb_fail += 1
-                    fgraph.merge_feature.blacklist.append(
+                    fgraph.merge_feature.blacklist.add(
                         (pairs[0][0].owner, pairs[0][1].owner)
                     )
 
@@ -782,6 +765,14 @@ class MergeOptimizer(GraphRewriter):
                     if isinstance(pairs[0][0], AtomicVariable):
                         nb_atomic += 1
                     break
+            else:
+                # None of the candidates could be used, so the node is a
+                # distinct node, and the next candidate of its equivalents
+                node = pairs_list[0][0][0].owner
+                if node is not None and node in fgraph.apply_nodes:
+                    for pairs_ in pairs_list:
+                        fgraph.merge_feature.blacklist.add((node, pairs_[0][1].owner))
+                    fgraph.merge_feature.process_node(fgraph, node)
 
         if fgraph.profile:
             validate_time = fgraph.profile.validate_time - validate_before
@@ -799,7 +790,7 @@ class MergeOptimizer(GraphRewriter):
             callback_time = None
             callbacks_time = {}
 
-        fgraph.merge_feature.blacklist = []
+        fgraph.merge_feature.blacklist = set()
 
         return (
             nb_fail,
@@ -1074,12 +1065,21 @@ class FromFunctionNodeRewriter(NodeRewriter):
         self._tracked_types = (
             tuple(t for t in tracks if isinstance(t, type)) if tracks else ()
         )
+        self._tracked_scalar_ops = (
+            tuple(t for t in tracks if isinstance(t, tuple)) if tracks else ()
+        )
         self.requirements = requirements
 
     def transform(self, fgraph, node):
         if self._tracks:
             if not (
-                node.op in self._tracks or isinstance(node.op, self._tracked_types)
+                node.op in self._tracks
+                or isinstance(node.op, self._tracked_types)
+                or any(
+                    isinstance(node.op, op_type)
+                    and isinstance(getattr(node.op, "scalar_op", None), scalar_types)
+                    for op_type, scalar_types in self._tracked_scalar_ops
+                )
             ):
                 return False
 
@@ -1103,7 +1103,7 @@ class FromFunctionNodeRewriter(NodeRewriter):
 
 
 def node_rewriter(
-    tracks: Optional[Sequence[Union[Op, type]]],
+    tracks: Optional[Sequence[Union[Op, type, Tuple[type, type]]]],
     inplace: bool = False,
     requirements: Optional[Tuple[type, ...]] = (),
 ):
@@ -1114,7 +1114,10 @@ def node_rewriter(
     tracks
         The `Op` types or instances to which this rewrite applies.
         Use ``None`` instead of an empty list to have the rewrite apply to
-        all `Op`\s.
+        all `Op`\s.  A pair ``(op_type, scalar_op_types)`` only tracks the
+        ``op_type`` instances whose ``scalar_op`` is an instance of
+        ``scalar_op_types`` (a type or a tuple of types), e.g.
+        ``(Elemwise, aes.Exp)``.
     inplace
         A boolean indicating whether or not the rewrite works in-place.
         If ``True``, a `DestroyHandler` `Feature` is added automatically added
@@ -1134,6 +1137,23 @@ def node_rewriter(
                     "Use `None` instead of an empty list to make an rewrite apply to all nodes."
                 )
             for t in tracks:
+                if isinstance(t, tuple) and len(t) == 2:
+                    t, scalar_types = t
+                    if not all(
+                        isinstance(st, type) and issubclass(st, Op)
+                        for st in (
+                            scalar_types
+                            if isinstance(scalar_types, tuple)
+                            else (scalar_types,)
+                        )
+                    ):
+                        raise TypeError(
+                            "The scalar `Op`s of a `tracks` pair must be `Op` classes."
+                        )
+                    if not isinstance(t, type):
+                        raise TypeError(
+                            "The first element of a `tracks` pair must be an `Op` class."
+                        )
                 if not (
                     isinstance(t, Op) or (isinstance(t, type) and issubclass(t, Op))
                 ):
@@ -1154,47 +1174,82 @@ def node_rewriter(
 
 
 class OpToRewriterTracker:
-    r"""A container that maps `NodeRewriter`\s to `Op` instances and `Op`-type inheritance."""
+    r"""A container that maps `NodeRewriter`\s to `Op` instances and `Op`-type inheritance.
+
+    The rewriters applicable to an `Op` are computed once per `Op` (i.e. per
+    `Op` type and `Op.__props__` values, which include the ``scalar_op`` of
+    `Op`\s like `Elemwise`) and then looked up in a dispatch table.
+
+    """
 
     def __init__(self):
         self.tracked_instances: Dict[Op, List[NodeRewriter]] = {}
         self.tracked_types: Dict[type, List[NodeRewriter]] = {}
         self.untracked_rewrites: List[NodeRewriter] = []
+        # The ``scalar_op`` types to which a rewriter in `tracked_types` is
+        # restricted, when it was tracked with an ``(op_type, scalar_op_types)``
+        # pair
+        self.tracked_scalar_ops: Dict[Tuple[type, NodeRewriter], Tuple[type, ...]] = {}
+        self.dispatch_table: Dict[Op, List[NodeRewriter]] = {}
 
     def add_tracker(self, rw: NodeRewriter):
         """Add a `NodeRewriter` to be keyed by its `NodeRewriter.tracks` or applied generally."""
         tracks = rw.tracks()
+        self.dispatch_table.clear()
 
         if tracks is None:
             self.untracked_rewrites.append(rw)
         else:
             for c in tracks:
-                if isinstance(c, type):
-                    self.tracked_types.setdefault(c, []).append(rw)
+                if isinstance(c, tuple):
+                    c, scalar_op_types = c
+                    scalar_types: Tuple[type, ...] = (
+                        scalar_op_types
+                        if isinstance(scalar_op_types, tuple)
+                        else (scalar_op_types,)
+                    )
+                    rewrites = self.tracked_types.setdefault(c, [])
+                    if rw not in rewrites:
+                        rewrites.append(rw)
+                        self.tracked_scalar_ops[(c, rw)] = scalar_types
+                    elif (c, rw) in self.tracked_scalar_ops:
+                        self.tracked_scalar_ops[(c, rw)] += scalar_types
+                elif isinstance(c, type):
+                    rewrites = self.tracked_types.setdefault(c, [])
+                    if rw in rewrites:
+                        self.tracked_scalar_ops.pop((c, rw), None)
+                    else:
+                        rewrites.append(rw)
                 else:
                     self.tracked_instances.setdefault(c, []).append(rw)
 
-    def _find_impl(self, cls) -> List[NodeRewriter]:
-        r"""Returns the `NodeRewriter`\s that apply to `cls` based on inheritance.
+    def _find_impl(self, op: Op) -> List[NodeRewriter]:
+        r"""Returns the `NodeRewriter`\s that apply to `op` based on inheritance.
 
         This based on `functools._find_impl`.
         """
-        mro = _compose_mro(cls, self.tracked_types.keys())
+        mro = _compose_mro(type(op), self.tracked_types.keys())
+        scalar_op = getattr(op, "scalar_op", None)
         matches = []
         for t in mro:
-            match = self.tracked_types.get(t, None)
-            if match:
-                matches.extend(match)
+            for rw in self.tracked_types.get(t, ()):
+                scalar_types = self.tracked_scalar_ops.get((t, rw))
+                if scalar_types is None or isinstance(scalar_op, scalar_types):
+                    matches.append(rw)
         return matches
 
-    @functools.lru_cache
     def get_trackers(self, op: Op) -> List[NodeRewriter]:
         """Get all the rewrites applicable to `op`."""
-        return (
-            self._find_impl(type(op))
+        try:
+            return self.dispatch_table[op]
+        except KeyError:
+            pass
+        res = self.dispatch_table[op] = (
+            self._find_impl(op)
             + self.tracked_instances.get(op, [])
             + self.untracked_rewrites
         )
+        return res
 
     def get_rewriters(self):
         return chain(
@@ -1261,9 +1316,27 @@ class SequentialNodeRewriter(NodeRewriter):
 
         self.tracker = OpToRewriterTracker()
 
+        # The patterns of the `PatternNodeRewriter`s are matched together, and
+        # only the candidates found by `pattern_net` are tried
+        self.pattern_rewrites: Set[PatternNodeRewriter] = set()
+        self.pattern_net = None
+        # Map an `Op` to its rewriters that aren't in `pattern_net`, and to the
+        # positions of all its rewriters
+        self.pattern_dispatch: Dict[
+            Op, Tuple[List[NodeRewriter], Dict[NodeRewriter, int]]
+        ] = {}
+
         for o in self.rewrites:
             self.tracker.add_tracker(o)
 
+            if isinstance(o, PatternNodeRewriter) and o.get_nodes is None:
+                if self.pattern_net is None:
+                    from aesara.graph.rewriting.unify import DiscriminationNet
+
+                    self.pattern_net = DiscriminationNet()
+                self.pattern_net.add(o.in_pattern, o)
+                self.pattern_rewrites.add(o)
+
             if self.profile:
                 self.time_rewrites.setdefault(o, 0.0)
                 self.process_count.setdefault(o, 0)
@@ -1285,19 +1358,46 @@ class SequentialNodeRewriter(NodeRewriter):
                 t.extend(at)
         return t
 
+    def get_pattern_candidates(self, node: Apply) -> List[NodeRewriter]:
+        """Get the rewrites applicable to `node`, leaving out the patterns that can't match."""
+        try:
+            others, positions = self.pattern_dispatch[node.op]
+        except KeyError:
+            rewrites = self.tracker.get_trackers(node.op)
+            others = [rw for rw in rewrites if rw not in self.pattern_rewrites]
+            positions = {rw: i for i, rw in enumerate(rewrites)}
+            self.pattern_dispatch[node.op] = (others, positions)
+
+        assert self.pattern_net is not None
+        candidates = [rw for rw in self.pattern_net.match(node) if rw in positions]
+        if not candidates:
+            return others
+        return sorted(others + candidates, key=positions.__getitem__)
+
     def transform(self, fgraph, node):
         if len(self.rewrites) == 0:
             return
 
         repl = None
+        profiler = getattr(fgraph, "rewrite_profiler", None)
 
         while True:
-            rewrites = self.tracker.get_trackers(node.op)
+            if self.pattern_net is None:
+                rewrites = self.tracker.get_trackers(node.op)
+            else:
+                rewrites = self.get_pattern_candidates(node)
 
             new_repl = None
             for rewrite in rewrites:
                 rewrite_start = time.perf_counter()
-                new_repl = rewrite.transform(fgraph, node)
+                if profiler is None:
+                    new_repl = rewrite.transform(fgraph, node)
+                else:
+                    token = profiler.start(rewrite)
+                    try:
+                        new_repl = rewrite.transform(fgraph, node)
+                    finally:
+                        profiler.stop(token, bool(new_repl))
                 rewrite_finish = time.perf_counter()
                 if self.profile:
                     self.time_rewrites[rewrite] += rewrite_start - rewrite_finish
@@ -1579,11 +1679,15 @@ class PatternNodeRewriter(NodeRewriter):
         often.
 
         """
-        from aesara.graph.rewriting.unify import convert_strs_to_vars
+        from aesara.graph.rewriting.unify import DiscriminationNet, convert_strs_to_vars
 
         var_map: Dict[str, "Var"] = {}
         self.in_pattern = convert_strs_to_vars(in_pattern, var_map=var_map)
         self.out_pattern = convert_strs_to_vars(out_pattern, var_map=var_map)
+        # Rules out most of the nodes that can't match before the (much more
+        # expensive) unification
+        self.net = DiscriminationNet()
+        self.net.add(self.in_pattern, self)
         self.values_eq_approx = values_eq_approx
         if isinstance(in_pattern, (list, tuple)):
             self.op = self.in_pattern[0]
@@ -1611,6 +1715,15 @@ class PatternNodeRewriter(NodeRewriter):
             return self._tracks
         return [self.op]
 
+    def has_multiple_clients(self, fgraph, node):
+        """Check whether the multiple clients rule prevents matching `node`."""
+        # TODO: We shouldn't need to iterate like this.
+        return not self.allow_multiple_clients and any(
+            len(fgraph.clients.get(v)) > 1
+            for v in vars_between(fgraph.inputs, node.outputs)
+            if v not in fgraph.inputs
+        )
+
     def transform(self, fgraph, node, get_nodes=True):
         """Check if the graph from node corresponds to ``in_pattern``.
 
@@ -1620,15 +1733,9 @@ class PatternNodeRewriter(NodeRewriter):
         from etuples.core import ExpressionTuple
         from unification import reify, unify
 
-        # TODO: We shouldn't need to iterate like this.
-        if not self.allow_multiple_clients and any(
-            len(fgraph.clients.get(v)) > 1
-            for v in vars_between(fgraph.inputs, node.outputs)
-            if v not in fgraph.inputs
-        ):
-            return False
-
         if get_nodes and self.get_nodes is not None:
+            if self.has_multiple_clients(fgraph, node):
+                return False
             for real_node in self.get_nodes(fgraph, node):
                 if real_node == "output":
                     continue
@@ -1636,7 +1743,10 @@ class PatternNodeRewriter(NodeRewriter):
                 if ret is not False and ret is not None:
                     return dict(zip(real_node.outputs, ret))
 
-        if node.op != self.op:
+        if node.op != self.op or not self.net.match(node):
+            return False
+
+        if self.has_multiple_clients(fgraph, node):
             return False
 
         s = unify(self.in_pattern, node.out)
@@ -1922,6 +2032,20 @@ class NodeProcessingGraphRewriter(GraphRewriter):
         node_rewriter = node_rewriter or self.node_rewriter
         # TODO FIXME: This class's interface is broken
         assert node_rewriter is not None
+        profiler = getattr(fgraph, "rewrite_profiler", None)
+        if profiler is None:
+            return self._process_node(fgraph, node, node_rewriter)
+        token = profiler.start(node_rewriter)
+        applied = False
+        try:
+            applied = self._process_node(fgraph, node, node_rewriter)
+            return applied
+        finally:
+            profiler.stop(token, applied)
+
+    def _process_node(
+        self, fgraph: FunctionGraph, node: Apply, node_rewriter: NodeRewriter
+    ):
         try:
             replacements = node_rewriter.transform(fgraph, node)
         except Exception as e:
@@ -2192,19 +2316,50 @@ class OpKeyGraphRewriter(NodeProcessingGraphRewriter):
 
 
 class ChangeTracker(Feature):
-    def __init__(self):
+    """Record whether a `FunctionGraph` changed.
+
+    When `track_nodes` is ``True``, the nodes that could be rewritten
+    differently because of the changes are collected in `changed_nodes`: the
+    imported nodes, the nodes whose inputs changed and their clients, and the
+    owners of the variables that gained or lost a client.
+
+    """
+
+    def __init__(self, track_nodes: bool = False):
         self.changed = False
         self.nb_imported = 0
+        self.track_nodes = track_nodes
+        self.changed_nodes: Set[Apply] = set()
 
     def clone(self):
-        return type(self)()
+        return type(self)(self.track_nodes)
 
     def on_import(self, fgraph, node, reason):
         self.nb_imported += 1
         self.changed = True
+        if self.track_nodes:
+            self.changed_nodes.add(node)
+            self.add_owners(node.inputs)
+
+    def on_prune(self, fgraph, node, reason):
+        if self.track_nodes:
+            self.add_owners(node.inputs)
 
     def on_change_input(self, fgraph, node, i, r, new_r, reason):
         self.changed = True
+        if self.track_nodes:
+            self.add_owners((r, new_r))
+            if node != "output":
+                self.changed_nodes.add(node)
+                for out in node.outputs:
+                    for client, _ in fgraph.clients.get(out, ()):
+                        if client != "output":
+                            self.changed_nodes.add(client)
+
+    def add_owners(self, variables):
+        for var in variables:
+            if var.owner is not None:
+                self.changed_nodes.add(var.owner)
 
     def reset(self):
         self.changed = False
@@ -2241,6 +2396,7 @@ class EquilibriumGraphRewriter(NodeProcessingGraphRewriter):
         max_use_ratio: Optional[float] = None,
         final_rewriters: Optional[Sequence[GraphRewriter]] = None,
         cleanup_rewriters: Optional[Sequence[GraphRewriter]] = None,
+        worklist: bool = False,
     ):
         """
 
@@ -2267,6 +2423,12 @@ class EquilibriumGraphRewriter(NodeProcessingGraphRewriter):
             They should not traverse the entire graph, since they are called
             very frequently.  The `MergeOptimizer` is one example of a rewriter
             that respects this.
+        worklist
+            If ``True``, only the first iteration visits all the nodes.  The
+            following ones only visit the nodes affected by the changes made
+            since the previous visit (see `ChangeTracker`), which assumes that
+            the node rewriters only look at a node, the owners of its inputs
+            and its clients.
 
         """
         super().__init__(
@@ -2295,6 +2457,7 @@ class EquilibriumGraphRewriter(NodeProcessingGraphRewriter):
             self.cleanup_rewriters = []
 
         self.max_use_ratio = max_use_ratio
+        self.worklist = worklist
 
     def get_node_rewriters(self):
         yield from self.node_tracker.get_rewriters()
@@ -2319,7 +2482,7 @@ class EquilibriumGraphRewriter(NodeProcessingGraphRewriter):
             rewriter.add_requirements(fgraph)
 
     def apply(self, fgraph, start_from=None):
-        change_tracker = ChangeTracker()
+        change_tracker = ChangeTracker(track_nodes=self.worklist)
         fgraph.attach_feature(change_tracker)
         if start_from is None:
             start_from = fgraph.outputs
@@ -2342,6 +2505,7 @@ class EquilibriumGraphRewriter(NodeProcessingGraphRewriter):
         io_toposort_timing = []
         nb_nodes = []
         node_created = {}
+        node_rewriter_tries = {}
         global_sub_profs = []
         final_sub_profs = []
         cleanup_sub_profs = []
@@ -2354,6 +2518,8 @@ class EquilibriumGraphRewriter(NodeProcessingGraphRewriter):
             global_process_count.setdefault(rewriter, 0)
             time_rewriters.setdefault(rewriter, 0)
             node_created.setdefault(rewriter, 0)
+        for rewriter in self.get_node_rewriters():
+            node_rewriter_tries.setdefault(rewriter, 0)
 
         def apply_cleanup(profs_dict):
             changed = False
@@ -2361,7 +2527,7 @@ class EquilibriumGraphRewriter(NodeProcessingGraphRewriter):
                 change_tracker.reset()
                 nb = change_tracker.nb_imported
                 t_rewrite = time.perf_counter()
-                sub_prof = crewriter.apply(fgraph)
+                sub_prof = profiled_apply(crewriter, fgraph)
                 time_rewriters[crewriter] += time.perf_counter() - t_rewrite
                 profs_dict[crewriter].append(sub_prof)
                 if change_tracker.changed:
@@ -2386,7 +2552,7 @@ class EquilibriumGraphRewriter(NodeProcessingGraphRewriter):
                 change_tracker.reset()
                 nb = change_tracker.nb_imported
                 t_rewrite = time.perf_counter()
-                sub_prof = grewrite.apply(fgraph)
+                sub_prof = profiled_apply(grewrite, fgraph)
                 time_rewriters[grewrite] += time.perf_counter() - t_rewrite
                 sub_profs.append(sub_prof)
                 if change_tracker.changed:
@@ -2414,6 +2580,13 @@ class EquilibriumGraphRewriter(NodeProcessingGraphRewriter):
             max_nb_nodes = max(max_nb_nodes, len(q))
             max_use = max_nb_nodes * self.max_use_ratio
 
+            changed_nodes = change_tracker.changed_nodes
+            change_tracker.changed_nodes = set()
+            if self.worklist and loop_timing:
+                # The other nodes were already visited and nothing that they
+                # depend on changed since then
+                q = deque(node for node in q if node in changed_nodes)
+
             def importer(node):
                 if node is not current_node:
                     q.append(node)
@@ -2441,6 +2614,7 @@ class EquilibriumGraphRewriter(NodeProcessingGraphRewriter):
                             fgraph, node, node_rewriter
                         )
                         time_rewriters[node_rewriter] += time.perf_counter() - t_rewrite
+                        node_rewriter_tries[node_rewriter] += 1
                         if not node_rewriter_change:
                             continue
                         process_count.setdefault(node_rewriter, 0)
@@ -2467,7 +2641,7 @@ class EquilibriumGraphRewriter(NodeProcessingGraphRewriter):
                 change_tracker.reset()
                 nb = change_tracker.nb_imported
                 t_rewrite = time.perf_counter()
-                sub_prof = grewrite.apply(fgraph)
+                sub_prof = profiled_apply(grewrite, fgraph)
                 time_rewriters[grewrite] += time.perf_counter() - t_rewrite
                 sub_profs.append(sub_prof)
                 if change_tracker.changed:
@@ -2532,6 +2706,7 @@ class EquilibriumGraphRewriter(NodeProcessingGraphRewriter):
             global_sub_profs,
             final_sub_profs,
             cleanup_sub_profs,
+            node_rewriter_tries,
         )
 
     def print_summary(self, stream=sys.stdout, level=0, depth=-1):
@@ -2560,6 +2735,7 @@ class EquilibriumGraphRewriter(NodeProcessingGraphRewriter):
             global_sub_profs,
             final_sub_profs,
             cleanup_sub_profs,
+            node_rewriter_tries,
         ) = prof
 
         blanc = "    " * level
@@ -2582,6 +2758,18 @@ class EquilibriumGraphRewriter(NodeProcessingGraphRewriter):
         print(blanc, f"  time io_toposort {sum(io_toposort_timing):.3f}s", file=stream)
         s = sum(time_rewrites[o] for o in rewrite.get_node_rewriters())
         print(blanc, f"  time in node rewriters {s:.3f}s", file=stream)
+        nb_tries = sum(node_rewriter_tries.values())
+        nb_applied = sum(
+            count
+            for loop_count in loop_process_count
+            for o, count in loop_count.items()
+            if o in node_rewriter_tries
+        )
+        print(
+            blanc,
+            f"  node rewriter calls {nb_tries} ({nb_tries - nb_applied} returned False)",
+            file=stream,
+        )
         s = sum(time_rewrites[o] for o in rewrite.global_rewriters)
         print(blanc, f"  time in graph rewriters {s:.3f}s", file=stream)
         s = sum(time_rewrites[o] for o in rewrite.final_rewriters)
@@ -2622,20 +2810,30 @@ class EquilibriumGraphRewriter(NodeProcessingGraphRewriter):
                 process_count[o] += v
         for o, count in process_count.items():
             if count > 0:
-                count_rewrite.append((time_rewrites[o], count, node_created[o], o))
+                count_rewrite.append(
+                    (
+                        time_rewrites[o],
+                        count,
+                        node_rewriter_tries.get(o, count),
+                        node_created[o],
+                        o,
+                    )
+                )
             else:
                 not_used.append((time_rewrites[o], o))
                 not_used_time += time_rewrites[o]
 
         if count_rewrite:
             print(
-                blanc, "  times - times applied - nb node created - name:", file=stream
+                blanc,
+                "  times - times applied - times tried - nb node created - name:",
+                file=stream,
             )
-            count_rewrite.sort()
-            for t, count, n_created, o in count_rewrite[::-1]:
+            count_rewrite.sort(key=lambda cr: cr[:4])
+            for t, count, tries, n_created, o in count_rewrite[::-1]:
                 print(
                     blanc,
-                    f"  {t:.3f}s - {int(count)} - {int(n_created)} - {o}",
+                    f"  {t:.3f}s - {int(count)} - {int(tries)} - {int(n_created)} - {o}",
                     file=stream,
                 )
             print(
@@ -2652,7 +2850,7 @@ class EquilibriumGraphRewriter(NodeProcessingGraphRewriter):
         gf_rewrites = [
             o
             for o in (
-                rewrite.global_rewrites
+                rewrite.global_rewriters
                 + list(rewrite.final_rewriters)
                 + list(rewrite.cleanup_rewriters)
             )
@@ -2774,6 +2972,7 @@ class EquilibriumGraphRewriter(NodeProcessingGraphRewriter):
         assert len(loop_timing) == max(len(prof1[1]), len(prof2[1]))
 
         node_created = merge_dict(prof1[8], prof2[8])
+        node_rewriter_tries = merge_dict(prof1[12], prof2[12])
         return (
             new_rewriter,
             loop_timing,
@@ -2787,6 +2986,7 @@ class EquilibriumGraphRewriter(NodeProcessingGraphRewriter):
             global_sub_profs,
             final_sub_profs,
             cleanup_sub_profs,
+            node_rewriter_tries,
         )
 
 
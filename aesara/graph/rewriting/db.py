@@ -363,6 +363,7 @@ class EquilibriumDB(RewriteDatabase):
             failure_callback=aesara_rewriting.NodeProcessingGraphRewriter.warn_inplace,
             final_rewriters=final_rewriters,
             cleanup_rewriters=cleanup_rewriters,
+            worklist=config.optdb__worklist,
         )
 
 
@@ -0,0 +1,250 @@
+"""Structured profiling of graph rewrites.
+
+A `RewriteProfiler` attached to a `FunctionGraph` records, for each stack of
+nested rewriters (e.g. ``("fast_run", "canonicalize", "local_mul_canonizer")``),
+the time spent, the number of calls and successful applications, and the
+number of nodes created and removed.  The results can be exported as JSON, as
+"collapsed stacks" (the input format of ``flamegraph.pl`` and many other
+flame graph tools) or as a `speedscope <https://www.speedscope.app>`_ profile.
+
+"""
+import json
+import time
+from dataclasses import asdict, dataclass
+from typing import IO, TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+
+from aesara.graph.features import AlreadyThere, Feature
+
+
+if TYPE_CHECKING:
+    from aesara.graph.fg import FunctionGraph
+    from aesara.graph.rewriting.basic import GraphRewriter, Rewriter
+
+
+def rewriter_name(rewriter: "Rewriter") -> str:
+    """Return the name under which `rewriter` is profiled."""
+    return (
+        getattr(rewriter, "name", None)
+        or getattr(rewriter, "__name__", None)
+        or type(rewriter).__name__
+    )
+
+
+def profiled_apply(rewriter: "GraphRewriter", fgraph: "FunctionGraph", *args, **kwargs):
+    """Call ``rewriter.apply`` and record it in ``fgraph.rewrite_profiler``, if there's one."""
+    profiler = getattr(fgraph, "rewrite_profiler", None)
+    if profiler is None:
+        return rewriter.apply(fgraph, *args, **kwargs)
+    token = profiler.start(rewriter)
+    try:
+        return rewriter.apply(fgraph, *args, **kwargs)
+    finally:
+        profiler.stop(token)
+
+
+@dataclass
+class RewriteStats:
+    """The statistics of a rewriter for a given stack of rewriters."""
+
+    time: float = 0.0
+    """The total time spent in the rewriter, including the nested rewriters."""
+    calls: int = 0
+    applied: int = 0
+    """The number of calls that changed the graph."""
+    nodes_created: int = 0
+    """The number of nodes imported by the rewriter itself."""
+    nodes_removed: int = 0
+    """The number of nodes pruned by the rewriter itself."""
+
+    def merge(self, other: "RewriteStats"):
+        self.time += other.time
+        self.calls += other.calls
+        self.applied += other.applied
+        self.nodes_created += other.nodes_created
+        self.nodes_removed += other.nodes_removed
+
+
+class RewriteProfiler(Feature):
+    r"""A `Feature` that records the statistics of the rewriters applied to a `FunctionGraph`.
+
+    The rewriters find the profiler through ``fgraph.rewrite_profiler`` and
+    report their calls with `RewriteProfiler.start` and `RewriteProfiler.stop`.
+
+    The same profiler can be attached to several `FunctionGraph`\s in turn
+    (or its results combined with `RewriteProfiler.merge`) in order to profile
+    the compilation of a whole program.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        profiler = RewriteProfiler()
+        fgraph.attach_feature(profiler)
+        rewriter.rewrite(fgraph)
+        fgraph.remove_feature(profiler)
+        profiler.dump("rewrites.speedscope.json", format="speedscope")
+
+    """
+
+    def __init__(self):
+        self.stats: Dict[Tuple[str, ...], RewriteStats] = {}
+        self.stack: Tuple[str, ...] = ()
+        self.current: Optional[RewriteStats] = None
+        self.nb_changes = 0
+
+    def on_attach(self, fgraph):
+        if hasattr(fgraph, "rewrite_profiler"):
+            raise AlreadyThere()
+        fgraph.rewrite_profiler = self
+
+    def on_detach(self, fgraph):
+        del fgraph.rewrite_profiler
+
+    def clone(self):
+        return type(self)()
+
+    def on_import(self, fgraph, node, reason):
+        self.nb_changes += 1
+        if self.current is not None:
+            self.current.nodes_created += 1
+
+    def on_prune(self, fgraph, node, reason):
+        self.nb_changes += 1
+        if self.current is not None:
+            self.current.nodes_removed += 1
+
+    def on_change_input(self, fgraph, node, i, r, new_r, reason=None):
+        self.nb_changes += 1
+
+    def start(self, rewriter: "Rewriter"):
+        """Record the start of a call to `rewriter`.
+
+        Returns
+        -------
+        A token that must be passed to `RewriteProfiler.stop` once the call is
+        over.
+
+        """
+        token = (self.stack, self.current, self.nb_changes, time.perf_counter())
+        self.stack = self.stack + (rewriter_name(rewriter),)
+        stats = self.stats.get(self.stack)
+        if stats is None:
+            stats = self.stats[self.stack] = RewriteStats()
+        stats.calls += 1
+        self.current = stats
+        return token
+
+    def stop(self, token, applied: Optional[bool] = None):
+        """Record the end of the call started by the `RewriteProfiler.start` that returned `token`.
+
+        When `applied` is ``None``, the call is considered successful if it
+        changed the graph.
+
+        """
+        stack, current, nb_changes, t0 = token
+        stats = self.current
+        assert stats is not None
+        stats.time += time.perf_counter() - t0
+        if applied is None:
+            applied = self.nb_changes != nb_changes
+        if applied:
+            stats.applied += 1
+        self.stack = stack
+        self.current = current
+
+    def merge(self, other: "RewriteProfiler"):
+        """Add the statistics of `other` to this profiler."""
+        for stack, stats in other.stats.items():
+            self.stats.setdefault(stack, RewriteStats()).merge(stats)
+
+    def self_times(self) -> Dict[Tuple[str, ...], float]:
+        """Return the time spent in each stack, excluding its nested rewriters."""
+        res = {stack: stats.time for stack, stats in self.stats.items()}
+        for stack, stats in self.stats.items():
+            if len(stack) > 1 and stack[:-1] in res:
+                res[stack[:-1]] -= stats.time
+        return {stack: max(t, 0.0) for stack, t in res.items()}
+
+    def to_dict(self) -> dict:
+        """Return the statistics as a JSON-serializable ``dict``."""
+        self_times = self.self_times()
+        rewrites = []
+        for stack, stats in sorted(self.stats.items(), key=lambda s: -s[1].time):
+            rewrites.append(
+                dict(
+                    name=stack[-1],
+                    stack=list(stack),
+                    self_time=self_times[stack],
+                    **asdict(stats),
+                )
+            )
+        total_time = sum(
+            stats.time for stack, stats in self.stats.items() if len(stack) == 1
+        )
+        return {"total_time": total_time, "rewrites": rewrites}
+
+    def to_collapsed_stacks(self) -> List[str]:
+        """Return the self time of each stack in the "collapsed stacks" format.
+
+        Each line has the form ``"outer;inner;innermost <microseconds>"``.
+
+        """
+        return [
+            f"{';'.join(stack)} {round(t * 1e6)}"
+            for stack, t in self.self_times().items()
+            if round(t * 1e6) > 0
+        ]
+
+    def to_speedscope(self, name: str = "Aesara rewrites") -> dict:
+        """Return the statistics as a speedscope "sampled" profile."""
+        frames: Dict[str, int] = {}
+        samples = []
+        weights = []
+        for stack, t in self.self_times().items():
+            samples.append([frames.setdefault(frame, len(frames)) for frame in stack])
+            weights.append(t)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": [{"name": frame} for frame in frames]},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+            "name": name,
+            "exporter": "aesara",
+        }
+
+    def dump(self, file: Union[str, IO], format: str = "json"):
+        """Write the statistics to `file`.
+
+        Parameters
+        ----------
+        file
+            A path or a text file object.
+        format
+            One of ``"json"`` (see `RewriteProfiler.to_dict`), ``"collapsed"``
+            (see `RewriteProfiler.to_collapsed_stacks`) or ``"speedscope"``.
+
+        """
+        if format == "json":
+            content = json.dumps(self.to_dict(), indent=1)
+        elif format == "collapsed":
+            content = "\n".join(self.to_collapsed_stacks())
+        elif format == "speedscope":
+            content = json.dumps(self.to_speedscope())
+        else:
+            raise ValueError(f"Unknown rewrite profile format: {format}")
+
+        if isinstance(file, str):
+            with open(file, "w") as f:
+                f.write(content)
+        else:
+            file.write(content)
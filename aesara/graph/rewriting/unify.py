@@ -12,7 +12,7 @@ that satisfies the constraints. That's useful for pattern matching.
 
 from collections.abc import Mapping
 from numbers import Number
-from typing import Dict, Optional, Tuple, Union
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple, Union
 
 import numpy as np
 from cons.core import ConsError, _car, _cdr
@@ -22,7 +22,7 @@ from unification.core import _unify, assoc
 from unification.utils import transitive_get as walk
 from unification.variable import Var, isvar, var
 
-from aesara.graph.basic import Constant, Variable
+from aesara.graph.basic import Apply, Constant, Variable
 from aesara.graph.op import Op
 from aesara.graph.type import Type
 
@@ -291,3 +291,97 @@ def convert_strs_to_vars(
         return y
 
     return _convert(x)
+
+
+# The symbols of a pattern that don't depend on the `Op` of a term
+_ANY = "*"
+_CONSTANT = "c"
+
+
+def pattern_symbols(pattern: Any) -> List[Hashable]:
+    r"""Flatten a pattern returned by `convert_strs_to_vars` in pre-order.
+
+    An `etuple` headed by an `Op` becomes the pair of that `Op` and its number
+    of arguments, followed by the symbols of its arguments.  A `Constant`
+    becomes a symbol that only matches `Constant`\s.  Everything else (e.g.
+    logic variables, or `etuple`\s headed by a logic variable) becomes a
+    symbol that matches any term.
+
+    """
+    symbols: List[Hashable] = []
+    todo = [pattern]
+    while todo:
+        p = todo.pop()
+        if isinstance(p, ExpressionTuple) and len(p) > 0 and isinstance(p[0], Op):
+            args = list(p)[1:]
+            symbols.append((p[0], len(args)))
+            todo.extend(reversed(args))
+        elif isinstance(p, Constant):
+            symbols.append(_CONSTANT)
+        else:
+            symbols.append(_ANY)
+    return symbols
+
+
+class _NetNode:
+    __slots__ = ("children", "values")
+
+    def __init__(self):
+        self.children: Dict[Hashable, "_NetNode"] = {}
+        self.values: List[Any] = []
+
+
+class DiscriminationNet:
+    r"""An index of patterns that finds the ones that could match a graph.
+
+    The patterns are stored in a trie keyed by their `pattern_symbols`, so a
+    single walk over the graph of a node finds the candidates among all the
+    patterns.  The walk only follows the parts of the graph that the patterns
+    describe.
+
+    The candidates are a superset of the patterns that unify with the graph:
+    repeated logic variables, constraints and the values of `Constant`\s
+    aren't checked here.
+
+    """
+
+    def __init__(self):
+        self.root = _NetNode()
+
+    def add(self, pattern: Any, value: Any) -> None:
+        """Index `value` under `pattern`."""
+        net_node = self.root
+        for symbol in pattern_symbols(pattern):
+            net_node = net_node.children.setdefault(symbol, _NetNode())
+        net_node.values.append(value)
+
+    def match(self, node: Apply) -> Set[Any]:
+        """Return the values whose patterns could match an output of `node`."""
+        results: Set[Any] = set()
+        todo: List[Tuple[_NetNode, Tuple[Variable, ...]]] = [
+            (self.root, (node.outputs[0],))
+        ]
+        while todo:
+            net_node, terms = todo.pop()
+            if not terms:
+                results.update(net_node.values)
+                continue
+
+            term, rest = terms[0], terms[1:]
+            children = net_node.children
+
+            child = children.get(_ANY)
+            if child is not None:
+                todo.append((child, rest))
+
+            owner = term.owner
+            if owner is not None:
+                child = children.get((owner.op, len(owner.inputs)))
+                if child is not None:
+                    todo.append((child, tuple(owner.inputs) + rest))
+            elif isinstance(term, Constant):
+                child = children.get(_CONSTANT)
+                if child is not None:
+                    todo.append((child, rest))
+
+        return results
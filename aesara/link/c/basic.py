@@ -21,14 +21,9 @@ from aesara.graph.basic import (
     vars_between,
 )
 from aesara.link.basic import Container, Linker, LocalLinker, PerformLinker
-from aesara.link.c.cmodule import (
-    METH_VARARGS,
-    DynamicModule,
-    ExtFunction,
-    GCC_compiler,
-    dlimport_workdir,
-)
+from aesara.link.c.cmodule import METH_VARARGS, DynamicModule, ExtFunction, GCC_compiler
 from aesara.link.c.cmodule import get_module_cache as _get_module_cache
+from aesara.link.c.cmodule import module_name_from_dir, module_workdir
 from aesara.link.c.interface import CLinkerObject, CLinkerOp, CLinkerType
 from aesara.link.utils import gc_helper, map_storage, raise_with_op, streamline
 from aesara.utils import difference, uniq
@@ -1528,31 +1523,48 @@ class CLinker(Linker):
         This compiles the source code for this linker and returns a
         loaded module.
 
+        The compilation lock is not held during the compilation: a caller
+        compiling in a shared `location` must hold the lock of the module (see
+        `ModuleCache.module_from_key`).
+
         """
         if location is None:
-            location = dlimport_workdir(config.compiledir)
+            with lock_ctx():
+                location = module_workdir(config.compiledir)
+        return self._compile_str(self._compile_str_kwargs(location))
+
+    def compile_cmodule_library(self, location):
+        """
+        Compile the source code for this linker in `location` and return the
+        path to the resulting shared library, without importing it.
+
+        This lets several modules be compiled at the same time by threads, and
+        imported afterwards (see `ModuleCache.compile_modules`).
+
+        """
+        compile_kwargs = self._compile_str_kwargs(location)
+        self._compile_str(compile_kwargs, py_module=False)
+        return module_name_from_dir(location)
+
+    def _compile_str_kwargs(self, location):
         mod = self.get_dynamic_module()
-        c_compiler = self.c_compiler()
-        libs = self.libraries()
-        preargs = self.compile_args()
-        # We want to compute the code without the lock
-        src_code = mod.code()
-        with lock_ctx():
-            try:
-                _logger.debug(f"LOCATION {location}")
-                module = c_compiler.compile_str(
-                    module_name=mod.code_hash,
-                    src_code=src_code,
-                    location=location,
-                    include_dirs=self.header_dirs(),
-                    lib_dirs=self.lib_dirs(),
-                    libs=libs,
-                    preargs=preargs,
-                )
-            except Exception as e:
-                e.args += (str(self.fgraph),)
-                raise
-        return module
+        return dict(
+            module_name=mod.code_hash,
+            src_code=mod.code(),
+            location=location,
+            include_dirs=self.header_dirs(),
+            lib_dirs=self.lib_dirs(),
+            libs=self.libraries(),
+            preargs=self.compile_args(),
+        )
+
+    def _compile_str(self, compile_kwargs, py_module=True):
+        try:
+            _logger.debug(f"LOCATION {compile_kwargs['location']}")
+            return self.c_compiler().compile_str(py_module=py_module, **compile_kwargs)
+        except Exception as e:
+            e.args += (str(self.fgraph),)
+            raise
 
     def get_dynamic_module(self):
         """
@@ -1786,6 +1798,76 @@ class _CThunk:
         return f"{type(self).__name__}({self.module})"
 
 
+def node_clinkers(nodes, storage_map=None, compute_map=None, no_recycling=()):
+    r"""
+    Return the single-node `CLinker`\s that `COp.make_c_thunk` builds for
+    `nodes`.
+
+    The nodes whose `Op` doesn't make its thunks through a `CLinker`, or whose
+    linker cannot be built, are skipped.
+
+    """
+    # Imported here to avoid an import cycle
+    from aesara.graph.fg import FunctionGraph
+    from aesara.link.c.op import COp
+
+    linkers = []
+    for node in nodes:
+        op_type = type(node.op)
+        if (
+            not isinstance(node.op, COp)
+            or op_type.make_thunk is not COp.make_thunk
+            or op_type.make_c_thunk is not COp.make_c_thunk
+        ):
+            continue
+        if not getattr(node.op, "_f16_ok", False) and any(
+            getattr(var.type, "dtype", "") == "float16"
+            for var in node.inputs + node.outputs
+        ):
+            continue
+        try:
+            node.op.prepare_node(
+                node, storage_map=storage_map, compute_map=compute_map, impl="c"
+            )
+            fgraph = FunctionGraph(node.inputs, node.outputs)
+            fgraph_no_recycling = [
+                new_o
+                for (new_o, old_o) in zip(fgraph.outputs, node.outputs)
+                if old_o in no_recycling
+            ]
+            linker = CLinker().accept(fgraph, no_recycling=fgraph_no_recycling)
+            for fgraph_node in linker.node_order:
+                fgraph_node.op.prepare_node(fgraph_node, None, None, "c")
+        except Exception:
+            # The thunk will report the problem, if any, when it is made
+            continue
+        linkers.append(linker)
+
+    return linkers
+
+
+def compile_node_cmodules(nodes, storage_map, compute_map, no_recycling):
+    """
+    Compile the missing C modules of the thunks of `nodes` in parallel.
+
+    This hands the linkers returned by `node_clinkers` to
+    `ModuleCache.compile_modules`, so that the following calls to
+    `Op.make_thunk` find their modules in the cache.  Nothing is done unless
+    `config.cmodule__compile_workers` is greater than one.
+
+    Returns
+    -------
+    int
+        The number of modules that were compiled.
+
+    """
+    if config.cmodule__compile_workers < 2 or not config.cxx:
+        return 0
+
+    linkers = node_clinkers(nodes, storage_map, compute_map, no_recycling)
+    return get_module_cache().compile_modules(linkers)
+
+
 class OpWiseCLinker(LocalLinker):
     """
     Uses CLinker on the individual Ops that comprise an fgraph and loops
@@ -1820,6 +1902,9 @@ class OpWiseCLinker(LocalLinker):
         self.fgraph = None
         self.fallback_on_perform = fallback_on_perform
         self.nice_errors = nice_errors
+        # Set by `prepare_inner_functions` when the C modules of the graph's
+        # nodes were already compiled along with those of other graphs
+        self.cmodules_compiled = False
         super().__init__(allow_gc=allow_gc, scheduler=schedule)
 
     def accept(self, fgraph, no_recycling=None, profile=None):
@@ -1860,6 +1945,9 @@ class OpWiseCLinker(LocalLinker):
         for k in storage_map:
             compute_map[k] = [k.owner is None]
 
+        if not getattr(self, "cmodules_compiled", False):
+            compile_node_cmodules(order, storage_map, compute_map, no_recycling)
+
         thunks = []
         for node in order:
             # make_thunk will try by default C code, otherwise
@@ -3,7 +3,9 @@ Generate and compile C modules for Python.
 
 """
 import atexit
+import hashlib
 import importlib
+import json
 import logging
 import os
 import pickle
@@ -16,8 +18,10 @@ import sys
 import sysconfig
 import tempfile
 import textwrap
+import threading
 import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO, StringIO
 from typing import (
     TYPE_CHECKING,
@@ -40,7 +44,7 @@ from setuptools._distutils.sysconfig import (
 )
 
 # we will abuse the lockfile mechanism when reading and writing the registry
-from aesara.compile.compilelock import lock_ctx
+from aesara.compile.compilelock import lock_ctx, module_lock_ctx
 from aesara.configdefaults import config, gcc_version_str
 from aesara.configparser import BoolParam, StrParam
 from aesara.graph.op import Op
@@ -85,6 +89,9 @@ METH_VARARGS = "METH_VARARGS"
 METH_NOARGS = "METH_NOARGS"
 # global variable that represent the total time spent in importing module.
 import_time = 0
+# global variable that represent the total time spent running the C compiler.
+# Modules compiled in parallel all add their compilation time.
+compile_time = 0
 
 
 def debug_counter(name, every=1):
@@ -278,6 +285,10 @@ def _get_ext_suffix():
     return dist_suffix
 
 
+_dlimport_lock = threading.RLock()
+_compile_time_lock = threading.Lock()
+
+
 def dlimport(fullpath, suffix=None):
     """
     Dynamically load a .so, .pyd, .dll, or .py file.
@@ -326,25 +337,29 @@ def dlimport(fullpath, suffix=None):
     _logger.debug(f"WORKDIR {workdir}")
     _logger.debug(f"module_name {module_name}")
 
-    sys.path[0:0] = [workdir]  # insert workdir at beginning (temporarily)
-    # Explicitly add gcc dll directory on Python 3.8+ on Windows
-    if (sys.platform == "win32") & (hasattr(os, "add_dll_directory")):
-        gcc_path = shutil.which("gcc")
-        if gcc_path is not None:
-            os.add_dll_directory(os.path.dirname(gcc_path))
-    global import_time
-    try:
-        importlib.invalidate_caches()
-        t0 = time.perf_counter()
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", message="numpy.ndarray size changed")
-            rval = __import__(module_name, {}, {}, [module_name])
-        t1 = time.perf_counter()
-        import_time += t1 - t0
-        if not rval:
-            raise Exception("__import__ failed", fullpath)
-    finally:
-        del sys.path[0]
+    # Modules may be compiled and imported by several threads now that the
+    # compilation lock isn't held during compilation, so the temporary change
+    # of `sys.path` must be protected
+    with _dlimport_lock:
+        sys.path[0:0] = [workdir]  # insert workdir at beginning (temporarily)
+        # Explicitly add gcc dll directory on Python 3.8+ on Windows
+        if (sys.platform == "win32") & (hasattr(os, "add_dll_directory")):
+            gcc_path = shutil.which("gcc")
+            if gcc_path is not None:
+                os.add_dll_directory(os.path.dirname(gcc_path))
+        global import_time
+        try:
+            importlib.invalidate_caches()
+            t0 = time.perf_counter()
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore", message="numpy.ndarray size changed")
+                rval = __import__(module_name, {}, {}, [module_name])
+            t1 = time.perf_counter()
+            import_time += t1 - t0
+            if not rval:
+                raise Exception("__import__ failed", fullpath)
+        finally:
+            del sys.path[0]
 
     assert fullpath.startswith(rval.__file__)
     return rval
@@ -360,6 +375,23 @@ def dlimport_workdir(basedir):
     return tempfile.mkdtemp(dir=basedir)
 
 
+def module_workdir(basedir):
+    """
+    Return a new directory in which a module can be compiled while the lock of
+    `basedir` isn't held.
+
+    Unlike the directories returned by `dlimport_workdir`, it contains an
+    ``__init__.py`` file, so that `ModuleCache.refresh` doesn't remove it as an
+    empty directory before the compilation starts.  This function must be
+    called with the lock of `basedir` held.
+
+    """
+    location = dlimport_workdir(basedir)
+    with open(os.path.join(location, "__init__.py"), "w"):
+        pass
+    return location
+
+
 def last_access_time(path):
     """
     Return the number of seconds since the epoch of the last access of a
@@ -369,6 +401,11 @@ def last_access_time(path):
     return os.stat(path)[stat.ST_ATIME]
 
 
+def _is_stats(name):
+    """Tell whether `name` is a file written by `ModuleCache.save_stats`."""
+    return name.startswith("stats-") and name.endswith(".json")
+
+
 def module_name_from_dir(dirname, err=True, files=None):
     """
     Scan the contents of a cache directory and return full path of the
@@ -615,6 +652,208 @@ class KeyData:
                     pass
 
 
+def _key_summary(obj):
+    if isinstance(obj, (str, bytes, int, float, type(None))):
+        return repr(obj)
+    if isinstance(obj, (tuple, list)):
+        return f"({','.join(map(_key_summary, obj))})"
+    if isinstance(obj, (set, frozenset)):
+        return f"{{{','.join(sorted(map(_key_summary, obj)))}}}"
+    # Neither `hash` nor `pickle` give the same result in every process
+    return f"<{type(obj).__module__}.{type(obj).__qualname__}>"
+
+
+def key_digest(key):
+    """
+    Return a digest of `key` that is the same in every process.
+
+    Only the builtin values of `key` are used, so keys that only differ by
+    their other objects, e.g. their `Op`s, have the same digest.
+
+    """
+    return hashlib.sha256(_key_summary(key).encode()).hexdigest()
+
+
+class ModuleIndex:
+    """
+    An append-only index of the ``key.pkl`` files stored in a compilation
+    directory.
+
+    It lets `ModuleCache` find the module of a key or of a module hash from a
+    single file, without listing, reading or unpickling each module directory.
+    The `KeyData` of an indexed module is only unpickled, and its directory
+    checked, when the module is first used.
+
+    The file starts with a header holding `ModuleIndex.version`, followed by
+    one pickled record per module directory.  A record is a tuple of builtin
+    values::
+
+        (dir name, key.pkl mtime in ns, key.pkl size, module file name,
+         key.pkl content, module hash, key digests)
+
+    where the key digests are given by `key_digest`.  Records are only written
+    for the valid `KeyData` of versioned modules, and a record is only trusted
+    while the modification time and size of its ``key.pkl`` file are
+    unchanged, so that stale records are simply ignored.
+    When a directory has several records, the last one wins.  Records are
+    appended under the compilation lock, and the file is rewritten from scratch
+    when it contains too many stale records.
+
+    Parameters
+    ----------
+    filename
+        Path to the index file.
+
+    """
+
+    version = 2
+    """
+    Version of the file format.  Files with another version are ignored.
+
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.n_records = 0
+        # Whether the file was found to be complete and up to date by the last
+        # call to `ModuleIndex.load`, i.e. whether records can be appended to it
+        self.valid = False
+        # The records of the file, and the modification time and size of the
+        # file they were read from, so that an unchanged file isn't read again
+        self._records = {}
+        self._stamp = None
+
+    def _file_stamp(self):
+        st = os.stat(self.filename)
+        return (st.st_mtime_ns, st.st_size)
+
+    def load(self):
+        """
+        Return a dictionary mapping directory names to their latest record.
+
+        A missing or outdated index yields an empty dictionary.  Reading stops
+        at the first corrupted record, e.g. one truncated by an interrupted
+        write; in that case, `ModuleIndex.valid` is set to ``False``.
+
+        """
+        try:
+            if self._stamp is not None and self._file_stamp() == self._stamp:
+                return dict(self._records)
+        except OSError:
+            pass
+
+        records = {}
+        self.n_records = 0
+        self.valid = False
+        self._stamp = None
+        try:
+            with open(self.filename, "rb") as f:
+                if pickle.load(f) != ("aesara-module-index", self.version):
+                    return records
+                end = f.tell()
+                while True:
+                    try:
+                        record = pickle.load(f)
+                    except EOFError:
+                        break
+                    records[record[0]] = record
+                    self.n_records += 1
+                    end = f.tell()
+                st = os.fstat(f.fileno())
+                self.valid = end == st.st_size
+                if self.valid:
+                    self._records = dict(records)
+                    self._stamp = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            pass
+        except Exception:
+            _logger.info(f"Ignoring broken module index {self.filename}")
+        return records
+
+    def append(self, records):
+        """
+        Add `records` at the end of the index.
+
+        The index must have been found valid by `ModuleIndex.load`.
+
+        """
+        assert self.valid
+        with open(self.filename, "ab") as f:
+            for record in records:
+                pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.n_records += len(records)
+        self._records.update((record[0], record) for record in records)
+        self._stamp = self._file_stamp()
+
+    def rewrite(self, records):
+        """
+        Replace the content of the index with `records`.
+
+        """
+        records = list(records)
+        dirname = os.path.dirname(self.filename)
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=dirname, prefix="module_index", suffix=".tmp", delete=False
+        ) as f:
+            pickle.dump(
+                ("aesara-module-index", self.version),
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+            for record in records:
+                pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f.name, self.filename)
+        self.n_records = len(records)
+        self.valid = True
+        self._records = {record[0]: record for record in records}
+        self._stamp = self._file_stamp()
+
+    @staticmethod
+    def read_key_pkl(root):
+        """
+        Return the status and the content of the ``key.pkl`` file of `root`.
+
+        """
+        with open(os.path.join(root, "key.pkl"), "rb") as f:
+            return os.fstat(f.fileno()), f.read()
+
+    @staticmethod
+    def make_record(root, entry, st, content, key_data):
+        """
+        Return the record of directory `root`.
+
+        `st` and `content` are returned by `ModuleIndex.read_key_pkl`, and
+        `key_data` is the `KeyData` unpickled from `content`.
+
+        """
+        return (
+            os.path.basename(root),
+            st.st_mtime_ns,
+            st.st_size,
+            os.path.basename(entry),
+            content,
+            key_data.module_hash,
+            tuple({key_digest(key) for key in key_data.keys}),
+        )
+
+    @staticmethod
+    def is_valid(root, record):
+        """
+        Return whether `record` still describes the content of `root`.
+
+        """
+        try:
+            st = os.stat(os.path.join(root, "key.pkl"))
+        except OSError:
+            return False
+        return (
+            st.st_mtime_ns == record[1]
+            and st.st_size == record[2]
+            and os.path.exists(os.path.join(root, record[3]))
+            and not os.path.exists(os.path.join(root, "delete.me"))
+        )
+
+
 class ModuleCache:
     """
     Interface to the cache of dynamically compiled modules on disk.
@@ -637,6 +876,11 @@ class ModuleCache:
     - possibly a ``delete.me`` file, meaning this directory has been marked
     for deletion.
 
+    Unless `config.cmodule__index` is disabled, the cache directory also
+    contains a `ModuleIndex` file, ``module_index.pkl``, which holds a copy of
+    every ``key.pkl`` file so that `ModuleCache.refresh` doesn't have to read
+    each module directory.
+
     Keys should be tuples of length two: ``(version, rest)``. The
     rest can be anything hashable and picklable, that uniquely
     identifies the computation in the module. The key is returned by
@@ -708,6 +952,12 @@ class ModuleCache:
     A list with counters for the number of hits, loads, compiles issued by
     `ModuleCache.module_from_key`.
 
+    """
+    saved_stats: List = []
+    """
+    The values of `ModuleCache.stats` when they were last saved by
+    `ModuleCache.save_stats`.
+
     """
     loaded_key_pkl: Set = set()
     """
@@ -722,12 +972,19 @@ class ModuleCache:
         self.module_hash_to_key_data = dict(self.module_hash_to_key_data)
         self.similar_keys = dict(self.similar_keys)
         self.stats = [0, 0, 0]
+        self.saved_stats = [0, 0, 0]
         self.check_for_broken_eq = check_for_broken_eq
         self.loaded_key_pkl = set()
         self.time_spent_in_check_key = 0
+        self.index = ModuleIndex(os.path.join(dirname, "module_index.pkl"))
+        # The records of the indexed modules that aren't loaded yet, by
+        # directory name, and their names by module hash and key digest
+        self._indexed = {}
+        self._indexed_by_hash = {}
+        self._indexed_by_digest = {}
 
         if do_refresh:
-            self.refresh()
+            self.refresh(lazy=True)
 
     age_thresh_use = config.cmodule__age_thresh_use  # default 24 days
     """
@@ -751,11 +1008,15 @@ class ModuleCache:
             self.stats[0] += 1
         return self.module_from_name[name]
 
-    def refresh(self, age_thresh_use=None, delete_if_problem=False, cleanup=True):
+    def refresh(
+        self, age_thresh_use=None, delete_if_problem=False, cleanup=True, lazy=False
+    ):
         """
         Update cache data by walking the cache directory structure.
 
-        Load key.pkl files that have not been loaded yet.
+        Load key.pkl files that have not been loaded yet, using the
+        `ModuleIndex` of the cache directory when its records are up to date,
+        and add the key.pkl files that had to be read to the index.
         Remove entries which have been removed from the filesystem.
         Also, remove malformed cache directories.
 
@@ -771,6 +1032,9 @@ class ModuleCache:
             - Duplicated modules, regardless of their age.
         cleanup : bool
             Do a cleanup of the cache removing expired and broken modules.
+        lazy : bool
+            Don't check the modules that are in the index: they are only
+            checked and loaded when they are first used.
 
         Returns
         -------
@@ -811,17 +1075,70 @@ class ModuleCache:
         # to lock on the compilation directory so that those processes don't
         # work with stale/invalid data
         with lock_ctx():
+            use_index = config.cmodule__index
+            if use_index:
+                indexed_records = self.index.load()
+            else:
+                indexed_records = {}
+            # The records of the directories that are still valid, and those
+            # that are missing from the index
+            live_records = {}
+            new_records = []
+            # The indexed modules that aren't loaded, which are listed again
+            # since some directories may be gone
+            self._indexed = {}
+            self._indexed_by_hash = {}
+            self._indexed_by_digest = {}
+
+            def duplicated(root, entry):
+                # This may happen when two processes running
+                # simultaneously compiled the same module, one
+                # after the other. We delete one once it is old
+                # enough (to be confident there is no other process
+                # using it), or if `delete_if_problem` is True.
+                # Note that it is important to walk through
+                # directories in alphabetical order so as to make
+                # sure all new processes only use the first one.
+                if cleanup:
+                    age = time.perf_counter() - last_access_time(entry)
+                    if delete_if_problem or age > self.age_thresh_del:
+                        rmtree(
+                            root,
+                            ignore_nocleanup=True,
+                            msg="duplicated module",
+                            level=logging.DEBUG,
+                        )
+                    else:
+                        _logger.debug(
+                            "Found duplicated module not "
+                            "old enough yet to be deleted "
+                            f"(age: {age}): {entry}",
+                        )
+
             for subdirs_elem in subdirs:
                 # Never clean/remove lock_dir
                 if subdirs_elem == "lock_dir":
                     continue
                 root = os.path.join(self.dirname, subdirs_elem)
                 key_pkl = os.path.join(root, "key.pkl")
+                record = indexed_records.get(subdirs_elem)
                 if key_pkl in self.loaded_key_pkl:
+                    if record is not None:
+                        live_records[subdirs_elem] = record
                     continue
-                if not os.path.isdir(root):
+                if record is not None and lazy:
+                    # The record is checked when the module is first used
+                    live_records[subdirs_elem] = record
+                    self._add_indexed(record)
                     continue
-                files = os.listdir(root)
+                if record is not None and ModuleIndex.is_valid(root, record):
+                    # The index spares us from listing the directory
+                    files = [record[3], "key.pkl"]
+                elif not os.path.isdir(root):
+                    continue
+                else:
+                    record = None
+                    files = os.listdir(root)
                 if not files:
                     rmtree_empty(root, ignore_nocleanup=True, msg="empty dir")
                     continue
@@ -848,6 +1165,19 @@ class ModuleCache:
                         )
                         continue
                     if (time_now - last_access_time(entry)) < age_thresh_use:
+                        if record is not None:
+                            # The `KeyData` of the record was checked when the
+                            # record was made, so it's only loaded when used
+                            live_records[subdirs_elem] = record
+                            if (
+                                record[5] in self.module_hash_to_key_data
+                                or record[5] in self._indexed_by_hash
+                            ):
+                                duplicated(root, entry)
+                            else:
+                                self._add_indexed(record)
+                            continue
+
                         _logger.debug(f"refresh adding {key_pkl}")
 
                         def unpickle_failure():
@@ -856,8 +1186,8 @@ class ModuleCache:
                             )
 
                         try:
-                            with open(key_pkl, "rb") as f:
-                                key_data = pickle.load(f)
+                            st, content = ModuleIndex.read_key_pkl(root)
+                            key_data = pickle.loads(content)
                         except EOFError:
                             # Happened once... not sure why (would be worth
                             # investigating if it ever happens again).
@@ -888,127 +1218,25 @@ class ModuleCache:
                                 pass
                             continue
 
-                        if not isinstance(key_data, KeyData):
-                            # This is some old cache data, that does not fit
-                            # the new cache format. It would be possible to
-                            # update it, but it is not entirely safe since we
-                            # do not know the config options that were used.
-                            # As a result, we delete it instead (which is also
-                            # simpler to implement).
-                            rmtree(
-                                root,
-                                ignore_nocleanup=True,
-                                msg=(
-                                    "Invalid cache entry format.  This "
-                                    "should not happen unless the cache "
-                                    "is outdated."
-                                ),
-                                level=logging.WARN,
-                            )
+                        if not self._check_key_data(key_data, entry, key_pkl, rmtree):
                             continue
 
-                        # Check the path to the module stored in the KeyData
-                        # object matches the path to `entry`. There may be
-                        # a mismatch e.g. due to symlinks, or some directory
-                        # being renamed since last time cache was created.
-                        kd_entry = key_data.get_entry()
-                        if kd_entry != entry:
-                            if is_same_entry(entry, kd_entry):
-                                # Update KeyData object. Note that we also need
-                                # to update the key_pkl field, because it is
-                                # likely to be incorrect if the entry itself
-                                # was wrong.
-                                key_data.entry = entry
-                                key_data.key_pkl = key_pkl
-                            else:
-                                # This is suspicious. Better get rid of it.
-                                rmtree(
-                                    root,
-                                    ignore_nocleanup=True,
-                                    msg="module file path mismatch",
-                                    level=logging.INFO,
-                                )
-                                continue
-
-                        # Find unversioned keys from other processes.
-                        # TODO: check if this can happen at all
-                        to_del = [key for key in key_data.keys if not key[0]]
-                        if to_del:
-                            warnings.warn(
-                                "`ModuleCache.refresh` found an unversioned "
-                                f"key in the cache ({key_pkl}); removing it."
-                            )
-                            # Since the version is in the module hash, all
-                            # keys should be unversioned.
-                            if len(to_del) != len(key_data.keys):
-                                warnings.warn(
-                                    "Found a mix of unversioned and "
-                                    "versioned keys for the same "
-                                    f"module {key_pkl}",
-                                )
-                            rmtree(
-                                root,
-                                ignore_nocleanup=True,
-                                msg="unversioned key(s) in cache",
-                                level=logging.INFO,
+                        if use_index:
+                            record = ModuleIndex.make_record(
+                                root, entry, st, content, key_data
                             )
-                            continue
+                            new_records.append(record)
+                            live_records[subdirs_elem] = record
 
                         mod_hash = key_data.module_hash
-                        if mod_hash in self.module_hash_to_key_data:
-                            # This may happen when two processes running
-                            # simultaneously compiled the same module, one
-                            # after the other. We delete one once it is old
-                            # enough (to be confident there is no other process
-                            # using it), or if `delete_if_problem` is True.
-                            # Note that it is important to walk through
-                            # directories in alphabetical order so as to make
-                            # sure all new processes only use the first one.
-                            if cleanup:
-                                age = time.perf_counter() - last_access_time(entry)
-                                if delete_if_problem or age > self.age_thresh_del:
-                                    rmtree(
-                                        root,
-                                        ignore_nocleanup=True,
-                                        msg="duplicated module",
-                                        level=logging.DEBUG,
-                                    )
-                                else:
-                                    _logger.debug(
-                                        "Found duplicated module not "
-                                        "old enough yet to be deleted "
-                                        f"(age: {age}): {entry}",
-                                    )
+                        if (
+                            mod_hash in self.module_hash_to_key_data
+                            or mod_hash in self._indexed_by_hash
+                        ):
+                            duplicated(root, entry)
                             continue
 
-                        # Remember the map from a module's hash to the KeyData
-                        # object associated with it.
-                        self.module_hash_to_key_data[mod_hash] = key_data
-
-                        for key in key_data.keys:
-                            if key not in self.entry_from_key:
-                                self.entry_from_key[key] = entry
-                                # Assert that we have not already got this
-                                # entry somehow.
-                                assert entry not in self.module_from_name
-                                # Store safe part of versioned keys.
-                                if key[0]:
-                                    self.similar_keys.setdefault(
-                                        get_safe_part(key), []
-                                    ).append(key)
-                            else:
-                                dir1 = os.path.dirname(self.entry_from_key[key])
-                                dir2 = os.path.dirname(entry)
-                                warnings.warn(
-                                    "The same cache key is associated with "
-                                    f"different modules ({dir1} and {dir2}). This "
-                                    "is not supposed to happen.  The cache directory "
-                                    "may need to be manually delete in order to fix this."
-                                )
-                        # Clean up the name space to prevent bug.
-                        if key_data.keys:
-                            del key
-                        self.loaded_key_pkl.add(key_pkl)
+                        self._load_key_data(key_data, entry, key_pkl)
                     else:
                         too_old_to_use.append(entry)
 
@@ -1016,9 +1244,22 @@ class ModuleCache:
                 # directory, but a mod.* should be there.
                 # We do nothing here.
 
+            # Each process saves its statistics to a new file, so they are
+            # merged whenever the lock is held
+            self._merge_stats(
+                [
+                    os.path.join(self.dirname, name)
+                    for name in subdirs
+                    if _is_stats(name)
+                ]
+            )
+
             # Clean up the name space to prevent bug.
             del root, files, subdirs
 
+            if use_index:
+                self._update_index(live_records, new_records, to_delete)
+
             # Remove entries that are not in the filesystem.
             items_copy = list(self.module_hash_to_key_data.items())
             for module_hash, key_data in items_copy:
@@ -1078,6 +1319,193 @@ class ModuleCache:
 
         return too_old_to_use
 
+    def _check_key_data(self, key_data, entry, key_pkl, rmtree):
+        """
+        Return whether `key_data`, read from `key_pkl`, can be used.
+
+        The directories of the unusable ones are passed to `rmtree`.
+
+        """
+        if not isinstance(key_data, KeyData):
+            # This is some old cache data, that does not fit
+            # the new cache format. It would be possible to
+            # update it, but it is not entirely safe since we
+            # do not know the config options that were used.
+            # As a result, we delete it instead (which is also
+            # simpler to implement).
+            rmtree(
+                os.path.dirname(key_pkl),
+                ignore_nocleanup=True,
+                msg=(
+                    "Invalid cache entry format.  This "
+                    "should not happen unless the cache "
+                    "is outdated."
+                ),
+                level=logging.WARN,
+            )
+            return False
+
+        # Check the path to the module stored in the KeyData
+        # object matches the path to `entry`. There may be
+        # a mismatch e.g. due to symlinks, or some directory
+        # being renamed since last time cache was created.
+        kd_entry = key_data.get_entry()
+        if kd_entry != entry:
+            if is_same_entry(entry, kd_entry):
+                # Update KeyData object. Note that we also need
+                # to update the key_pkl field, because it is
+                # likely to be incorrect if the entry itself
+                # was wrong.
+                key_data.entry = entry
+                key_data.key_pkl = key_pkl
+            else:
+                # This is suspicious. Better get rid of it.
+                rmtree(
+                    os.path.dirname(key_pkl),
+                    ignore_nocleanup=True,
+                    msg="module file path mismatch",
+                    level=logging.INFO,
+                )
+                return False
+
+        # Find unversioned keys from other processes.
+        # TODO: check if this can happen at all
+        to_del = [key for key in key_data.keys if not key[0]]
+        if to_del:
+            warnings.warn(
+                "`ModuleCache.refresh` found an unversioned "
+                f"key in the cache ({key_pkl}); removing it."
+            )
+            # Since the version is in the module hash, all
+            # keys should be unversioned.
+            if len(to_del) != len(key_data.keys):
+                warnings.warn(
+                    "Found a mix of unversioned and "
+                    "versioned keys for the same "
+                    f"module {key_pkl}",
+                )
+            rmtree(
+                os.path.dirname(key_pkl),
+                ignore_nocleanup=True,
+                msg="unversioned key(s) in cache",
+                level=logging.INFO,
+            )
+            return False
+        return True
+
+    def _load_key_data(self, key_data, entry, key_pkl):
+        """
+        Add the keys of `key_data`, read from `key_pkl`, to the cache.
+
+        """
+        # Remember the map from a module's hash to the KeyData
+        # object associated with it.
+        self.module_hash_to_key_data[key_data.module_hash] = key_data
+
+        for key in key_data.keys:
+            if key not in self.entry_from_key:
+                self.entry_from_key[key] = entry
+                # Assert that we have not already got this
+                # entry somehow.
+                assert entry not in self.module_from_name
+                # Store safe part of versioned keys.
+                if key[0]:
+                    self.similar_keys.setdefault(get_safe_part(key), []).append(key)
+            else:
+                dir1 = os.path.dirname(self.entry_from_key[key])
+                dir2 = os.path.dirname(entry)
+                warnings.warn(
+                    "The same cache key is associated with "
+                    f"different modules ({dir1} and {dir2}). This "
+                    "is not supposed to happen.  The cache directory "
+                    "may need to be manually delete in order to fix this."
+                )
+        self.loaded_key_pkl.add(key_pkl)
+
+    def _add_indexed(self, record):
+        """
+        Make the module of an index `record` available without loading it.
+
+        """
+        name = record[0]
+        self._indexed[name] = record
+        self._indexed_by_hash.setdefault(record[5], name)
+        for digest in record[6]:
+            self._indexed_by_digest.setdefault(digest, []).append(name)
+
+    def _load_indexed(self, name):
+        """
+        Load the `KeyData` of the indexed module directory `name`.
+
+        The directory is only checked now, and nothing is loaded if it changed
+        in a way that `ModuleCache.refresh` would have to clean up.  A stale
+        record, e.g. after another process added a key to the module, is
+        replaced in the index.
+
+        """
+        record = self._indexed.pop(name, None)
+        if record is None or record[5] in self.module_hash_to_key_data:
+            return
+        root = os.path.join(self.dirname, name)
+        key_pkl = os.path.join(root, "key.pkl")
+
+        def rmtree(*args, **kwargs):
+            # It's left to the next `ModuleCache.refresh`
+            pass
+
+        try:
+            if ModuleIndex.is_valid(root, record):
+                entry = os.path.join(root, record[3])
+                key_data = pickle.loads(record[4])
+            else:
+                with lock_ctx():
+                    files = os.listdir(root)
+                    if "delete.me" in files or "key.pkl" not in files:
+                        return
+                    entry = module_name_from_dir(root, files=files)
+                    st, content = ModuleIndex.read_key_pkl(root)
+                    key_data = pickle.loads(content)
+                    if not self._check_key_data(key_data, entry, key_pkl, rmtree):
+                        return
+                    if config.cmodule__index:
+                        records = self.index.load()
+                        record = ModuleIndex.make_record(
+                            root, entry, st, content, key_data
+                        )
+                        records[name] = record
+                        self._update_index(records, [record], [])
+            if time.perf_counter() - last_access_time(entry) >= self.age_thresh_use:
+                return
+        except Exception:
+            _logger.debug(f"Could not load the indexed module {root}", exc_info=True)
+            return
+
+        if self._check_key_data(key_data, entry, key_pkl, rmtree):
+            self._load_key_data(key_data, entry, key_pkl)
+
+    def _find_key(self, key):
+        """
+        Return the module file of `key`, loading it from the index if needed.
+
+        """
+        if key not in self.entry_from_key and self._indexed_by_digest:
+            for name in self._indexed_by_digest.get(key_digest(key), ()):
+                self._load_indexed(name)
+                if key in self.entry_from_key:
+                    break
+        return self.entry_from_key.get(key)
+
+    def _find_hash(self, module_hash):
+        """
+        Return the `KeyData` of `module_hash`, loading it from the index if needed.
+
+        """
+        if module_hash not in self.module_hash_to_key_data:
+            name = self._indexed_by_hash.get(module_hash)
+            if name is not None:
+                self._load_indexed(name)
+        return self.module_hash_to_key_data.get(module_hash)
+
     def _get_from_key(self, key, key_data=None):
         """
         Returns a module if the passed-in key is found in the cache
@@ -1093,8 +1521,7 @@ class ModuleCache:
                 _version, _rest = key
             except (TypeError, ValueError):
                 raise ValueError("Invalid key. key must have form (version, rest)", key)
-            if key in self.entry_from_key:
-                name = self.entry_from_key[key]
+            name = self._find_key(key)
         else:
             assert key_data is not None
             name = key_data.get_entry()
@@ -1103,9 +1530,13 @@ class ModuleCache:
         return self._get_module(name)
 
     def _get_from_hash(self, module_hash, key):
-        if module_hash in self.module_hash_to_key_data:
-            key_data = self.module_hash_to_key_data[module_hash]
+        key_data = self._find_hash(module_hash)
+        if key_data is not None:
             module = self._get_from_key(None, key_data)
+            if key in key_data.keys:
+                # Another process added `key` to the module after it was
+                # indexed, and it was loaded by `ModuleCache._find_hash`
+                return module
             with lock_ctx():
                 try:
                     key_data.add_key(key, save_pkl=bool(key[0]))
@@ -1207,36 +1638,42 @@ class ModuleCache:
         if module is not None:
             return module
 
-        with lock_ctx():
-            # 1) Maybe somebody else compiled it for us while we
-            #    where waiting for the lock. Try to load it again.
-            # 2) If other repo that import Aesara have Aesara ops defined,
-            #    we need to refresh the cache here. Otherwise, there are import
-            #    order problems.
-            #    (Outdated) When device=gpu, we compile during Aesara
-            #    import. This triggers the loading of the cache. But
-            #    unpickling the cache asks that the external Ops are
-            #    completely loaded, which isn't always the case!
-            #    If a module isn't completely loaded and its unpickling
-            #    fails, it means it is safe for this function
-            #    compilation to skip them, but not for future
-            #    compilations. So reloading the cache here
-            #    compilation fixes this problem. (we could do that only once)
-            self.refresh(cleanup=False)
-
-            module = self._get_from_key(key)
-            if module is not None:
-                return module
-
-            module = self._get_from_hash(module_hash, key)
-            if module is not None:
-                return module
+        # Only one process at a time compiles a given module, but other
+        # modules can be compiled concurrently.  The lock of the whole
+        # compilation directory is only held while the cache content is read
+        # or modified.
+        with module_lock_ctx(module_hash, lock_dir=self.dirname):
+            with lock_ctx():
+                # 1) Maybe somebody else compiled it for us while we
+                #    where waiting for the lock. Try to load it again.
+                # 2) If other repo that import Aesara have Aesara ops defined,
+                #    we need to refresh the cache here. Otherwise, there are import
+                #    order problems.
+                #    (Outdated) When device=gpu, we compile during Aesara
+                #    import. This triggers the loading of the cache. But
+                #    unpickling the cache asks that the external Ops are
+                #    completely loaded, which isn't always the case!
+                #    If a module isn't completely loaded and its unpickling
+                #    fails, it means it is safe for this function
+                #    compilation to skip them, but not for future
+                #    compilations. So reloading the cache here
+                #    compilation fixes this problem. (we could do that only once)
+                self.refresh(cleanup=False, lazy=True)
+
+                module = self._get_from_key(key)
+                if module is not None:
+                    return module
+
+                module = self._get_from_hash(module_hash, key)
+                if module is not None:
+                    return module
+
+                location = module_workdir(self.dirname)
 
             hash_key = hash(key)
 
             nocleanup = False
             try:
-                location = dlimport_workdir(self.dirname)
                 module = lnk.compile_cmodule(location)
                 name = module.__file__
                 assert name.startswith(location)
@@ -1262,12 +1699,131 @@ class ModuleCache:
             # compilation.
             assert hash(key) == hash_key
 
-            key_data = self._add_to_cache(module, key, module_hash)
-            self.module_hash_to_key_data[module_hash] = key_data
+            with lock_ctx():
+                key_data = self._add_to_cache(module, key, module_hash)
+                self.module_hash_to_key_data[module_hash] = key_data
 
         self.stats[2] += 1
         return module
 
+    def compile_modules(self, linkers, n_workers=None):
+        """
+        Compile the modules of `linkers` that are missing from the cache, in
+        parallel.
+
+        The modules are added to the cache exactly as `ModuleCache.module_from_key`
+        would, so a later call to that method for one of the `linkers` is a
+        cache hit.  Linkers sharing the same module are only compiled once.
+
+        Linkers that cannot produce a key or source code, and modules whose
+        compilation fails, are skipped: they are left to
+        `ModuleCache.module_from_key`, which reports the errors as usual.
+
+        Parameters
+        ----------
+        linkers
+            `CLinker` instances.  Besides the methods used by
+            `ModuleCache.module_from_key`, they must define
+            `compile_cmodule_library(location)`, which compiles the shared
+            library without importing it.
+        n_workers
+            The number of modules compiled at the same time.  Defaults to
+            `config.cmodule__compile_workers`.
+
+        Returns
+        -------
+        int
+            The number of modules that were compiled.
+
+        """
+        if n_workers is None:
+            n_workers = config.cmodule__compile_workers
+
+        if n_workers < 2:
+            return 0
+
+        missing = {}
+        for lnk in linkers:
+            try:
+                key = lnk.cmodule_key()
+            except Exception:
+                _logger.debug("Cannot compile a module in parallel", exc_info=True)
+                continue
+            if key is not None and self._find_key(key) is None:
+                missing.setdefault(key, lnk)
+
+        # There is nothing to gain over `module_from_key` for a single module,
+        # and generating the code is expensive
+        if len(missing) < 2:
+            return 0
+
+        pending = {}
+        for key, lnk in missing.items():
+            try:
+                module_hash = get_module_hash(lnk.get_src_code(), key)
+            except Exception:
+                _logger.debug("Cannot compile a module in parallel", exc_info=True)
+                continue
+            if module_hash not in pending and self._find_hash(module_hash) is None:
+                pending[module_hash] = (key, lnk)
+
+        if not pending:
+            return 0
+
+        n_compiled = 0
+        with module_lock_ctx(*pending, lock_dir=self.dirname):
+            with lock_ctx():
+                # Another process may have compiled some of the modules while
+                # we were waiting for the locks
+                self.refresh(cleanup=False, lazy=True)
+                pending = {
+                    module_hash: (key, lnk)
+                    for module_hash, (key, lnk) in pending.items()
+                    if self._find_key(key) is None
+                    and self._find_hash(module_hash) is None
+                }
+                locations = {
+                    module_hash: module_workdir(self.dirname) for module_hash in pending
+                }
+
+            # The compiler runs in subprocesses, so threads are enough to keep
+            # `n_workers` of them busy.  The modules are imported and added to
+            # the cache in this thread.
+            with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                futures = {
+                    module_hash: executor.submit(
+                        lnk.compile_cmodule_library, locations[module_hash]
+                    )
+                    for module_hash, (key, lnk) in pending.items()
+                }
+
+            for module_hash, future in futures.items():
+                key, lnk = pending[module_hash]
+                location = locations[module_hash]
+                try:
+                    module = dlimport(future.result())
+                except Exception:
+                    _logger.debug(
+                        "Parallel compilation of a module failed", exc_info=True
+                    )
+                    _rmtree(
+                        location,
+                        ignore_if_missing=True,
+                        msg="exception during compilation",
+                    )
+                    continue
+                name = module.__file__
+                assert name.startswith(location)
+                assert name not in self.module_from_name
+                self.module_from_name[name] = module
+                with lock_ctx():
+                    key_data = self._add_to_cache(module, key, module_hash)
+                    self.module_hash_to_key_data[module_hash] = key_data
+                self.stats[2] += 1
+                n_compiled += 1
+
+        return n_compiled
+
     def check_key(self, key, key_pkl):
         """
         Perform checks to detect broken __eq__ / __hash__ implementations.
@@ -1378,7 +1934,22 @@ class ModuleCache:
             delete_if_problem=delete_if_problem,
             # The clean up is done at init, no need to trigger it again
             cleanup=False,
+            # The broken indexed modules are left to `ModuleCache.clear`
+            lazy=not delete_if_problem,
         )
+        if age_thresh_use is None:
+            age_thresh_use = self.age_thresh_use
+        time_now = time.perf_counter()
+        # Only the age of the indexed modules that weren't loaded is needed
+        for name, record in list(self._indexed.items()):
+            entry = os.path.join(self.dirname, name, record[3])
+            try:
+                age = time_now - last_access_time(entry)
+            except OSError:
+                continue
+            if age >= age_thresh_use:
+                too_old_to_use.append(entry)
+                del self._indexed[name]
         if not too_old_to_use:
             return
         with lock_ctx():
@@ -1401,6 +1972,181 @@ class ModuleCache:
                     ignore_nocleanup=True,
                 )
 
+    def clear_lru(self, max_size=None, max_entries=None):
+        """Delete the least recently used modules until the cache fits limits.
+
+        The modules are ordered by the last access time of their module file.
+        Unversioned modules are deleted before all versioned ones, and the
+        modules loaded by this process are never deleted.
+
+        This refreshes the content of the cache.  Don't hold the lock while
+        calling this method, it will be taken.
+
+        Parameters
+        ----------
+        max_size
+            The maximum total size, in megabytes, of the module directories.
+            ``0`` means no limit.  Defaults to `config.cmodule__max_cache_size`.
+        max_entries
+            The maximum number of module directories.  ``0`` means no limit.
+            Defaults to `config.cmodule__max_cache_entries`.
+
+        Returns
+        -------
+        tuple of int
+            The number of deleted modules and the number of bytes reclaimed.
+
+        """
+        if max_size is None:
+            max_size = config.cmodule__max_cache_size
+        if max_entries is None:
+            max_entries = config.cmodule__max_cache_entries
+        if max_size <= 0 and max_entries <= 0:
+            return 0, 0
+
+        self.refresh(cleanup=False, lazy=True)
+
+        n_removed = 0
+        n_bytes = 0
+        with lock_ctx():
+            modules = []
+            total_size = 0
+            for subdir in os.listdir(self.dirname):
+                if not subdir.startswith("tmp"):
+                    continue
+                root = os.path.join(self.dirname, subdir)
+                try:
+                    entry = module_name_from_dir(root, err=False)
+                    if entry is None:
+                        # This module is being compiled
+                        continue
+                    size = sum(e.stat().st_size for e in os.scandir(root))
+                    access_time = last_access_time(entry)
+                except (OSError, ValueError):
+                    continue
+                total_size += size
+                versioned = os.path.join(
+                    root, "key.pkl"
+                ) in self.loaded_key_pkl or os.path.exists(
+                    os.path.join(root, "key.pkl")
+                )
+                modules.append((versioned, access_time, size, entry))
+
+            n_entries = len(modules)
+            max_bytes = max_size * 1024 * 1024
+            for versioned, access_time, size, entry in sorted(modules):
+                if (max_size <= 0 or total_size <= max_bytes) and (
+                    max_entries <= 0 or n_entries <= max_entries
+                ):
+                    break
+                if entry in self.module_from_name:
+                    continue
+                self._remove_entry(entry)
+                _rmtree(
+                    os.path.dirname(entry),
+                    msg="least recently used module",
+                    level=logging.DEBUG,
+                    ignore_nocleanup=True,
+                )
+                total_size -= size
+                n_entries -= 1
+                n_removed += 1
+                n_bytes += size
+
+        if n_removed:
+            _logger.info(
+                f"Deleted {n_removed} modules ({n_bytes} bytes) from {self.dirname}"
+            )
+        return n_removed, n_bytes
+
+    def _remove_entry(self, entry):
+        """Forget about the module file `entry`."""
+        for module_hash, key_data in list(self.module_hash_to_key_data.items()):
+            if key_data.get_entry() == entry:
+                key_data.delete_keys_from(self.entry_from_key)
+                del self.module_hash_to_key_data[module_hash]
+                self.loaded_key_pkl.discard(key_data.key_pkl)
+        self._indexed.pop(os.path.basename(os.path.dirname(entry)), None)
+
+    def save_stats(self):
+        """Save the `ModuleCache.stats` gathered since the last call.
+
+        Each call writes them to a new ``stats-*.json`` file of the cache
+        directory, so the compilation lock isn't needed.  These files are summed
+        by `ModuleCache.load_stats`, and merged into the ``stats.json`` file
+        by the next `ModuleCache.refresh`.
+
+        """
+        new_stats = [n - n_saved for n, n_saved in zip(self.stats, self.saved_stats)]
+        if not any(new_stats):
+            return
+        try:
+            fd, tmp_name = tempfile.mkstemp(
+                prefix="stats-", suffix=".json.tmp", dir=self.dirname
+            )
+            with os.fdopen(fd, "w") as f:
+                json.dump(dict(zip(("hits", "loads", "compiles"), new_stats)), f)
+            # Readers never see a partially written file
+            os.replace(tmp_name, tmp_name[: -len(".tmp")])
+            self.saved_stats = list(self.stats)
+        except OSError as e:
+            _logger.debug(f"Could not save the module cache statistics: {e}")
+
+    def _stats_files(self):
+        try:
+            return [
+                os.path.join(self.dirname, name)
+                for name in os.listdir(self.dirname)
+                if _is_stats(name)
+            ]
+        except OSError:
+            return []
+
+    def load_stats(self):
+        """Return the statistics saved by `ModuleCache.save_stats`.
+
+        Returns
+        -------
+        dict
+            The number of modules found in memory (``"hits"``), loaded from
+            disk (``"loads"``) and compiled (``"compiles"``).
+
+        """
+        return self._sum_stats(self._stats_files())
+
+    def _sum_stats(self, filenames):
+        stats = dict(hits=0, loads=0, compiles=0)
+        for filename in [os.path.join(self.dirname, "stats.json")] + filenames:
+            try:
+                with open(filename) as f:
+                    for name, value in json.load(f).items():
+                        stats[name] += value
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+        return stats
+
+    def _merge_stats(self, filenames):
+        """Merge the ``stats-*.json`` files `filenames` into ``stats.json``.
+
+        This method must be called with the compilation lock held.
+
+        """
+        if not filenames:
+            return
+        # Only merge these files, more can be written meanwhile
+        stats = self._sum_stats(filenames)
+        try:
+            fd, tmp_name = tempfile.mkstemp(
+                prefix="stats-", suffix=".json.tmp", dir=self.dirname
+            )
+            with os.fdopen(fd, "w") as f:
+                json.dump(stats, f)
+            os.replace(tmp_name, os.path.join(self.dirname, "stats.json"))
+            for filename in filenames:
+                os.remove(filename)
+        except OSError as e:
+            _logger.debug(f"Could not merge the module cache statistics: {e}")
+
     def clear(
         self, unversioned_min_age=None, clear_base_files=False, delete_if_problem=False
     ):
@@ -1427,6 +2173,72 @@ class ModuleCache:
             if clear_base_files:
                 self.clear_base_files()
 
+    def _update_index(self, live_records, new_records, to_delete):
+        """
+        Add `new_records` to the index, or rewrite it with `live_records` when
+        it holds too many stale records.
+
+        Records of the directories in `to_delete` are dropped.  This method
+        must be called with the compilation lock held.
+
+        """
+        deleted = {os.path.basename(args[0]) for args, _ in to_delete}
+        for name in deleted:
+            live_records.pop(name, None)
+        try:
+            if (
+                not self.index.valid
+                or self.index.n_records > 2 * len(live_records) + 64
+            ):
+                self.index.rewrite(live_records.values())
+            else:
+                new_records = [r for r in new_records if r[0] not in deleted]
+                if new_records:
+                    self.index.append(new_records)
+        except OSError:
+            _logger.warning(
+                f"Could not update the module index {self.index.filename}",
+                exc_info=True,
+            )
+
+    def rebuild_index(self):
+        """
+        Rewrite the `ModuleIndex` of the cache directory from scratch.
+
+        Returns
+        -------
+        int
+            The number of modules in the new index.
+
+        """
+        with lock_ctx():
+            records = []
+            try:
+                subdirs = sorted(os.listdir(self.dirname))
+            except OSError:
+                subdirs = []
+            for subdirs_elem in subdirs:
+                root = os.path.join(self.dirname, subdirs_elem)
+                if not os.path.isdir(root):
+                    continue
+                try:
+                    files = os.listdir(root)
+                    if "delete.me" in files or "key.pkl" not in files:
+                        continue
+                    entry = module_name_from_dir(root, files=files)
+                    st, content = ModuleIndex.read_key_pkl(root)
+                    key_data = pickle.loads(content)
+                except Exception:
+                    continue
+                if isinstance(key_data, KeyData) and all(
+                    key[0] for key in key_data.keys
+                ):
+                    records.append(
+                        ModuleIndex.make_record(root, entry, st, content, key_data)
+                    )
+            self.index.rewrite(records)
+        return len(records)
+
     def clear_base_files(self):
         """
         Remove base directories 'cutils_ext', 'lazylinker_ext' and
@@ -1576,6 +2388,8 @@ class ModuleCache:
         # take the lock when it happen.
         self.clear_old()
         self.clear_unversioned()
+        self.clear_lru()
+        self.save_stats()
         _logger.debug(f"Time spent checking keys: {self.time_spent_in_check_key}")
 
 
@@ -2600,6 +3414,8 @@ class GCC_compiler(Compiler):
             )
             print(" ".join(cmd), file=sys.stderr)
 
+        global compile_time
+        t0 = time.perf_counter()
         try:
             p_out = output_subprocess_Popen(cmd)
             compile_stderr = p_out[1].decode()
@@ -2607,6 +3423,9 @@ class GCC_compiler(Compiler):
             # An exception can occur e.g. if `g++` is not found.
             print_command_line_error()
             raise
+        finally:
+            with _compile_time_lock:
+                compile_time += time.perf_counter() - t0
 
         status = p_out[2]
 
@@ -5,12 +5,15 @@ A VM is not actually different from a Linker, we just decided
 VM was a better name at some point.
 
 """
+import os
 import platform
 import sys
+import threading
 import time
 import warnings
 from abc import ABC, abstractmethod
 from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from itertools import zip_longest
 from typing import (
     TYPE_CHECKING,
@@ -26,6 +29,7 @@ from typing import (
 from aesara.configdefaults import config
 from aesara.graph.basic import Apply, Constant, Variable
 from aesara.link.basic import Container, LocalLinker
+from aesara.link.c.basic import compile_node_cmodules
 from aesara.link.c.exceptions import MissingGXX
 from aesara.link.utils import (
     gc_helper,
@@ -166,6 +170,142 @@ def calculate_reallocate_info(
     return reallocated_info
 
 
+def calculate_storage_plan(
+    order: Sequence[Apply],
+    fgraph: "FunctionGraph",
+    no_recycling: Sequence[Variable] = (),
+    window: int = 1024,
+) -> Dict[Variable, Variable]:
+    """Assign the intermediate results of a graph to shared buffers.
+
+    The VMs don't all evaluate the nodes in `order` (e.g. the `CVM` computes
+    them on demand, and only for the outputs that are requested), so the
+    lifetime of a result is described by the nodes that use its memory: the
+    node that computes it and the clients of the result and of all its views
+    and destroyers.  A node can write into the buffer of a result when all
+    those nodes are among its ancestors, since they are then done in any
+    valid evaluation order.  The results are assigned to buffers in `order`,
+    preferring a free buffer last used by the exact same `Type`, then the
+    most recently freed one.
+
+    Sizes are not known before run-time, so two results are only allowed to
+    share a buffer when their types are in the same class (see
+    `Type.in_same_class`).  Inputs, constants, outputs, the variables in
+    `no_recycling` and everything that aliases them are never planned.
+
+    The ancestors are only tracked among the `window` nodes that precede
+    each node, so that the memory used by the planning is linear in the size
+    of the graph.  A buffer can thus only be reused while all its users are
+    among those nodes; this is rarely a limitation, since the free buffers
+    are reused as early as possible.
+
+    Parameters
+    ----------
+    order
+        List of nodes in compute order.
+    fgraph
+        The `FunctionGraph`.
+    no_recycling
+        Variables whose storage must not be shared.
+    window
+        The number of preceding nodes among which the ancestors of a node are
+        tracked.
+
+    Returns
+    -------
+    A map from each planned variable to the variable that owns the buffer
+    it is assigned to.  Variables that own a buffer map to themselves.
+
+    """
+    position = {node: idx for idx, node in enumerate(order)}
+    pinned = set(fgraph.inputs) | set(fgraph.outputs) | set(no_recycling)
+
+    # The ancestors of each node among the `window` nodes that precede it,
+    # as bit sets where bit ``k`` stands for the position ``idx - window + k``
+    ancestors: List[int] = []
+    for idx, node in enumerate(order):
+        mask = 0
+        for inp in node.inputs:
+            if inp.owner is not None:
+                idx_i = position[inp.owner]
+                mask |= (ancestors[idx_i] | (1 << window)) >> (idx - idx_i)
+        ancestors.append(mask)
+
+    # The variables that own the memory of each view or destroyed input
+    owners: Dict[Variable, Tuple[Variable, ...]] = {}
+    for node in order:
+        for idx_o, out in enumerate(node.outputs):
+            idx_v = tuple(node.op.destroy_map.get(idx_o, ())) + tuple(
+                node.op.view_map.get(idx_o, ())
+            )
+            if idx_v:
+                owners[out] = tuple(
+                    origin
+                    for i in idx_v
+                    for origin in owners.get(node.inputs[i], (node.inputs[i],))
+                )
+
+    # The positions of the nodes that use the memory of each variable, and
+    # the position of the last one
+    users: DefaultDict[Variable, List[int]] = defaultdict(list)
+    last_use: Dict[Variable, float] = {}
+    for node in order:
+        for out in node.outputs:
+            positions = [position[node]]
+            last: float = position[node]
+            for client, _ in fgraph.clients[out]:
+                if isinstance(client, Apply):
+                    positions.append(position[client])
+                    last = max(last, position[client])
+                else:
+                    last = float("inf")
+            if out in pinned:
+                last = float("inf")
+            for origin in owners.get(out, (out,)):
+                users[origin].extend(positions)
+                last_use[origin] = max(last_use.get(origin, last), last)
+
+    plan: Dict[Variable, Variable] = {}
+    # The free buffers, with the position of their first user and the bit set
+    # of the positions of their users relative to it
+    free: List[Tuple[Variable, Any, int, int]] = []
+    expiring: DefaultDict[float, List[Tuple[Variable, Any, int, int]]] = defaultdict(
+        list
+    )
+    for idx, node in enumerate(order):
+        free.extend(expiring.pop(idx - 1, ()))
+        # The buffers with users out of the window can't be reused anymore
+        free = [buffer for buffer in free if buffer[2] >= idx - window]
+        for out in node.outputs:
+            if (
+                out in owners
+                or last_use[out] == float("inf")
+                or getattr(out.type, "ndim", None) is None
+            ):
+                continue
+            best = None
+            for i in range(len(free) - 1, -1, -1):
+                _, buffer_type, first_user, buffer_users = free[i]
+                buffer_users <<= first_user - idx + window
+                if buffer_users & ancestors[idx] != buffer_users:
+                    continue
+                if buffer_type == out.type:
+                    best = i
+                    break
+                if best is None and out.type.in_same_class(buffer_type):
+                    best = i
+            buffer = out if best is None else free.pop(best)[0]
+            plan[out] = buffer
+            first_user = min(users[out])
+            if max(users[out]) - first_user < window:
+                mask = 0
+                for user in users[out]:
+                    mask |= 1 << (user - first_user)
+                expiring[last_use[out]].append((buffer, out.type, first_user, mask))
+
+    return plan
+
+
 class VM(ABC):
     r"""An abstract class for evaluating Aesara programs.
 
@@ -228,7 +368,7 @@ class VM(ABC):
         self.thunks = thunks
         self.pre_call_clear = pre_call_clear
         self.call_counts = [0] * len(nodes)
-        self.call_times = [0] * len(nodes)
+        self.call_times: List[float] = [0] * len(nodes)
         self.time_thunks = False
         self.storage_map: Optional[StorageMapType] = None
 
@@ -785,6 +925,184 @@ class Stack(UpdatingVM):
         return self.perform_updates()
 
 
+_thread_pools: Dict[int, ThreadPoolExecutor] = {}
+_thread_pools_lock = threading.Lock()
+_worker_state = threading.local()
+
+
+def _init_worker():
+    _worker_state.in_pool = True
+
+
+def get_thread_pool(n_threads: int) -> ThreadPoolExecutor:
+    """Return the thread pool shared by the `Parallel` VMs with `n_threads` threads."""
+    with _thread_pools_lock:
+        pool = _thread_pools.get(n_threads)
+        if pool is None:
+            pool = ThreadPoolExecutor(
+                n_threads, thread_name_prefix="aesara-vm", initializer=_init_worker
+            )
+            _thread_pools[n_threads] = pool
+        return pool
+
+
+class Parallel(UpdatingVM):
+    """Concurrent execution of the thunks whose inputs are ready.
+
+    The thunks are dispatched to a pool of threads as soon as the nodes they
+    depend on are done.  A node depends on the owners of its inputs and on
+    the nodes that `FunctionGraph.orderings` requires it to follow (e.g. the
+    `DestroyHandler` makes the nodes that destroy an input wait for all the
+    other clients of that input).
+
+    Threads only help with thunks that release the GIL, like the NumPy and
+    BLAS calls of most `Op.perform` implementations.  The C thunks hold the
+    GIL while they run, so they are never run concurrently; that's why the
+    ``vm_parallel`` linker doesn't use them.  Lazy thunks are not supported.
+
+    When called from one of the pool's threads (e.g. by the inner function of
+    an `Op`), the thunks are run sequentially in `nodes` order, like `Loop`
+    does.
+
+    """
+
+    def __init__(
+        self,
+        fgraph,
+        nodes,
+        thunks,
+        pre_call_clear,
+        storage_map,
+        input_storage,
+        output_storage,
+        update_vars,
+        n_threads: int,
+        post_thunk_clear: Optional[List["StorageCellType"]] = None,
+    ):
+        r"""
+        Parameters
+        ----------
+        n_threads
+            The number of threads used to run the thunks.
+        post_thunk_clear
+            The storage cells that can be cleared after each thunk, as given
+            to `Loop`.  A cell is cleared once all the nodes that use it are
+            done, instead of after the thunk it is listed for.
+        """
+        super().__init__(
+            fgraph,
+            nodes,
+            thunks,
+            pre_call_clear,
+            storage_map,
+            input_storage,
+            output_storage,
+            update_vars,
+        )
+        self.n_threads = n_threads
+
+        node_idx = {node: i for i, node in enumerate(nodes)}
+        orderings = fgraph.orderings()
+        self.dependents: List[List[int]] = [[] for _ in nodes]
+        self.n_prereqs: List[int] = []
+        for i, node in enumerate(nodes):
+            prereqs = {
+                node_idx[inp.owner] for inp in node.inputs if inp.owner in node_idx
+            }
+            prereqs.update(node_idx[prereq] for prereq in orderings.get(node, ()))
+            for prereq in prereqs:
+                self.dependents[prereq].append(i)
+            self.n_prereqs.append(len(prereqs))
+        self.roots = [i for i, n in enumerate(self.n_prereqs) if n == 0]
+
+        # The cells to clear once the last of their clients is done
+        self.allow_gc = post_thunk_clear is not None
+        self.gc_cells: List["StorageCellType"] = []
+        self.gc_n_clients: List[int] = []
+        self.gc_after: List[List[int]] = [[] for _ in nodes]
+        if post_thunk_clear is not None:
+            clearable = {id(cell) for cells in post_thunk_clear for cell in cells}
+            gc_idx: Dict[Variable, int] = {}
+            for i, node in enumerate(nodes):
+                for inp in set(node.inputs):
+                    if id(storage_map[inp]) not in clearable:
+                        continue
+                    if inp not in gc_idx:
+                        gc_idx[inp] = len(self.gc_cells)
+                        self.gc_cells.append(storage_map[inp])
+                        self.gc_n_clients.append(0)
+                    self.gc_n_clients[gc_idx[inp]] += 1
+                    self.gc_after[i].append(gc_idx[inp])
+
+    def run_thunk(self, i: int):
+        if self.time_thunks:
+            t0 = time.perf_counter()
+            self.thunks[i]()
+            self.call_times[i] += time.perf_counter() - t0
+            self.call_counts[i] += 1
+        else:
+            self.thunks[i]()
+
+    def __call__(self):
+        for cont in self.pre_call_clear:
+            cont[0] = None
+
+        n_prereqs = list(self.n_prereqs)
+        n_clients = list(self.gc_n_clients)
+        ready = list(self.roots)
+
+        def done(i):
+            for j in self.gc_after[i]:
+                n_clients[j] -= 1
+                if n_clients[j] == 0:
+                    self.gc_cells[j][0] = None
+            for j in self.dependents[i]:
+                n_prereqs[j] -= 1
+                if n_prereqs[j] == 0:
+                    ready.append(j)
+
+        if getattr(_worker_state, "in_pool", False) or self.n_threads < 2:
+            for i in range(len(self.nodes)):
+                try:
+                    self.run_thunk(i)
+                except Exception:
+                    raise_with_op(self.fgraph, self.nodes[i], self.thunks[i])
+                done(i)
+            return self.perform_updates()
+
+        pool = get_thread_pool(self.n_threads)
+        running: Dict[Future, int] = {}
+        while ready or running:
+            # Keep one of the ready thunks for this thread
+            i = ready.pop() if ready else None
+            for j in ready:
+                running[pool.submit(self.run_thunk, j)] = j
+            ready.clear()
+
+            if i is not None:
+                try:
+                    self.run_thunk(i)
+                except Exception:
+                    wait(running)
+                    raise_with_op(self.fgraph, self.nodes[i], self.thunks[i])
+                done(i)
+
+            if running:
+                finished, _ = wait(
+                    running, timeout=0 if ready else None, return_when=FIRST_COMPLETED
+                )
+                for future in finished:
+                    j = running.pop(future)
+                    try:
+                        future.result()
+                    except Exception:
+                        wait(running)
+                        raise_with_op(self.fgraph, self.nodes[j], self.thunks[j])
+                    done(j)
+
+        return self.perform_updates()
+
+
 class VMLinker(LocalLinker):
     """Class that satisfies the `Linker` interface by acting as a `VM` factory.
 
@@ -817,6 +1135,12 @@ class VMLinker(LocalLinker):
     allow_partial_eval
         If ``True``, enforces usage of `Stack` or `CVM`, to allow for partial
         evaluation of functions (calculating a subset of outputs).
+    parallel
+        If ``True``, use the `Parallel` VM, which runs the independent thunks
+        concurrently in a pool of ``vm__parallel_threads`` threads.  It isn't
+        used for graphs with lazy thunks, nor with callbacks, memory profiling
+        or partial evaluation.  The C thunks hold the GIL, so this should be
+        combined with ``c_thunks=False``.
 
     """
 
@@ -830,6 +1154,7 @@ class VMLinker(LocalLinker):
         schedule=None,
         c_thunks=None,
         allow_partial_eval=None,
+        parallel=False,
     ):
         # Note: if more parameters are added to __init__, make sure to forward
         # them in the "type(self)(...)" call in the "accept" method below.
@@ -844,7 +1169,11 @@ class VMLinker(LocalLinker):
             c_thunks = bool(config.cxx)
         self.c_thunks = c_thunks
         self.allow_partial_eval = allow_partial_eval
+        self.parallel = parallel
         self.updated_vars = {}
+        # Set by `prepare_inner_functions` when the C modules of the graph's
+        # nodes were already compiled along with those of other graphs
+        self.cmodules_compiled = False
         super().__init__(allow_gc=allow_gc, scheduler=schedule)
 
     def accept(self, fgraph, no_recycling=None, profile=None):
@@ -906,6 +1235,7 @@ class VMLinker(LocalLinker):
                 schedule=self.schedule,
                 c_thunks=self.c_thunks,
                 allow_partial_eval=self.allow_partial_eval,
+                parallel=self.parallel,
             ).accept(fgraph, no_recycling, profile)
         self.fgraph = fgraph
         self.no_recycling = no_recycling
@@ -1002,6 +1332,75 @@ class VMLinker(LocalLinker):
 
         return tuple(reallocated_info.keys())
 
+    def can_plan_storage(self, order: Sequence[Apply]) -> bool:
+        r"""Check if `plan_storage_allocations` can be used with `order`.
+
+        The plan doesn't account for lazy thunks, which can request their
+        inputs after they are called.  Whether a thunk is lazy is only known
+        once it's created, which is too late for the plan, so `Op`\s that
+        customize `Op.make_thunk` are assumed to be lazy.  The plan is also
+        disabled when the storage of each variable is inspected (i.e. with
+        callbacks and memory profiling).
+
+        """
+        if not config.vm__memory_planner:
+            return False
+        if (
+            self.callback is not None
+            or self.callback_input is not None
+            or ((config.profile or config.print_global_stats) and config.profile_memory)
+        ):
+            return False
+
+        lazy = self.lazy
+        if lazy is None:
+            lazy = config.vm__lazy
+        if lazy is None:
+            from aesara.graph.op import Op
+            from aesara.link.c.op import COp
+
+            lazy = any(
+                type(node.op).make_thunk not in (Op.make_thunk, COp.make_thunk)
+                for node in order
+            )
+        return not lazy
+
+    def plan_storage_allocations(
+        self, storage_map: "StorageMapType", order: Sequence[Apply]
+    ) -> Tuple[Variable, ...]:
+        r"""Share storage cells between variables according to a memory plan.
+
+        `storage_map` is updated in-place, and it must be updated before the
+        thunks are created, so that the thunks use the shared cells.  `Op`\s
+        that reuse the content of their output storage (e.g. most C
+        implementations) then write into the buffer of a dead variable instead
+        of allocating a new one.
+
+        Returns
+        -------
+        A tuple of the variables that share their storage cell.
+
+        """
+        plan = calculate_storage_plan(order, self.fgraph, self.no_recycling)
+        # Cells that were filled by the caller are left alone
+        plan = {
+            var: buffer
+            for var, buffer in plan.items()
+            if storage_map[var][0] is None and storage_map[buffer][0] is None
+        }
+
+        n_users: DefaultDict[Variable, int] = defaultdict(int)
+        for buffer in plan.values():
+            n_users[buffer] += 1
+
+        shared = []
+        for var, buffer in plan.items():
+            if n_users[buffer] > 1:
+                storage_map[var] = storage_map[buffer]
+                shared.append(var)
+
+        return tuple(shared)
+
     def make_vm(
         self,
         nodes,
@@ -1021,6 +1420,12 @@ class VMLinker(LocalLinker):
         except (MissingGXX, ImportError):
             CVM = None
 
+        lazy = self.lazy
+        if lazy is None:
+            lazy = config.vm__lazy
+        if lazy is None:
+            lazy = any(th.lazy for th in thunks)
+
         if (
             self.callback is not None
             or self.callback_input is not None
@@ -1033,6 +1438,10 @@ class VMLinker(LocalLinker):
                 warnings.warn("CVM does not support callback, using Stack VM.")
             if self.use_cloop and config.profile_memory:
                 warnings.warn("CVM does not support memory profiling, using Stack VM.")
+            if self.parallel and (
+                self.callback is not None or self.callback_input is not None
+            ):
+                warnings.warn("Parallel VM does not support callback, using Stack VM.")
             if not self.use_cloop and self.allow_partial_eval:
                 warnings.warn(
                     "Loop VM does not support partial evaluation, using Stack VM."
@@ -1054,6 +1463,19 @@ class VMLinker(LocalLinker):
                 callback=self.callback,
                 callback_input=self.callback_input,
             )
+        elif self.parallel and not lazy:
+            vm = Parallel(
+                self.fgraph,
+                nodes,
+                thunks,
+                pre_call_clear,
+                storage_map,
+                input_storage,
+                output_storage,
+                updated_vars,
+                config.vm__parallel_threads or os.cpu_count() or 1,
+                post_thunk_clear if self.allow_gc else None,
+            )
         elif self.use_cloop and CVM is not None:
             # create a map from nodes to ints and vars to ints
             nodes_idx = {}
@@ -1173,11 +1595,6 @@ class VMLinker(LocalLinker):
                     "Detected reference count inconsistency after CVM construction"
                 )
         else:
-            lazy = self.lazy
-            if lazy is None:
-                lazy = config.vm__lazy
-            if lazy is None:
-                lazy = any(th.lazy for th in thunks)
             if not lazy:
                 # there is no conditional in the graph
                 vm = Loop(
@@ -1226,6 +1643,11 @@ class VMLinker(LocalLinker):
         for k in storage_map:
             compute_map[k] = [k.owner is None]
 
+        if self.can_plan_storage(order):
+            planned_vars = self.plan_storage_allocations(storage_map, order)
+        else:
+            planned_vars = ()
+
         thunks = []
 
         t0 = time.perf_counter()
@@ -1233,6 +1655,8 @@ class VMLinker(LocalLinker):
         impl = None
         if self.c_thunks is False:
             impl = "py"
+        elif not self.cmodules_compiled:
+            compile_node_cmodules(order, storage_map, compute_map, [])
         for node in order:
             try:
                 thunk_start = time.perf_counter()
@@ -1266,10 +1690,13 @@ class VMLinker(LocalLinker):
             lazy = config.vm__lazy
         if lazy is None:
             lazy = any(th.lazy for th in thunks)
-        if not (
+        if planned_vars:
+            reallocated_vars = planned_vars
+        elif not (
             lazy
             or ((config.profile or config.print_global_stats) and config.profile_memory)
             or self.use_cloop
+            or self.parallel
             or self.callback
             or self.callback_input
         ):
@@ -1331,6 +1758,10 @@ class VMLinker(LocalLinker):
             self.allow_partial_eval = None
         if not hasattr(self, "callback_input"):
             self.callback_input = None
+        if not hasattr(self, "cmodules_compiled"):
+            self.cmodules_compiled = False
+        if not hasattr(self, "parallel"):
+            self.parallel = False
 
     def __repr__(self):
         args_str = ", ".join(
@@ -57,7 +57,8 @@ import aesara
 import aesara.link.utils as link_utils
 from aesara import tensor as at
 from aesara.compile.builders import construct_nominal_fgraph, infer_shape
-from aesara.compile.function.pfunc import pfunc
+from aesara.compile.function.pfunc import pfunc_maker
+from aesara.compile.function.types import create_function
 from aesara.compile.io import In, Out
 from aesara.compile.mode import Mode, get_default_mode, get_mode
 from aesara.compile.profiling import register_profiler_printer
@@ -1427,11 +1428,12 @@ class Scan(Op, ScanMethodsMixin, HasInnerGraph):
 
         return wrapped_inputs, wrapped_outputs
 
-    @property
-    def fn(self):
-        """Lazily compile the inner function graph."""
+    def prepare_fn(self):
         if getattr(self, "_fn", None) is not None:
-            return self._fn
+            return None
+
+        if getattr(self, "_fn_maker", None) is not None:
+            return self._fn_maker
 
         wrapped_inputs, wrapped_outputs = self.prepare_fgraph(self.fgraph)
 
@@ -1446,7 +1448,7 @@ class Scan(Op, ScanMethodsMixin, HasInnerGraph):
         elif self.profile:
             profile = self.profile
 
-        self._fn = pfunc(
+        self._fn_maker = pfunc_maker(
             wrapped_inputs,
             wrapped_outputs,
             mode=self.mode_instance,
@@ -1456,6 +1458,17 @@ class Scan(Op, ScanMethodsMixin, HasInnerGraph):
             fgraph=self.fgraph,
         )
 
+        return self._fn_maker
+
+    @property
+    def fn(self):
+        """Lazily compile the inner function graph."""
+        if getattr(self, "_fn", None) is not None:
+            return self._fn
+
+        self._fn = create_function(self.prepare_fn())
+        self._fn_maker = None
+
         return self._fn
 
     @property
@@ -1468,7 +1481,8 @@ class Scan(Op, ScanMethodsMixin, HasInnerGraph):
 
     def clone(self) -> "Scan":
         res = copy(self)
-        res.fgraph = res.fgraph.clone()
+        res.fgraph = res.fgraph.clone(copy_on_write=True)
+        res._fn_maker = None
         return res
 
     def make_thunk(self, node, storage_map, compute_map, no_recycling, impl=None):
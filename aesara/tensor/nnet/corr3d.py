@@ -216,7 +216,7 @@ class BaseCorr3dMM(OpenMPOp, _NoPythonOp):
         # REMEMBER TO RAISE c_code_cache_version when changing any of
         # these files
         sub = {}
-        dtype = str(node.__dict__["inputs"][0].dtype)
+        dtype = str(node.inputs[0].dtype)
         assert dtype in ("float32", "float64")
         if dtype == "float32":
             sub["gemm"] = "sgemm_"
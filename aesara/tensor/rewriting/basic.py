@@ -588,7 +588,23 @@ compile.optdb.register(
 @register_useless
 @register_canonicalize("fast_compile")
 @register_specialize
-@node_rewriter([Elemwise])
+@node_rewriter(
+    [
+        (
+            Elemwise,
+            (
+                aes.EQ,
+                aes.NEQ,
+                aes.Mul,
+                aes.Add,
+                aes.Identity,
+                aes.AND,
+                aes.OR,
+                aes.XOR,
+            ),
+        )
+    ]
+)
 def local_useless_elemwise(fgraph, node):
     """
         eq(x, x) -> 1
@@ -715,7 +731,7 @@ def local_alloc_unary(fgraph, node):
 
 @register_canonicalize
 @register_specialize
-@node_rewriter([Elemwise])
+@node_rewriter([(Elemwise, aes.Cast)])
 def local_cast_cast(fgraph, node):
     """cast(cast(x, dtype1), dtype2)
 
@@ -793,7 +809,7 @@ def is_an_upcast(type1, type2):
 
 @register_useless
 @register_specialize
-@node_rewriter(None)
+@node_rewriter([CheckAndRaise])
 def local_remove_useless_assert(fgraph, node):
     if not isinstance(node.op, CheckAndRaise):
         return False
@@ -978,7 +994,7 @@ def local_join_make_vector(fgraph, node):
 @register_useless("local_remove_switch_const_cond")
 @register_canonicalize("fast_compile", "local_remove_switch_const_cond")
 @register_specialize
-@node_rewriter([Elemwise])
+@node_rewriter([(Elemwise, aes.Switch)])
 def local_useless_switch(fgraph, node):
     """
     This rewrite makes the following changes in a graph:
@@ -1064,7 +1080,7 @@ def local_useless_switch(fgraph, node):
 
 
 @register_canonicalize
-@node_rewriter([Elemwise])
+@node_rewriter([(Elemwise, (aes.BinaryScalarOp, aes.Add, aes.Mul))])
 def local_merge_switch_same_cond(fgraph, node):
     """
     Merge add/sub/mul/div/minimum/maximum/... of switches sharing the same
@@ -1183,7 +1199,7 @@ register_specialize(topo_constant_folding, "fast_compile", final_rewriter=True)
 
 @register_canonicalize("fast_compile")
 @register_useless("fast_compile")
-@node_rewriter(None)
+@node_rewriter([ViewOp])
 def local_view_op(fgraph, node):
     if isinstance(node.op, ViewOp):
         return node.inputs
@@ -920,7 +920,7 @@ else:
 
 
 @register_canonicalize
-@node_rewriter([Elemwise])
+@node_rewriter([(Elemwise, aes.Composite)])
 def local_useless_composite(fgraph, node):
     """For elemwise Composite that have multiple outputs, remove the
     outputs that are not used.
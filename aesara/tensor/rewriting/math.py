@@ -235,24 +235,26 @@ def is_inverse_pair(node_op, prev_op, inv_pair):
     return (node_is_op0 and prev_is_op1) or (node_is_op1 and prev_is_op0)
 
 
+INVERSE_PAIRS = (
+    (aes.Deg2Rad, aes.Rad2Deg),
+    (aes.Cosh, aes.ArcCosh),
+    (aes.Tanh, aes.ArcTanh),
+    (aes.Sinh, aes.ArcSinh),
+    (aes.Conj, aes.Conj),
+    (aes.Neg, aes.Neg),
+    (aes.Reciprocal, aes.Reciprocal),
+)
+
+
 @register_canonicalize
 @register_specialize
-@node_rewriter([Elemwise])
+@node_rewriter([(Elemwise, tuple(itertools.chain.from_iterable(INVERSE_PAIRS)))])
 def local_func_inv(fgraph, node):
     """
     Check for two consecutive operations that are functional inverses
     and remove them from the function graph.
 
     """
-    inv_pairs = (
-        (aes.Deg2Rad, aes.Rad2Deg),
-        (aes.Cosh, aes.ArcCosh),
-        (aes.Tanh, aes.ArcTanh),
-        (aes.Sinh, aes.ArcSinh),
-        (aes.Conj, aes.Conj),
-        (aes.Neg, aes.Neg),
-        (aes.Reciprocal, aes.Reciprocal),
-    )
     x = node.inputs[0]
 
     if not isinstance(node.op, Elemwise):
@@ -263,7 +265,7 @@ def local_func_inv(fgraph, node):
     prev_op = x.owner.op.scalar_op
     node_op = node.op.scalar_op
 
-    for inv_pair in inv_pairs:
+    for inv_pair in INVERSE_PAIRS:
         if is_inverse_pair(node_op, prev_op, inv_pair):
             # We don't need to copy stack trace, because the rewrite
             # is trivial and maintains the earlier stack trace
@@ -279,7 +281,7 @@ def local_func_inv(fgraph, node):
 
 @register_canonicalize
 @register_specialize
-@node_rewriter([Elemwise])
+@node_rewriter([(Elemwise, (aes.Log, aes.Log1p, aes.Exp, aes.Expm1))])
 def local_exp_log(fgraph, node):
     x = node.inputs[0]
 
@@ -358,7 +360,7 @@ def log_diff_exp(fgraph, node):
 
 
 @register_specialize
-@node_rewriter([Elemwise])
+@node_rewriter([(Elemwise, (aes.Exp, aes.Expm1))])
 def local_exp_log_nan_switch(fgraph, node):
     # Rewrites of the kind exp(log...(x)) that require a `nan` switch
     x = node.inputs[0]
@@ -463,7 +465,7 @@ def local_sumsqr2dot(fgraph, node):
 @register_stabilize
 @register_specialize
 @register_canonicalize
-@node_rewriter([Elemwise])
+@node_rewriter([(Elemwise, aes.Sub)])
 def local_expm1(fgraph, node):
     """Detect ``exp(a) - 1`` and convert them to ``expm1(a)``."""
     if isinstance(node.op, Elemwise) and isinstance(node.op.scalar_op, aes.Sub):
@@ -1218,7 +1220,7 @@ def local_sum_prod_mul_by_scalar(fgraph, node):
 
 
 @register_specialize
-@node_rewriter([Elemwise])
+@node_rewriter([(Elemwise, aes.Sub)])
 def local_elemwise_sub_zeros(fgraph, node):
     """
     Elemwise{sub}(X,X) -> zeros_like(X)
@@ -1240,7 +1242,22 @@ def local_elemwise_sub_zeros(fgraph, node):
 @register_specialize
 @register_stabilize
 @register_canonicalize
-@node_rewriter([Elemwise])
+@node_rewriter(
+    [
+        (
+            Elemwise,
+            (
+                aes.LT,
+                aes.GT,
+                aes.LE,
+                aes.GE,
+                aes.EQ,
+                aes.ScalarMinimum,
+                aes.ScalarMaximum,
+            ),
+        )
+    ]
+)
 def local_useless_elemwise_comparison(fgraph, node):
     """...
 
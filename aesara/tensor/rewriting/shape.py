@@ -1,8 +1,10 @@
 import traceback
+from contextlib import contextmanager
 from typing import (
     TYPE_CHECKING,
     Callable,
     Dict,
+    Iterator,
     List,
     Optional,
     Sequence,
@@ -73,6 +75,73 @@ if TYPE_CHECKING:
     ]
 
 
+class LazyShapeDict(dict):
+    """The ``shape_of`` mapping of a lazy `ShapeFeature`.
+
+    The values of a shape are kept along with the `ShapeFeature.slot` at which
+    they were set.  The shapes of the outputs of the nodes in
+    `ShapeFeature.lazy_nodes`, and of the graph inputs and constants, are
+    built when they're first looked up, at the slot at which the eager
+    `ShapeFeature` would have built them.  The replacements that changed a
+    shape since it was last looked up are then replayed, at their own slots.
+    Only the built shapes are listed by ``keys``, ``values`` and ``items``.
+
+    """
+
+    def __init__(self, shape_feature: "ShapeFeature", fgraph: FunctionGraph):
+        super().__init__()
+        self.shape_feature = shape_feature
+        self.fgraph = fgraph
+        # The values of each shape, in order, with the slots they were set at
+        self.history: Dict[
+            Variable, List[Tuple[int, Optional[Tuple[Variable, ...]]]]
+        ] = {}
+        # The slot up to which the replacements were replayed on each shape
+        self.synced: Dict[Variable, int] = {}
+
+    def __getitem__(self, var: Variable) -> Optional[Tuple[Variable, ...]]:
+        return self.shape_feature.lazy_shape(self.fgraph, var)
+
+    def __setitem__(self, var: Variable, shape: Optional[Tuple[Variable, ...]]) -> None:
+        self.set_at(var, self.shape_feature.slot, shape)
+
+    def set_at(
+        self, var: Variable, slot: int, shape: Optional[Tuple[Variable, ...]]
+    ) -> None:
+        """Set the shape of `var` from `slot` on."""
+        history = self.history.setdefault(var, [])
+        if history and history[-1][0] == slot:
+            history[-1] = (slot, shape)
+        else:
+            history.append((slot, shape))
+        self.synced[var] = max(self.synced.get(var, slot), slot)
+        super().__setitem__(var, shape)
+
+    def __contains__(self, var) -> bool:
+        owner = getattr(var, "owner", False)
+        return (
+            super().__contains__(var)
+            or owner is None
+            or owner in self.shape_feature.lazy_nodes
+        )
+
+    def get(self, var, default=None):
+        if var in self:
+            return self[var]
+        return default
+
+    def values(self):
+        return [self[var] for var in self.keys()]
+
+    def items(self):
+        return [(var, self[var]) for var in self.keys()]
+
+    def clear(self) -> None:
+        super().clear()
+        self.history.clear()
+        self.synced.clear()
+
+
 class ShapeFeature(Feature):
     r"""A `Feature` that tracks shape information in a graph.
 
@@ -114,9 +183,31 @@ class ShapeFeature(Feature):
     To use the shape information gathered by a `FunctionGraph`-attached
     `ShapeFeature` in rewrites, use the :meth:`ShapeFeature.get_shape` method.
 
+    When `lazy` is ``True``, each import and replacement is given a slot (see
+    :attr:`ShapeFeature.slot`), and is only recorded.  The imported nodes are
+    kept in :attr:`ShapeFeature.lazy_nodes`, and the shapes of their outputs
+    (and of the outputs of the nodes they depend on) are built when they're
+    first looked up in :attr:`ShapeFeature.shape_of`.  The graph and the shapes
+    are then put back as they were at the slot of the node's import, and the
+    replacements that happened since are replayed at their own slots, so the
+    shapes are exactly the ones the eager mode would have.  Most shapes are
+    never needed, so this avoids building most of the shape graphs.
+
     """
     lscalar_one = constant(1, dtype="int64", ndim=0)
 
+    def __init__(self, lazy: Optional[bool] = None):
+        """
+        Parameters
+        ----------
+        lazy
+            Whether or not to build the shapes lazily.  Defaults to
+            ``config.tensor__lazy_shape_feature``.
+        """
+        if lazy is None:
+            lazy = config.tensor__lazy_shape_feature
+        self.lazy = lazy
+
     def get_node_infer_shape(
         self, fgraph: FunctionGraph, node: "Apply"
     ) -> "OutputShapesType":
@@ -342,7 +433,7 @@ class ShapeFeature(Feature):
 
         """
         if not override:
-            assert r not in self.shape_of, "r already in shape_of"
+            assert r not in self.shape_of.keys(), "r already in shape_of"
         if s is None:
             self.shape_of[r] = s
         else:
@@ -372,8 +463,9 @@ class ShapeFeature(Feature):
 
             self.shape_of[r] = tuple(shape_vars)
 
-            for sv in shape_vars:
-                self.shape_of_reverse_index.setdefault(sv, set()).add(r)
+            if not self.lazy:
+                for sv in shape_vars:
+                    self.shape_of_reverse_index.setdefault(sv, set()).add(r)
 
     def update_shape(self, r: Variable, other_r: Variable) -> None:
         """Replace shape of `r` by shape of `other_r`.
@@ -468,8 +560,9 @@ class ShapeFeature(Feature):
         )
 
         self.shape_of[r] = merged_shape
-        for sv in merged_shape:
-            self.shape_of_reverse_index.setdefault(sv, set()).add(r)
+        if not self.lazy:
+            for sv in merged_shape:
+                self.shape_of_reverse_index.setdefault(sv, set()).add(r)
 
     def set_shape_i(self, r: Variable, i: int, s_i: Variable) -> None:
         """Replace element i of shape_of[r] by s_i"""
@@ -496,8 +589,9 @@ class ShapeFeature(Feature):
 
         self.shape_of[r] = new_shape
 
-        for sv in new_shape:
-            self.shape_of_reverse_index.setdefault(sv, set()).add(r)
+        if not self.lazy:
+            for sv in new_shape:
+                self.shape_of_reverse_index.setdefault(sv, set()).add(r)
 
     def init_r(self, r: Variable) -> None:
         """Register r's shape in the shape_of dictionary."""
@@ -517,9 +611,34 @@ class ShapeFeature(Feature):
 
         assert self.lscalar_one.type.dtype == "int64"
 
-        self.shape_of: Dict[Variable, Optional[Tuple[Variable, ...]]] = {}
+        self.shape_of: Dict[Variable, Optional[Tuple[Variable, ...]]]
         self.scheduled: Dict["Apply", Variable] = {}
         self.shape_of_reverse_index: Dict[Variable, Set[Variable]] = {}
+        # The slot of the last import or replacement, in the lazy mode, or
+        # the slot at which the shapes are looked up while they're built
+        self.slot = 0
+        # The nodes whose output shapes haven't been built yet, with the slots
+        # they were imported at
+        self.lazy_nodes: Dict["Apply", int] = {}
+        # The replacements, with their slots: all the changed node inputs, in
+        # order, and the changes of each node
+        self.input_changes: List[Tuple[int, "Apply", int, Variable, Variable]] = []
+        self.applied_changes = 0
+        self.node_changes: Dict["Apply", List[Tuple[int, int, Variable]]] = {}
+        # The variables replaced by each variable, i.e. the pending
+        # `ShapeFeature.update_shape` calls, and the variables that replaced
+        # each variable in the shapes that contain it
+        self.merges: Dict[Variable, List[Tuple[int, Variable]]] = {}
+        self.substitutions: Dict[Variable, List[Tuple[int, Variable]]] = {}
+
+        if self.lazy:
+            self.shape_of = LazyShapeDict(self, fgraph)
+            # No shape changes while the nodes are imported, so they can all
+            # share the first slot
+            self.lazy_nodes = dict.fromkeys(fgraph.apply_nodes, 0)
+            return
+
+        self.shape_of = {}
 
         for node in fgraph.toposort():
             self.on_import(fgraph, node, reason="on_attach")
@@ -528,15 +647,165 @@ class ShapeFeature(Feature):
         self.shape_of.clear()
         self.scheduled.clear()
         self.shape_of_reverse_index.clear()
+        self.lazy_nodes.clear()
+        self.input_changes.clear()
+        self.node_changes.clear()
+        self.merges.clear()
+        self.substitutions.clear()
         del fgraph.shape_feature
 
+    def move_graph(self, slot: int) -> None:
+        """Put the inputs of the replaced nodes back as they were at `slot`."""
+        changes = self.input_changes
+        applied = self.applied_changes
+        while applied > 0 and changes[applied - 1][0] > slot:
+            applied -= 1
+            _, node, i, r, _ = changes[applied]
+            node.inputs[i] = r
+        while applied < len(changes) and changes[applied][0] <= slot:
+            _, node, i, _, new_r = changes[applied]
+            node.inputs[i] = new_r
+            applied += 1
+        self.applied_changes = applied
+
+    @contextmanager
+    def at_slot(self, slot: int) -> Iterator[None]:
+        """Look up the shapes, and the graph, as they were at `slot`."""
+        prev_slot = self.slot
+        self.slot = slot
+        self.move_graph(slot)
+        try:
+            yield
+        finally:
+            self.slot = prev_slot
+            self.move_graph(prev_slot)
+
+    def inputs_at(self, node: "Apply", slot: int) -> List[Variable]:
+        """Return the inputs `node` had at `slot`."""
+        inputs = list(node.inputs)
+        for change_slot, i, r in reversed(self.node_changes.get(node, ())):
+            if change_slot <= slot:
+                break
+            inputs[i] = r
+        return inputs
+
+    def lazy_shape(
+        self, fgraph: FunctionGraph, var: Variable
+    ) -> Optional[Tuple[Variable, ...]]:
+        """Return the shape `var` had at `ShapeFeature.slot`, in the lazy mode."""
+        shape_of = type_cast(LazyShapeDict, self.shape_of)
+        if var not in shape_of.history:
+            node = var.owner
+            if node is not None and node in self.lazy_nodes:
+                self.materialize(fgraph, node)
+            elif node is None:
+                # This doesn't depend on the graph, so it's set before any
+                # replacement, for them to be replayed
+                shape_of.set_at(var, -1, self.shape_tuple(var))
+            else:
+                raise KeyError(var)
+
+        if shape_of.synced[var] < self.slot:
+            self.replay_changes(var)
+
+        for slot, shape in reversed(shape_of.history[var]):
+            if slot <= self.slot:
+                return shape
+        raise KeyError(var)
+
+    def replay_changes(self, var: Variable) -> None:
+        """Apply the replacements that changed `var`'s shape until now.
+
+        They're applied in order, up to `ShapeFeature.slot`, each at its own
+        slot, as `ShapeFeature.on_change_input` applies them in the eager mode.
+        """
+        shape_of = type_cast(LazyShapeDict, self.shape_of)
+        end = self.slot
+        while True:
+            synced = shape_of.synced[var]
+            shape = shape_of.history[var][-1][1]
+
+            # The first replacement of `var`, or of an element of its shape
+            pending = [
+                (slot, True, r, var)
+                for slot, r in self.merges.get(var, ())
+                if synced < slot <= end
+            ]
+            for s_i in shape or ():
+                pending.extend(
+                    (slot, False, s_i, new_r)
+                    for slot, new_r in self.substitutions.get(s_i, ())
+                    if synced < slot <= end
+                )
+            if not pending:
+                shape_of.synced[var] = end
+                return
+
+            slot, is_merge, r, new_r = min(pending, key=lambda change: change[0])
+            shape_of.synced[var] = slot
+            with self.at_slot(slot):
+                if is_merge:
+                    self.update_shape(var, r)
+                else:
+                    assert shape is not None
+                    for ii, svi in enumerate(shape):
+                        if svi == r:
+                            self.set_shape_i(var, ii, new_r)
+
+    def materialize(self, fgraph: FunctionGraph, node: "Apply") -> None:
+        """Build the output shapes of `node`, at the slot it was imported at.
+
+        The pending nodes `node` depended on at that slot are built first.
+        """
+        order: List["Apply"] = []
+        visited: Set["Apply"] = set()
+        todo: List[Tuple["Apply", bool]] = [(node, False)]
+        while todo:
+            cur, expanded = todo.pop()
+            if expanded:
+                order.append(cur)
+                continue
+            if cur in visited:
+                continue
+            visited.add(cur)
+            todo.append((cur, True))
+            for i in self.inputs_at(cur, self.lazy_nodes[cur]):
+                if i.owner in self.lazy_nodes and i.owner not in visited:
+                    todo.append((i.owner, False))
+
+        # The nodes imported at the same slot are already sorted topologically
+        order.sort(key=self.lazy_nodes.__getitem__)
+        prev_slot = self.slot
+        try:
+            for cur in order:
+                if cur in self.lazy_nodes:
+                    self.slot = self.lazy_nodes.pop(cur)
+                    self.move_graph(self.slot)
+                    self.import_shapes(fgraph, cur)
+        finally:
+            self.slot = prev_slot
+            self.move_graph(prev_slot)
+
     def on_import(self, fgraph, node, reason):
+        if self.lazy:
+            if (
+                node not in self.lazy_nodes
+                and node.outputs[0] not in self.shape_of.keys()
+            ):
+                self.slot += 1
+                self.lazy_nodes[node] = self.slot
+            return
+
         if node.outputs[0] in self.shape_of:
             # this is a revert, not really an import
             for r in node.outputs + node.inputs:
                 assert r in self.shape_of
             return
 
+        self.import_shapes(fgraph, node)
+
+    def import_shapes(self, fgraph: FunctionGraph, node: "Apply") -> None:
+        """Infer and set the shapes of the outputs of `node`."""
         for i, r in enumerate(node.inputs):
             # make sure we have shapes for the inputs
             self.init_r(r)
@@ -563,17 +832,19 @@ class ShapeFeature(Feature):
                     f"infer_shape of {node} didn't return a list of"
                     f" list. It returned '{o_shapes}'"
                 )
-            new_shape = []
+            new_shape: List[Variable] = []
             for i, d in enumerate(sh):
                 # Note: we ignore any shape element that is not typed (i.e.,
                 # does not have a 'dtype' attribute). This means there may
                 # still remain int elements that are int32 on 32-bit platforms,
                 # but this works with `local_useless_subtensor`, so for now we
                 # keep it this way. See #266 for a better long-term fix.
-                if getattr(d, "dtype", "int64") != "int64":
-                    assert d.dtype in discrete_dtypes, (node, d.dtype)
-                    assert str(d.dtype) != "uint64", node
+                dtype = getattr(d, "dtype", "int64")
+                if dtype != "int64":
+                    assert dtype in discrete_dtypes, (node, dtype)
+                    assert str(dtype) != "uint64", node
                     new_shape += sh[len(new_shape) : i + 1]
+                    casted_d: Variable
                     if isinstance(d, Constant):
                         casted_d = constant(d.data, dtype="int64", ndim=0)
                     else:
@@ -589,16 +860,26 @@ class ShapeFeature(Feature):
             self.set_shape(r, s)
 
     def on_change_input(self, fgraph, node, i, r, new_r, reason):
-        if new_r not in self.shape_of:
-            # It happen that the fgraph didn't called on_import for some
-            # new_r.  This happen when new_r don't have an
-            # owner(i.e. it is a constant or an input of the graph)
-            # update_shape suppose that r and new_r are in shape_of.
-            self.init_r(new_r)
+        if self.lazy:
+            # The shape of `new_r` is only updated with `r`'s when it's looked
+            # up (see `ShapeFeature.replay_changes`)
+            self.slot += 1
+            if node != "output":
+                self.input_changes.append((self.slot, node, i, r, new_r))
+                self.applied_changes += 1
+                self.node_changes.setdefault(node, []).append((self.slot, i, r))
+            self.merges.setdefault(new_r, []).append((self.slot, r))
+        else:
+            if new_r not in self.shape_of:
+                # It happen that the fgraph didn't called on_import for some
+                # new_r.  This happen when new_r don't have an
+                # owner(i.e. it is a constant or an input of the graph)
+                # update_shape suppose that r and new_r are in shape_of.
+                self.init_r(new_r)
 
-        # This tells us that r and new_r must have the same shape if
-        # we didn't know that the shapes are related, now we do.
-        self.update_shape(new_r, r)
+            # This tells us that r and new_r must have the same shape if
+            # we didn't know that the shapes are related, now we do.
+            self.update_shape(new_r, r)
 
         # change_input happens in two cases:
         # 1) we are trying to get rid of r, or
@@ -641,6 +922,11 @@ class ShapeFeature(Feature):
         for k in unscheduled:
             del self.scheduled[k]
 
+        if self.lazy:
+            self.slot += 1
+            self.substitutions.setdefault(r, []).append((self.slot, new_r))
+            return
+
         # In either case, r could be in shape_of.values(), that is, r itself
         # is the shape of  something. In that case, we want to update
         # the value in shape_of, to keep it up-to-date.
@@ -723,7 +1009,7 @@ class ShapeFeature(Feature):
         return True
 
     def clone(self):
-        return type(self)()
+        return type(self)(lazy=self.lazy)
 
 
 class ShapeOptimizer(GraphRewriter):
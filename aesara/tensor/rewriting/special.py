@@ -14,7 +14,7 @@ from aesara.tensor.type import values_eq_approx_remove_inf, values_eq_approx_rem
 # This is not registered in stabilize, as it cause some crossentropy
 # optimization to not be inserted.
 @register_specialize("stabilize", "fast_compile")
-@node_rewriter([Elemwise])
+@node_rewriter([(Elemwise, aes.Log)])
 def local_logsoftmax(fgraph, node):
     """
     Detect Log(Softmax(x)) and replace it with LogSoftmax(x)
@@ -0,0 +1,8 @@
+"""Benchmark suites for Aesara.
+
+These suites are meant to be run from a source checkout, e.g. with ``python -m
+benchmarks.compile_time`` or ``python -m benchmarks.runtime``.  They write
+their results as JSON files that can be compared between commits with
+``python -m benchmarks.compare``.
+
+"""
@@ -0,0 +1,45 @@
+"""Compare two benchmark result files.
+
+.. code-block:: bash
+
+    python -m benchmarks.compare baseline.json current.json --threshold 0.1
+
+The exit status is 1 when a metric of ``current.json`` regressed by more than
+the threshold.
+
+"""
+import argparse
+import sys
+
+from benchmarks.utils import load_results, report_comparison
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", help="The reference result file.")
+    parser.add_argument("current", help="The result file to check.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="The relative change reported as a regression (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=1e-3,
+        help="Times below this many seconds are not flagged (default: %(default)s).",
+    )
+    args = parser.parse_args(argv)
+
+    regressed = report_comparison(
+        load_results(args.baseline),
+        load_results(args.current),
+        threshold=args.threshold,
+        min_time=args.min_time,
+    )
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
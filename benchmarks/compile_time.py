@@ -0,0 +1,369 @@
+"""Compile-time benchmarks.
+
+Each benchmark builds a graph from one of the families below and compiles it
+with `aesara.function` a few times.  The compilation of each function is
+split into:
+
+- ``fgraph``: the construction of the `FunctionGraph`,
+- ``rewrite``: the rewriting of the graph, and ``phase:<name>`` for each phase
+  of the rewriter (i.e. each entry of `optdb` used by the mode),
+- ``link``: the linking of the graph, without the C compilation,
+- ``c_compile``: the time spent in the C compiler.  The modules compiled in
+  parallel (see ``config.cmodule__compile_workers``) all add their time,
+
+along with the ``total`` compilation time and the number of ``nodes`` of the
+rewritten graph.  With ``--trace-memory``, the ``peak_memory`` allocated by
+Python during the compilation is measured too, with `tracemalloc`; this slows
+down the compilation, so the times shouldn't be compared with those of runs
+without it.
+
+.. code-block:: bash
+
+    python -m benchmarks.compile_time --output before.json
+    # ... change something ...
+    python -m benchmarks.compile_time --output after.json --baseline before.json
+
+The C modules are only compiled the first time they are needed, so the
+``c_compile`` time of the first repetition is the only one that can be
+non-zero.  Use ``AESARA_FLAGS=base_compiledir=<an empty directory>`` to time
+the compilation from an empty module cache.
+
+The phases are timed with a `RewriteProfiler`, which adds a small overhead to
+the rewriting time.
+
+To compare two values of a configuration flag, run the benchmarks once per
+value, e.g.:
+
+.. code-block:: bash
+
+    AESARA_FLAGS=tensor__lazy_shape_feature=False \
+        python -m benchmarks.compile_time --trace-memory --output eager.json
+    AESARA_FLAGS=tensor__lazy_shape_feature=True \
+        python -m benchmarks.compile_time --trace-memory --baseline eager.json
+
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+import warnings
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+import aesara.sparse as sparse
+import aesara.tensor as at
+from aesara.compile.function import function
+from aesara.compile.profiling import ProfileStats
+from aesara.configdefaults import config
+from aesara.gradient import grad
+from aesara.graph.basic import Variable
+from aesara.scan.basic import scan
+from benchmarks.utils import (
+    load_results,
+    make_results,
+    report_comparison,
+    summarize,
+    write_results,
+)
+
+
+GraphBuilder = Callable[..., Tuple[List[Variable], List[Variable]]]
+
+FAMILIES: Dict[str, Tuple[GraphBuilder, Dict[str, Any]]] = {}
+"""The graph families, with the default values of their parameters."""
+
+
+def register_family(**defaults):
+    """Register a function returning the inputs and outputs of a graph."""
+
+    def decorator(builder: GraphBuilder) -> GraphBuilder:
+        FAMILIES[builder.__name__] = (builder, defaults)
+        return builder
+
+    return decorator
+
+
+@register_family(depth=20, width=64)
+def deep_mlp(depth: int, width: int):
+    """A multilayer perceptron, its cost and its gradients."""
+    X = at.matrix("X")
+    y = at.matrix("y")
+    params = []
+    h = X
+    for i in range(depth):
+        W = at.matrix(f"W_{i}")
+        b = at.vector(f"b_{i}")
+        params += [W, b]
+        h = at.tanh(at.dot(h, W) + b)
+    cost = at.mean((h - y) ** 2)
+    return [X, y] + params, [cost] + grad(cost, params)
+
+
+@register_family(width=256)
+def wide_elemwise(width: int):
+    """A DAG of elementwise operations that halves in width at each level."""
+    xs = [at.vector(f"x_{i}") for i in range(width)]
+    level: List[Variable] = list(xs)
+    depth = 0
+    while len(level) > 1:
+        next_level = []
+        for i in range(0, len(level) - 1, 2):
+            a, b = level[i], level[i + 1]
+            kind = (i + depth) % 4
+            if kind == 0:
+                next_level.append(at.exp(-(a**2)) * b + 1)
+            elif kind == 1:
+                next_level.append(at.maximum(a, b) - at.sin(a * b))
+            elif kind == 2:
+                next_level.append(at.switch(at.gt(a, 0), a, b) / (at.abs(b) + 1))
+            else:
+                next_level.append(at.log1p(a**2) + at.sqrt(b**2 + 1))
+        if len(level) % 2:
+            next_level.append(level[-1])
+        level = next_level
+        depth += 1
+    return xs, level
+
+
+@register_family(n_scans=2)
+def nested_scans(n_scans: int):
+    """Recurrences over the rows of matrices, each with an inner scan, and their gradients."""
+    X = at.matrix("X")
+    w = at.vector("w")
+    outputs = []
+    for k in range(n_scans):
+
+        def inner_step(x_t, acc, w_t):
+            return at.tanh(acc * w_t + x_t)
+
+        def outer_step(x_row, h_prev, w):
+            hs, _ = scan(
+                inner_step,
+                sequences=[x_row, w],
+                outputs_info=[h_prev[0]],
+            )
+            return hs * (k + 1) + h_prev
+
+        hs, _ = scan(
+            outer_step,
+            sequences=[X],
+            outputs_info=[at.zeros_like(w)],
+            non_sequences=[w],
+        )
+        outputs.append(hs[-1].sum())
+    cost = at.add(*outputs)
+    return [X, w], [cost, grad(cost, w)]
+
+
+@register_family(n_layers=10, width=64)
+def sparse_model(n_layers: int, width: int):
+    """A model whose inputs are a sparse matrix, its cost and its gradients."""
+    X = sparse.csr_matrix("X")
+    y = at.matrix("y")
+    params = []
+    h = None
+    for i in range(n_layers):
+        W = at.matrix(f"W_{i}")
+        params.append(W)
+        # Every layer also sees the sparse input
+        z = sparse.structured_dot(X, W)
+        if h is not None:
+            V = at.matrix(f"V_{i}")
+            params.append(V)
+            z = z + at.dot(h, V)
+        h = at.tanh(z)
+    cost = at.mean((h - y) ** 2) + sparse.sp_sum(sparse.mul(X, X))
+    return [X, y] + params, [cost] + grad(cost, params)
+
+
+@register_family(size=100000, n_ops=100)
+def constant_folding(size: int, n_ops: int):
+    """Long chains of operations on large constants, which are all folded."""
+    x = at.vector("x")
+    c = at.constant(np.linspace(0, 1, size).astype(config.floatX))
+    d = at.constant(np.linspace(1, 2, size).astype(config.floatX))
+    for i in range(n_ops):
+        if i % 3 == 0:
+            c = at.sin(c) * 0.5 + d
+        elif i % 3 == 1:
+            d = at.sqrt(at.abs(c - d) + 1) * c[::-1]
+        else:
+            c = at.cumsum(c * 1e-3) + d.sum() * 1e-6
+    return [x], [x + c[: x.shape[0]] * d[: x.shape[0]]]
+
+
+def compile_times(
+    inputs: List[Variable],
+    outputs: List[Variable],
+    mode=None,
+    trace_memory: bool = False,
+) -> Dict[str, float]:
+    """Compile a function and return the times of each step of its compilation.
+
+    When `trace_memory` is ``True``, the peak memory allocated during the
+    compilation, in MB, is returned as ``peak_memory``.
+    """
+    profile = ProfileStats(atexit_print=False)
+    with config.change_flags(profile_optimizer=True), warnings.catch_warnings():
+        # The inner functions of `Scan`s are compiled without a profile
+        warnings.filterwarnings(
+            "ignore", message="config.profile_optimizer requires config.profile"
+        )
+        if trace_memory:
+            tracemalloc.start()
+        t0 = time.perf_counter()
+        function(inputs, outputs, mode=mode, profile=profile, on_unused_input="ignore")
+        total = time.perf_counter() - t0
+        if trace_memory:
+            peak_memory = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+
+    times = {
+        "total": total,
+        "fgraph": profile.fgraph_time,
+        "rewrite": profile.rewriting_time,
+        "link": max(profile.linker_time - profile.c_compile_time, 0.0),
+        "c_compile": profile.c_compile_time,
+        "nodes": profile.nb_nodes,
+    }
+    if profile.rewrite_profiler is not None:
+        for stack, stats in profile.rewrite_profiler.stats.items():
+            if len(stack) == 2:
+                times[f"phase:{stack[1]}"] = stats.time
+    if trace_memory:
+        times["peak_memory"] = peak_memory
+    return times
+
+
+def run_benchmarks(
+    families: Optional[Iterable[str]] = None,
+    repeat: int = 3,
+    mode=None,
+    params: Optional[Dict[str, Dict[str, Any]]] = None,
+    verbose: bool = False,
+    trace_memory: bool = False,
+) -> Dict[str, Any]:
+    """Run the compile-time benchmarks and return their results.
+
+    Parameters
+    ----------
+    families
+        The names of the graph families to benchmark.  Defaults to all of them.
+    repeat
+        The number of times each graph is built and compiled.
+    mode
+        The compilation mode.  Defaults to ``config.mode``.
+    params
+        Parameters of the families that override their defaults, by family.
+    verbose
+        Print the total compilation time of each benchmark.
+    trace_memory
+        Measure the peak memory allocated during each compilation.
+
+    """
+    if families is None:
+        families = list(FAMILIES)
+    if params is None:
+        params = {}
+
+    benchmarks = {}
+    for name in families:
+        builder, defaults = FAMILIES[name]
+        family_params = dict(defaults, **params.get(name, {}))
+
+        runs: Dict[str, List[float]] = {}
+        for _ in range(repeat):
+            inputs, outputs = builder(**family_params)
+            times = compile_times(inputs, outputs, mode=mode, trace_memory=trace_memory)
+            for metric, value in times.items():
+                runs.setdefault(metric, []).append(value)
+
+        metrics = {}
+        for metric, values in runs.items():
+            # Phases that aren't run every time are missing from some runs
+            values += [0.0] * (repeat - len(values))
+            unit = {"nodes": "nodes", "peak_memory": "MB"}.get(metric, "s")
+            metrics[metric] = summarize(values, unit=unit)
+        benchmarks[name] = {"params": family_params, "metrics": metrics}
+
+        if verbose:
+            print(
+                f"{name:<24} total {metrics['total']['median']:8.3f}s  "
+                f"rewrite {metrics['rewrite']['median']:8.3f}s  "
+                f"link {metrics['link']['median']:8.3f}s  "
+                f"c_compile (first run) {metrics['c_compile']['values'][0]:8.3f}s",
+                file=sys.stderr,
+            )
+
+    return make_results("compile_time", benchmarks)
+
+
+def parse_params(specs: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Parse ``family.param=value`` specifications."""
+    params: Dict[str, Dict[str, Any]] = {}
+    for spec in specs:
+        key, _, value = spec.partition("=")
+        family, _, param = key.partition(".")
+        if family not in FAMILIES or param not in FAMILIES[family][1]:
+            raise ValueError(f"Unknown benchmark parameter: {key}")
+        params.setdefault(family, {})[param] = int(value)
+    return params
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile-time benchmarks.")
+    parser.add_argument(
+        "--family",
+        action="append",
+        choices=list(FAMILIES),
+        help="A graph family to benchmark (default: all of them).",
+    )
+    parser.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        metavar="FAMILY.PARAM=VALUE",
+        help="Override a parameter of a family, e.g. deep_mlp.depth=50.",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--mode", help="The compilation mode (default: config.mode).")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument(
+        "--baseline", help="Compare the results with this JSON result file."
+    )
+    parser.add_argument("--threshold", type=float, default=0.1)
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Measure the peak memory allocated during each compilation.",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        families=args.family,
+        repeat=args.repeat,
+        mode=args.mode,
+        params=parse_params(args.param),
+        verbose=True,
+        trace_memory=args.trace_memory,
+    )
+
+    if args.output:
+        write_results(results, args.output)
+    else:
+        write_results(results, sys.stdout)
+
+    if args.baseline:
+        regressed = report_comparison(
+            load_results(args.baseline),
+            results,
+            threshold=args.threshold,
+            file=sys.stderr,
+        )
+        return 1 if regressed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,426 @@
+"""Runtime benchmarks of the linker backends.
+
+Each benchmark compiles a graph from one of the workloads below with the mode
+of each backend, i.e. ``c``, ``cvm``, ``vm`` and ``py`` (the ``FAST_RUN``
+rewrites with these linkers) and ``numba`` and ``jax`` (the ``NUMBA`` and
+``JAX`` modes), and calls the compiled function repeatedly.  It reports:
+
+- ``calls_per_s``: the number of calls per second (higher is better),
+- ``latency_p50``, ``latency_p90`` and ``latency_p99``: percentiles of the
+  duration of a call,
+- ``peak_rss``: the peak resident memory of the process that ran the
+  benchmark, in MB.  Each benchmark is run in a new process, so this only
+  includes the memory used by the interpreter, Aesara and that benchmark.
+
+.. code-block:: bash
+
+    python -m benchmarks.runtime --output before.json
+    # ... change something ...
+    python -m benchmarks.runtime --output after.json --baseline before.json
+
+The backends whose dependencies aren't installed are skipped, as are the
+workloads that a backend can't compile (e.g. `Scan` with the ``c`` linker).
+They are listed in the ``skipped`` entry of the results.
+
+"""
+import argparse
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse
+
+import aesara.sparse as sparse
+import aesara.tensor as at
+from aesara.compile.function import function
+from aesara.compile.mode import Mode, get_mode
+from aesara.configdefaults import config
+from aesara.graph.basic import Variable
+from aesara.scan.basic import scan
+from aesara.tensor.random.utils import RandomStream
+from benchmarks.utils import (
+    load_results,
+    make_results,
+    report_comparison,
+    summarize,
+    write_results,
+)
+
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+
+BACKENDS = ["c", "cvm", "vm", "py", "numba", "jax"]
+
+WorkloadBuilder = Callable[
+    ...,
+    Tuple[List[Variable], List[Variable], List[Any], List[Tuple[Variable, Variable]]],
+]
+
+WORKLOADS: Dict[str, Tuple[WorkloadBuilder, Dict[str, Any]]] = {}
+"""The workloads, with the default values of their parameters."""
+
+
+def register_workload(**defaults):
+    """Register a function returning the inputs, outputs, input values and updates of a graph."""
+
+    def decorator(builder: WorkloadBuilder) -> WorkloadBuilder:
+        WORKLOADS[builder.__name__] = (builder, defaults)
+        return builder
+
+    return decorator
+
+
+def _random(rng: np.random.Generator, *shape: int) -> np.ndarray:
+    return rng.standard_normal(shape).astype(config.floatX)
+
+
+@register_workload(size=10000, length=20)
+def elemwise_chain(rng: np.random.Generator, size: int, length: int):
+    """A chain of elementwise operations on two vectors."""
+    x = at.vector("x")
+    y = at.vector("y")
+    z = x
+    for i in range(length):
+        if i % 2 == 0:
+            z = at.tanh(z * y + 1)
+        else:
+            z = at.exp(-(z**2)) - y
+    return [x, y], [z], [_random(rng, size), _random(rng, size)], []
+
+
+@register_workload(rows=1000, cols=1000)
+def reductions(rng: np.random.Generator, rows: int, cols: int):
+    """Sums, maxima, means and argmaxes of a matrix."""
+    X = at.matrix("X")
+    outputs = [
+        X.sum(axis=0),
+        X.max(axis=1),
+        X.mean(axis=1),
+        X.sum(),
+        (X**2).sum(axis=1).argmax(),
+    ]
+    return [X], outputs, [_random(rng, rows, cols)], []
+
+
+@register_workload(n=256)
+def blas(rng: np.random.Generator, n: int):
+    """Matrix-matrix and matrix-vector products."""
+    A = at.matrix("A")
+    B = at.matrix("B")
+    v = at.vector("v")
+    outputs = [at.dot(A, B) + A, at.dot(A, v) * 2 + v]
+    values = [_random(rng, n, n), _random(rng, n, n), _random(rng, n)]
+    return [A, B, v], outputs, values, []
+
+
+@register_workload(n_steps=100, size=100)
+def scan_loop(rng: np.random.Generator, n_steps: int, size: int):
+    """A recurrence over the rows of a matrix."""
+    X = at.matrix("X")
+    W = at.matrix("W")
+
+    def step(x_t, h_prev, W):
+        return at.tanh(at.dot(h_prev, W) + x_t)
+
+    hs, _ = scan(
+        step, sequences=[X], outputs_info=[at.zeros_like(X[0])], non_sequences=[W]
+    )
+    values = [_random(rng, n_steps, size), _random(rng, size, size) / size]
+    return [X, W], [hs[-1]], values, []
+
+
+@register_workload(size=10000)
+def random_sampling(rng: np.random.Generator, size: int):
+    """Draws from normal and uniform distributions, updating the RNG."""
+    srng = RandomStream(int(rng.integers(2**31)))
+    mu = at.vector("mu")
+    z = srng.normal(mu, 1) + srng.uniform(0, 1, size=mu.shape)
+    return [mu], [z], [_random(rng, size)], srng.state_updates
+
+
+@register_workload(n=1000, density=0.01, cols=100)
+def sparse_dot(rng: np.random.Generator, n: int, density: float, cols: int):
+    """The product of a sparse matrix and a dense matrix."""
+    X = sparse.csr_matrix("X")
+    W = at.matrix("W")
+    X_value = scipy.sparse.random(
+        n, n, density=density, format="csr", dtype=config.floatX, random_state=0
+    )
+    return [X, W], [sparse.structured_dot(X, W)], [X_value, _random(rng, n, cols)], []
+
+
+def backend_mode(backend: str) -> Mode:
+    """Return the mode used to benchmark `backend`."""
+    if backend in ("numba", "jax"):
+        return get_mode(backend.upper())
+    return Mode(linker=backend, optimizer=get_mode("FAST_RUN").provided_optimizer)
+
+
+def backend_unavailable(backend: str) -> Optional[str]:
+    """Return why `backend` can't be used here, if it can't."""
+    if backend in ("numba", "jax"):
+        try:
+            __import__(backend)
+        except ImportError:
+            return f"{backend} is not installed"
+    elif backend in ("c", "cvm") and not config.cxx:
+        return "no C++ compiler (config.cxx is empty)"
+    return None
+
+
+def peak_rss() -> Optional[float]:
+    """Return the peak resident memory of the process, in MB."""
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # `ru_maxrss` is in bytes on macOS and in kilobytes elsewhere
+    if sys.platform == "darwin":
+        return maxrss / 2**20
+    return maxrss / 2**10
+
+
+def time_calls(fn: Callable, values: List[Any], min_time: float) -> np.ndarray:
+    """Call ``fn(*values)`` for at least `min_time` seconds and return the duration of each call."""
+    latencies = []
+    start = time.perf_counter()
+    while True:
+        t0 = time.perf_counter()
+        fn(*values)
+        t1 = time.perf_counter()
+        latencies.append(t1 - t0)
+        if t1 - start >= min_time:
+            break
+    return np.array(latencies)
+
+
+def run_workload(
+    builder: WorkloadBuilder,
+    params: Dict[str, Any],
+    backend: str,
+    repeat: int = 3,
+    min_time: float = 0.2,
+    warmup: int = 3,
+    seed: int = 0,
+) -> Dict[str, Dict[str, Any]]:
+    """Compile a workload with `backend` and return the summaries of its metrics."""
+    rng = np.random.default_rng(seed)
+    inputs, outputs, values, updates = builder(rng, **params)
+    fn = function(
+        inputs,
+        outputs,
+        mode=backend_mode(backend),
+        updates=updates,
+        on_unused_input="ignore",
+    )
+
+    for _ in range(warmup):
+        fn(*values)
+
+    runs: Dict[str, List[float]] = {}
+    for _ in range(repeat):
+        latencies = time_calls(fn, values, min_time)
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+        runs.setdefault("calls_per_s", []).append(len(latencies) / latencies.sum())
+        runs.setdefault("latency_p50", []).append(p50)
+        runs.setdefault("latency_p90", []).append(p90)
+        runs.setdefault("latency_p99", []).append(p99)
+
+    metrics = {
+        metric: summarize(measures, unit="calls/s" if metric == "calls_per_s" else "s")
+        for metric, measures in runs.items()
+    }
+    metrics["calls_per_s"]["higher_is_better"] = True
+    return metrics
+
+
+def _run_isolated(name: str, params: Dict[str, Any], backend: str, **kwargs):
+    """Run a workload in a new process and add its peak resident memory to its metrics."""
+    builder, _ = WORKLOADS[name]
+    metrics = run_workload(builder, params, backend, **kwargs)
+    rss = peak_rss()
+    if rss is not None:
+        metrics["peak_rss"] = summarize([rss], unit="MB")
+    return metrics
+
+
+def run_benchmarks(
+    workloads: Optional[Iterable[str]] = None,
+    backends: Optional[Iterable[str]] = None,
+    repeat: int = 3,
+    min_time: float = 0.2,
+    params: Optional[Dict[str, Dict[str, Any]]] = None,
+    verbose: bool = False,
+    isolate: bool = True,
+) -> Dict[str, Any]:
+    """Run the runtime benchmarks and return their results.
+
+    Parameters
+    ----------
+    workloads
+        The names of the workloads to benchmark.  Defaults to all of them.
+    backends
+        The backends to benchmark.  Defaults to all of them.
+    repeat
+        The number of times each compiled function is timed.
+    min_time
+        The minimum duration, in seconds, of each timing.
+    params
+        Parameters of the workloads that override their defaults, by workload.
+    verbose
+        Print the number of calls per second of each benchmark.
+    isolate
+        Run each benchmark in a new process, so that its ``peak_rss`` can be
+        measured.  Otherwise, the benchmarks are run in this process and
+        ``peak_rss`` isn't reported.
+
+    """
+    if workloads is None:
+        workloads = list(WORKLOADS)
+    if backends is None:
+        backends = BACKENDS
+    if params is None:
+        params = {}
+
+    benchmarks = {}
+    skipped = {}
+    for name in workloads:
+        builder, defaults = WORKLOADS[name]
+        workload_params = dict(defaults, **params.get(name, {}))
+        for backend in backends:
+            key = f"{name}[{backend}]"
+            reason = backend_unavailable(backend)
+            if reason is None:
+                try:
+                    if isolate:
+                        # A new interpreter, since a forked process would
+                        # start with the peak memory of this one
+                        with ProcessPoolExecutor(
+                            1, mp_context=multiprocessing.get_context("spawn")
+                        ) as executor:
+                            metrics = executor.submit(
+                                _run_isolated,
+                                name,
+                                workload_params,
+                                backend,
+                                repeat=repeat,
+                                min_time=min_time,
+                            ).result()
+                    else:
+                        metrics = run_workload(
+                            builder,
+                            workload_params,
+                            backend,
+                            repeat=repeat,
+                            min_time=min_time,
+                        )
+                except NotImplementedError as e:
+                    reason = str(e).splitlines()[0] if str(e) else type(e).__name__
+            if reason is not None:
+                skipped[key] = reason
+                if verbose:
+                    print(f"{key:<32} skipped: {reason}", file=sys.stderr)
+                continue
+
+            benchmarks[key] = {
+                "workload": name,
+                "backend": backend,
+                "params": workload_params,
+                "metrics": metrics,
+            }
+            if verbose:
+                rss = metrics.get("peak_rss")
+                print(
+                    f"{key:<32} {metrics['calls_per_s']['median']:12.1f} calls/s  "
+                    f"p50 {metrics['latency_p50']['median'] * 1e3:9.3f}ms  "
+                    f"p99 {metrics['latency_p99']['median'] * 1e3:9.3f}ms"
+                    + (f"  peak RSS {rss['median']:.1f}MB" if rss else ""),
+                    file=sys.stderr,
+                )
+
+    results = make_results("runtime", benchmarks)
+    results["skipped"] = skipped
+    return results
+
+
+def parse_params(specs: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Parse ``workload.param=value`` specifications."""
+    params: Dict[str, Dict[str, Any]] = {}
+    for spec in specs:
+        key, _, value = spec.partition("=")
+        workload, _, param = key.partition(".")
+        if workload not in WORKLOADS or param not in WORKLOADS[workload][1]:
+            raise ValueError(f"Unknown benchmark parameter: {key}")
+        default = WORKLOADS[workload][1][param]
+        params.setdefault(workload, {})[param] = type(default)(value)
+    return params
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Runtime benchmarks.")
+    parser.add_argument(
+        "--workload",
+        action="append",
+        choices=list(WORKLOADS),
+        help="A workload to benchmark (default: all of them).",
+    )
+    parser.add_argument(
+        "--backend",
+        action="append",
+        choices=BACKENDS,
+        help="A backend to benchmark (default: all of them).",
+    )
+    parser.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        metavar="WORKLOAD.PARAM=VALUE",
+        help="Override a parameter of a workload, e.g. blas.n=1024.",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="The minimum duration of each timing in seconds (default: %(default)s).",
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument(
+        "--baseline", help="Compare the results with this JSON result file."
+    )
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        workloads=args.workload,
+        backends=args.backend,
+        repeat=args.repeat,
+        min_time=args.min_time,
+        params=parse_params(args.param),
+        verbose=True,
+    )
+
+    if args.output:
+        write_results(results, args.output)
+    else:
+        write_results(results, sys.stdout)
+
+    if args.baseline:
+        regressed = report_comparison(
+            load_results(args.baseline),
+            results,
+            threshold=args.threshold,
+            file=sys.stderr,
+        )
+        return 1 if regressed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
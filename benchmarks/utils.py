@@ -0,0 +1,244 @@
+"""Result files of the benchmark suites and their comparison.
+
+A result file is a JSON object of the form
+
+.. code-block:: python
+
+    {
+        "suite": "compile_time",
+        "environment": {"aesara": "2.8.12", "commit": "0a1b2c3", ...},
+        "benchmarks": {
+            "deep_mlp": {
+                "params": {"depth": 20, "width": 64},
+                "metrics": {
+                    "total": {
+                        "unit": "s",
+                        "higher_is_better": False,
+                        "median": 1.2,
+                        "min": 1.1,
+                        "max": 1.4,
+                        "values": [1.2, 1.1, 1.4],
+                    },
+                    ...
+                },
+            },
+            ...
+        },
+    }
+
+Two result files are compared metric by metric with `compare_results`, using
+the medians.
+
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import IO, Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+import aesara
+from aesara.configdefaults import config
+
+
+def summarize(
+    values: Sequence[float], unit: str = "s", higher_is_better: bool = False
+) -> Dict[str, Any]:
+    """Return the JSON summary of the measurements of a metric."""
+    values = [float(v) for v in values]
+    return {
+        "unit": unit,
+        "higher_is_better": higher_is_better,
+        "median": statistics.median(values),
+        "min": min(values),
+        "max": max(values),
+        "values": values,
+    }
+
+
+def git_commit() -> Optional[str]:
+    """Return the commit of the Aesara checkout, if it is a git repository."""
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(aesara.__file__))),
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if out.returncode != 0:
+        return None
+    return out.stdout.strip()
+
+
+def environment_info() -> Dict[str, Any]:
+    """Return what is needed to tell whether two result files are comparable."""
+    return {
+        "aesara": aesara.__version__,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "cxx": config.cxx,
+        "floatX": config.floatX,
+        "mode": str(config.mode),
+        "linker": config.linker,
+    }
+
+
+def make_results(suite: str, benchmarks: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    return {"suite": suite, "environment": environment_info(), "benchmarks": benchmarks}
+
+
+def write_results(results: Dict[str, Any], file: Union[str, IO]):
+    """Write `results` as JSON to a path or a text file object."""
+    if isinstance(file, str):
+        with open(file, "w") as f:
+            json.dump(results, f, indent=1)
+    else:
+        json.dump(results, file, indent=1)
+
+
+def load_results(file: Union[str, IO]) -> Dict[str, Any]:
+    """Read results written by `write_results`."""
+    if isinstance(file, str):
+        with open(file) as f:
+            return json.load(f)
+    return json.load(file)
+
+
+@dataclass
+class Change:
+    """The change of a metric between two result files."""
+
+    benchmark: str
+    metric: str
+    unit: str
+    baseline: float
+    current: float
+    ratio: float
+    """How many times worse the current value is (above one is worse)."""
+    regression: bool
+    improvement: bool
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.1,
+    min_time: float = 1e-3,
+) -> List[Change]:
+    """Compare the medians of the metrics found in both `baseline` and `current`.
+
+    Parameters
+    ----------
+    baseline
+        The reference results.
+    current
+        The results to check.
+    threshold
+        The relative change above which a metric is reported as a regression
+        or an improvement.
+    min_time
+        Time metrics (in seconds) whose medians are both below this value are
+        too noisy to be flagged.
+
+    Returns
+    -------
+    list of Change
+        One entry per metric found in both result files.
+
+    """
+    changes = []
+    for name, bench in current["benchmarks"].items():
+        base_bench = baseline["benchmarks"].get(name)
+        if base_bench is None:
+            continue
+        for metric, summary in bench["metrics"].items():
+            base_summary = base_bench["metrics"].get(metric)
+            if base_summary is None:
+                continue
+            base_value = base_summary["median"]
+            value = summary["median"]
+            if summary.get("higher_is_better", False):
+                num, den = base_value, value
+            else:
+                num, den = value, base_value
+            if den > 0:
+                ratio = num / den
+            else:
+                ratio = 1.0 if num == den else np.inf
+
+            noisy = summary.get("unit") == "s" and max(base_value, value) < min_time
+            changes.append(
+                Change(
+                    benchmark=name,
+                    metric=metric,
+                    unit=summary.get("unit", ""),
+                    baseline=base_value,
+                    current=value,
+                    ratio=ratio,
+                    regression=not noisy and ratio > 1 + threshold,
+                    improvement=not noisy and ratio < 1 / (1 + threshold),
+                )
+            )
+    return changes
+
+
+def format_changes(changes: Sequence[Change], all_metrics: bool = False) -> str:
+    """Return a table of the regressions and improvements in `changes`.
+
+    When `all_metrics` is true, the unchanged metrics are listed too.
+
+    """
+    lines = []
+    for change in sorted(changes, key=lambda c: -c.ratio):
+        if change.regression:
+            status = "REGRESSION"
+        elif change.improvement:
+            status = "improvement"
+        elif all_metrics:
+            status = ""
+        else:
+            continue
+        lines.append(
+            f"{status:<11} {change.benchmark:<24} {change.metric:<40} "
+            f"{change.baseline:>12.4g} -> {change.current:<12.4g} {change.unit:<5} "
+            f"x{change.ratio:.2f}"
+        )
+    if not lines:
+        return "No significant change."
+    return "\n".join(lines)
+
+
+def report_comparison(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.1,
+    min_time: float = 1e-3,
+    file: IO = sys.stdout,
+) -> bool:
+    """Print the comparison of two result files, and return whether some metric regressed."""
+    if baseline.get("suite") != current.get("suite"):
+        print(
+            f"Warning: comparing results of the {baseline.get('suite')} and "
+            f"{current.get('suite')} suites",
+            file=file,
+        )
+    for key in ("machine", "cpu_count", "cxx", "floatX"):
+        base_val = baseline["environment"].get(key)
+        val = current["environment"].get(key)
+        if base_val != val:
+            print(f"Warning: different {key} ({base_val} and {val})", file=file)
+
+    changes = compare_results(baseline, current, threshold, min_time)
+    print(format_changes(changes), file=file)
+    return any(change.regression for change in changes)
@@ -0,0 +1,99 @@
+from io import StringIO
+
+import pytest
+
+from benchmarks.compile_time import FAMILIES, compile_times, main, run_benchmarks
+from benchmarks.utils import (
+    compare_results,
+    load_results,
+    report_comparison,
+    write_results,
+)
+
+
+SMALL_PARAMS = {
+    "deep_mlp": {"depth": 2, "width": 4},
+    "wide_elemwise": {"width": 8},
+    "nested_scans": {"n_scans": 1},
+    "sparse_model": {"n_layers": 2, "width": 4},
+    "constant_folding": {"size": 10, "n_ops": 6},
+}
+
+
+def test_families():
+    assert set(SMALL_PARAMS) == set(FAMILIES)
+
+    results = run_benchmarks(repeat=2, mode="FAST_COMPILE", params=SMALL_PARAMS)
+
+    assert results["suite"] == "compile_time"
+    assert set(results["benchmarks"]) == set(FAMILIES)
+    for name, bench in results["benchmarks"].items():
+        assert bench["params"] == SMALL_PARAMS[name]
+        metrics = bench["metrics"]
+        for metric in ("total", "fgraph", "rewrite", "link", "c_compile", "nodes"):
+            assert len(metrics[metric]["values"]) == 2
+        assert metrics["total"]["median"] > metrics["rewrite"]["median"] > 0
+        assert metrics["nodes"]["unit"] == "nodes"
+        assert any(metric.startswith("phase:") for metric in metrics)
+
+
+def test_compile_times():
+    build, defaults = FAMILIES["deep_mlp"]
+    times = compile_times(*build(depth=1, width=2), mode="FAST_RUN")
+    # The phases are nested in the rewriting
+    phases = sum(t for name, t in times.items() if name.startswith("phase:"))
+    assert 0 < phases <= times["rewrite"]
+    assert times["total"] >= times["rewrite"] + times["link"] + times["c_compile"]
+    assert "peak_memory" not in times
+
+    times = compile_times(*build(depth=1, width=2), trace_memory=True)
+    assert times["peak_memory"] > 0
+
+
+def test_compare_results():
+    results = run_benchmarks(
+        families=["wide_elemwise"], repeat=1, mode="FAST_COMPILE", params=SMALL_PARAMS
+    )
+    assert not any(
+        change.regression or change.improvement
+        for change in compare_results(results, results)
+    )
+
+    buf = StringIO()
+    write_results(results, buf)
+    buf.seek(0)
+    slower = load_results(buf)
+    total = slower["benchmarks"]["wide_elemwise"]["metrics"]["total"]
+    total["median"] *= 2
+    changes = {
+        change.metric: change
+        for change in compare_results(results, slower, threshold=0.5, min_time=0)
+    }
+    assert changes["total"].regression
+    assert changes["total"].ratio == pytest.approx(2)
+    assert not changes["rewrite"].regression
+
+    out = StringIO()
+    assert report_comparison(results, slower, min_time=0, file=out)
+    assert "REGRESSION" in out.getvalue()
+
+    # Times that are too small are not flagged
+    min_time = 10 * total["median"]
+    assert not any(
+        change.regression
+        for change in compare_results(results, slower, min_time=min_time)
+    )
+
+
+def test_main(tmp_path):
+    output = str(tmp_path / "results.json")
+    args = ["--family", "wide_elemwise", "--param", "wide_elemwise.width=4"]
+    args += ["--repeat", "1", "--mode", "FAST_COMPILE", "--output", output]
+    assert main(args) == 0
+    assert main(args + ["--baseline", output, "--threshold", "100"]) == 0
+
+    results = load_results(output)
+    assert results["benchmarks"]["wide_elemwise"]["params"] == {"width": 4}
+
+    with pytest.raises(ValueError):
+        main(["--param", "wide_elemwise.depth=2"])
@@ -0,0 +1,87 @@
+import pytest
+
+from benchmarks.runtime import WORKLOADS, main, parse_params, run_benchmarks
+from benchmarks.utils import compare_results, load_results
+
+
+SMALL_PARAMS = {
+    "elemwise_chain": {"size": 10, "length": 4},
+    "reductions": {"rows": 5, "cols": 4},
+    "blas": {"n": 8},
+    "scan_loop": {"n_steps": 3, "size": 4},
+    "random_sampling": {"size": 10},
+    "sparse_dot": {"n": 10, "density": 0.2, "cols": 3},
+}
+
+
+def test_workloads():
+    assert set(SMALL_PARAMS) == set(WORKLOADS)
+
+    results = run_benchmarks(
+        backends=["vm"], repeat=2, min_time=0.001, params=SMALL_PARAMS, isolate=False
+    )
+
+    assert results["suite"] == "runtime"
+    assert set(results["benchmarks"]) == {f"{name}[vm]" for name in WORKLOADS}
+    for name, bench in results["benchmarks"].items():
+        assert bench["backend"] == "vm"
+        assert bench["params"] == SMALL_PARAMS[bench["workload"]]
+        metrics = bench["metrics"]
+        assert metrics["calls_per_s"]["higher_is_better"]
+        assert len(metrics["calls_per_s"]["values"]) == 2
+        assert metrics["calls_per_s"]["median"] > 0
+        assert (
+            0
+            < metrics["latency_p50"]["median"]
+            <= metrics["latency_p90"]["median"]
+            <= metrics["latency_p99"]["median"]
+        )
+        assert "peak_rss" not in metrics
+
+
+def test_skipped_backends():
+    pytest.importorskip("resource")
+
+    results = run_benchmarks(
+        workloads=["scan_loop"],
+        backends=["c", "py"],
+        repeat=1,
+        min_time=0.001,
+        params=SMALL_PARAMS,
+    )
+
+    # `Scan` has no C implementation
+    assert "scan_loop[c]" in results["skipped"]
+    assert set(results["benchmarks"]) == {"scan_loop[py]"}
+    # Each benchmark is run in its own process
+    assert results["benchmarks"]["scan_loop[py]"]["metrics"]["peak_rss"]["median"] > 0
+
+
+def test_parse_params():
+    assert parse_params(["sparse_dot.density=0.5", "blas.n=3"]) == {
+        "sparse_dot": {"density": 0.5},
+        "blas": {"n": 3},
+    }
+    with pytest.raises(ValueError):
+        parse_params(["blas.m=3"])
+
+
+def test_main(tmp_path):
+    output = str(tmp_path / "results.json")
+    args = ["--workload", "blas", "--backend", "py", "--param", "blas.n=4"]
+    args += ["--repeat", "1", "--min-time", "0.001", "--output", output]
+    assert main(args) == 0
+    assert main(args + ["--baseline", output, "--threshold", "100"]) == 0
+
+    results = load_results(output)
+    assert set(results["benchmarks"]) == {"blas[py]"}
+
+    # Fewer calls per second is a regression
+    slower = load_results(output)
+    slower["benchmarks"]["blas[py]"]["metrics"]["calls_per_s"]["median"] /= 2
+    changes = {
+        change.metric: change
+        for change in compare_results(results, slower, threshold=0.5)
+    }
+    assert changes["calls_per_s"].regression
+    assert changes["calls_per_s"].ratio == pytest.approx(2)
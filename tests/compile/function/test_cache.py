@@ -0,0 +1,229 @@
+import numpy as np
+import pytest
+
+import aesara.compile.function.types
+import aesara.tensor as at
+from aesara.compile import shared
+from aesara.compile.function import function
+from aesara.compile.function.cache import (
+    DiskRewrittenGraphCache,
+    MemoryRewrittenGraphCache,
+    PendingSubgraphs,
+    SubgraphRewriteCache,
+    get_rewritten_graph_caches,
+    get_subgraph_rewrite_cache,
+    graph_signature,
+    rewrite_cache_key,
+    subgraph_signature,
+)
+from aesara.compile.function.types import FunctionMaker, std_fgraph
+from aesara.compile.mode import Mode, get_default_mode
+from aesara.compile.profiling import ProfileStats
+from aesara.configdefaults import config
+from aesara.graph.rewriting.basic import MergeOptimizer
+from aesara.tensor.type import dvector, matrix, vector
+
+
+def make_graph(c=2.0):
+    x = vector("x")
+    y = matrix("y")
+    out = at.exp(at.dot(y, x) * c + at.log1p(x.sum()))
+    return [x, y], [out, at.tanh(x) + x]
+
+
+def make_fgraph(inputs, outputs):
+    inputs = [FunctionMaker.wrap_in(i) for i in inputs]
+    outputs = [FunctionMaker.wrap_out(o) for o in outputs]
+    fgraph, _ = std_fgraph(inputs, outputs)
+    return fgraph, inputs
+
+
+@pytest.fixture
+def disk_cache(tmp_path, monkeypatch):
+    cache = DiskRewrittenGraphCache(str(tmp_path))
+    monkeypatch.setattr(
+        aesara.compile.function.types,
+        "get_rewritten_graph_caches",
+        lambda: [cache],
+    )
+    return cache
+
+
+def test_graph_signature():
+    fgraph_1, inputs_1 = make_fgraph(*make_graph())
+    fgraph_2, inputs_2 = make_fgraph(*make_graph())
+    fgraph_3, inputs_3 = make_fgraph(*make_graph(3.0))
+
+    assert graph_signature(fgraph_1, inputs_1) == graph_signature(fgraph_2, inputs_2)
+    assert graph_signature(fgraph_1, inputs_1) != graph_signature(fgraph_3, inputs_3)
+
+    inputs_2[0].mutable = True
+    assert graph_signature(fgraph_1, inputs_1) != graph_signature(fgraph_2, inputs_2)
+
+
+def test_rewrite_cache_key_uncacheable_mode():
+    fgraph, inputs = make_fgraph(*make_graph())
+
+    assert rewrite_cache_key(fgraph, inputs, get_default_mode()) is not None
+    assert rewrite_cache_key(fgraph, inputs, Mode(optimizer=MergeOptimizer())) is None
+
+
+def test_disk_cache(disk_cache):
+    x_val = np.arange(3.0)
+    y_val = np.ones((3, 3))
+
+    f_1 = function(*make_graph())
+    assert disk_cache.hits == 0
+    assert disk_cache.misses == 1
+
+    f_2 = function(*make_graph())
+    assert disk_cache.hits == 1
+    assert disk_cache.misses == 1
+
+    for exp_res, res in zip(f_1(x_val, y_val), f_2(x_val, y_val)):
+        assert np.allclose(exp_res, res)
+
+    assert {type(n.op) for n in f_1.maker.fgraph.apply_nodes} == {
+        type(n.op) for n in f_2.maker.fgraph.apply_nodes
+    }
+
+    # A different constant must not reuse the cached graph
+    function(*make_graph(3.0))
+    assert disk_cache.hits == 1
+    assert disk_cache.misses == 2
+
+    # A new cache instance (e.g. in another process) reuses the stored graphs
+    other_cache = DiskRewrittenGraphCache(disk_cache.dirname)
+    ins, outs = make_graph()
+    fgraph, inputs = make_fgraph(ins, outs)
+    key = rewrite_cache_key(fgraph, inputs, get_default_mode())
+    assert other_cache.get(key, fgraph) is not None
+
+    disk_cache.clear()
+    function(*make_graph())
+    assert disk_cache.hits == 1
+    assert disk_cache.misses == 3
+
+
+def test_disk_cache_updates(disk_cache):
+    s = shared(np.zeros(3), name="s")
+
+    for i in range(2):
+        x = dvector("x")
+        f = function([x], (x * 2).sum(), updates=[(s, s + x)])
+        assert f(np.ones(3)) == 6.0
+
+    assert disk_cache.hits == 1
+    assert np.array_equal(s.get_value(), np.full(3, 2.0))
+
+
+def test_memory_cache(monkeypatch):
+    cache = MemoryRewrittenGraphCache(2)
+    monkeypatch.setattr(
+        aesara.compile.function.types,
+        "get_rewritten_graph_caches",
+        lambda: [cache],
+    )
+
+    x_val = np.arange(3.0)
+    y_val = np.ones((3, 3))
+
+    profile = ProfileStats(atexit_print=False)
+    f_1 = function(*make_graph(), profile=profile)
+    f_2 = function(*make_graph(), profile=profile)
+    assert cache.hits == 1
+    assert profile.rewrite_cache_hits == 1
+    assert profile.rewrite_cache_misses == 1
+
+    for exp_res, res in zip(f_1(x_val, y_val), f_2(x_val, y_val)):
+        assert np.allclose(exp_res, res)
+
+    # The cached graph is cloned, so it isn't shared between functions
+    assert not f_1.maker.fgraph.apply_nodes & f_2.maker.fgraph.apply_nodes
+
+    # The least recently used entry is evicted first
+    function(*make_graph(3.0))
+    function(*make_graph(4.0))
+    assert len(cache.entries) == 2
+    function(*make_graph())
+    assert cache.hits == 1
+    function(*make_graph(4.0))
+    assert cache.hits == 2
+
+
+def test_memory_cache_config():
+    with config.change_flags(compile__rewrite_memory_cache_size=0):
+        assert get_rewritten_graph_caches() == []
+
+    with config.change_flags(compile__rewrite_memory_cache_size=3):
+        (cache,) = get_rewritten_graph_caches()
+        assert isinstance(cache, MemoryRewrittenGraphCache)
+        assert cache.maxsize == 3
+
+
+def test_subgraph_signature():
+    fgraph_1, _ = make_fgraph(*make_graph())
+    x, y = make_graph()[0]
+    z = vector("z")
+    fgraph_2, _ = make_fgraph(
+        [z, y, x], [at.exp(at.dot(y, x) * 2.0 + at.log1p(x.sum())), z]
+    )
+
+    sig_1, inputs_1 = subgraph_signature(fgraph_1, fgraph_1.outputs[0])
+    sig_2, inputs_2 = subgraph_signature(fgraph_2, fgraph_2.outputs[0])
+    assert sig_1 == sig_2
+    assert set(inputs_1) == set(fgraph_1.inputs)
+    assert [inp.name for inp in inputs_1] == [inp.name for inp in inputs_2]
+
+    sig_3, _ = subgraph_signature(fgraph_1, fgraph_1.outputs[1])
+    assert sig_1 != sig_3
+
+
+def test_subgraph_rewrite_cache(monkeypatch):
+    cache = SubgraphRewriteCache(2)
+    monkeypatch.setattr(
+        aesara.compile.function.types,
+        "get_subgraph_rewrite_cache",
+        lambda: cache,
+    )
+
+    x_val = np.arange(3.0)
+    y_val = np.ones((3, 3))
+
+    profile = ProfileStats(atexit_print=False)
+    (x, y), outs = make_graph()
+    f_1 = function([x, y], outs, profile=profile)
+    assert cache.hits == 0
+    assert cache.misses == 2
+    assert len(cache.entries) == 2
+    assert not any(
+        isinstance(ft, PendingSubgraphs) for ft in f_1.maker.fgraph._features
+    )
+
+    # The same output among other inputs and outputs reuses the cached graph
+    (x, y), outs = make_graph()
+    z = vector("z")
+    f_2 = function([z, x, y], [outs[0], z * 2], profile=profile)
+    assert cache.hits == 1
+    assert cache.misses == 3
+    assert profile.subgraph_rewrite_cache_hits == 1
+    assert profile.subgraph_rewrite_cache_misses == 3
+
+    assert np.allclose(f_1(x_val, y_val)[0], f_2(x_val, x_val, y_val)[0])
+    assert not f_1.maker.fgraph.apply_nodes & f_2.maker.fgraph.apply_nodes
+
+    # The least recently used entry was evicted
+    assert len(cache.entries) == 2
+    (x, y), outs = make_graph()
+    function([x], outs[1])
+    assert cache.hits == 1
+
+
+def test_subgraph_rewrite_cache_config():
+    with config.change_flags(compile__subgraph_rewrite_cache_size=0):
+        assert get_subgraph_rewrite_cache() is None
+
+    with config.change_flags(compile__subgraph_rewrite_cache_size=3):
+        cache = get_subgraph_rewrite_cache()
+        assert isinstance(cache, SubgraphRewriteCache)
+        assert cache.maxsize == 3
@@ -1,9 +1,11 @@
 import copy
 import pickle
+from unittest.mock import patch
 
 import numpy as np
 import pytest
 
+import aesara.link.c.basic
 import aesara.tensor as at
 from aesara.compile import shared
 from aesara.compile.debugmode import DebugMode, InvalidValueError
@@ -13,6 +15,7 @@ from aesara.compile.io import In, Out
 from aesara.compile.mode import Mode, get_default_mode
 from aesara.compile.ops import update_placeholder
 from aesara.configdefaults import config
+from aesara.gradient import grad
 from aesara.graph.basic import Constant
 from aesara.graph.fg import FunctionGraph
 from aesara.graph.rewriting.basic import OpKeyGraphRewriter, PatternNodeRewriter
@@ -866,6 +869,32 @@ class TestFunction:
         with pytest.raises(AssertionError):
             function([x], outputs={(1, "b"): x, 1.0: x**2})
 
+    @pytest.mark.parametrize("linker", ["py", "vm", "cvm"])
+    def test_fast_call(self, linker):
+        if linker == "cvm" and not config.cxx:
+            pytest.skip("G++ not available, so we need to skip this test.")
+
+        x, y = dscalars("x", "y")
+        s = shared(np.array(0.0), "s")
+        f = function(
+            [x, In(y, value=2.0)],
+            [x * y, x + y],
+            updates=[(s, s + x)],
+            mode=Mode(linker=linker),
+        )
+
+        res = f.fast_call(np.array(3.0), np.array(4.0))
+        assert isinstance(res, list)
+        assert np.array_equal(res, [12.0, 7.0])
+        assert s.get_value() == 3.0
+        assert np.array_equal(f(1.0), f.fast_call(np.array(1.0), np.array(2.0)))
+        assert s.get_value() == 5.0
+        assert f.fast_call is f.fast_call
+
+        g = function([x], at.exp(x).reshape((2,)), mode=Mode(linker=linker))
+        with pytest.raises(ValueError, match=".*Apply node that caused the error.*"):
+            g.fast_call(np.array(1.0))
+
 
 class TestPicklefunction:
     def test_deepcopy(self):
@@ -1321,3 +1350,94 @@ class TestSupervisor:
 
         assert any(isinstance(ft, Supervisor) for ft in fg_unpkld._features)
         assert all(hasattr(fg, attr) for attr in ("_supervisor_protected",))
+
+
+@pytest.mark.parametrize("n_branches", [2, 10])
+def test_compile_benchmark(n_branches, benchmark):
+    # A model made of many small perceptrons and their gradients
+    X = matrix("X")
+    params = []
+    cost = 0
+    for b in range(n_branches):
+        h = X
+        for i in range(5):
+            W = matrix(f"W_{b}_{i}")
+            params.append(W)
+            h = tanh(dot(h, W) + 1.0) * 0.5
+        cost = cost + (h**2).mean()
+    outputs = [cost] + grad(cost, params)
+
+    # Compile once, so that the C code compilation isn't timed
+    function([X] + params, outputs)
+
+    benchmark.pedantic(function, args=([X] + params, outputs), rounds=3)
+
+
+def test_prepare_inner_functions():
+    from aesara.compile.builders import OpFromGraph
+    from aesara.graph.op import HasInnerGraph
+    from aesara.scan.basic import scan
+
+    x = vector("x")
+    X = matrix("X")
+
+    y = vector("y")
+    ofg = OpFromGraph([y], [at.exp(y) + 1])
+
+    ys, _ = scan(
+        lambda x_t, acc: at.sin(x_t) + acc, sequences=[x], outputs_info=[at.zeros(())]
+    )
+
+    def step(x_t):
+        zs, _ = scan(
+            lambda z, acc: at.cos(z) + acc,
+            sequences=[x_t],
+            outputs_info=[at.zeros(())],
+        )
+        return zs
+
+    ws, _ = scan(step, sequences=[X])
+
+    prepared = []
+
+    def compile_node_cmodules(nodes, storage_map, compute_map, no_recycling):
+        prepared.append(list(nodes))
+        return 0
+
+    with config.change_flags(cmodule__compile_workers=2), patch.object(
+        aesara.link.c.basic, "compile_node_cmodules", compile_node_cmodules
+    ):
+        f = function([x, X], [ofg(x), ys, ws], mode=Mode(linker="cvm"))
+
+    # The inner graphs, including the nested one, are rewritten before the
+    # outer graph is linked, and all their nodes are compiled in one batch
+    assert len(prepared) == 1
+    inner_ops = []
+    fgraphs = [f.maker.fgraph]
+    while fgraphs:
+        fgraph = fgraphs.pop()
+        for node in fgraph.apply_nodes:
+            if isinstance(node.op, HasInnerGraph):
+                inner_ops.append(node.op)
+                fgraphs.append(node.op.fn.maker.fgraph)
+    assert len(inner_ops) == 4
+    assert f.maker.linker.cmodules_compiled
+    for op in inner_ops:
+        assert op._fn_maker is None
+        assert set(op.fn.maker.fgraph.apply_nodes) <= set(prepared[0])
+        assert op.fn.maker.linker.cmodules_compiled
+
+    x_val = np.arange(3, dtype=config.floatX)
+    X_val = np.ones((2, 3), dtype=config.floatX)
+    res = f(x_val, X_val)
+    assert np.allclose(res[0], np.exp(x_val) + 1)
+    assert np.allclose(res[1], np.cumsum(np.sin(x_val)))
+    assert np.allclose(res[2], np.cumsum(np.cos(X_val), axis=1))
+
+    # Nothing is prepared with a single worker
+    prepared.clear()
+    with config.change_flags(cmodule__compile_workers=1), patch.object(
+        aesara.link.c.basic, "compile_node_cmodules", compile_node_cmodules
+    ):
+        function([x], ofg(x), mode=Mode(linker="cvm"))
+    assert not prepared
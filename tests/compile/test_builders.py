@@ -64,9 +64,14 @@ class TestOpFromGraph(unittest_tools.InferShapeTester):
         ofg_clone = ofg.clone()
 
         assert ofg_clone.fgraph is not ofg.fgraph
-        assert ofg_clone.fgraph.outputs != ofg.fgraph.outputs
         assert equal_computations(ofg_clone.fgraph.outputs, ofg.fgraph.outputs)
 
+        # The inner graphs are shared until one of them is changed
+        out = ofg.fgraph.outputs[0]
+        ofg_clone.fgraph.replace(out.owner.inputs[1], 3 * ofg.fgraph.inputs[0])
+        assert ofg.fgraph.outputs[0] is out
+        assert not equal_computations(ofg_clone.fgraph.outputs, ofg.fgraph.outputs)
+
     @pytest.mark.parametrize(
         "cls_ofg", [OpFromGraph, partial(OpFromGraph, inline=True)]
     )
@@ -0,0 +1,37 @@
+import os
+import pickle
+from unittest.mock import patch
+
+import aesara
+import aesara.tensor as at
+from aesara.compile.compiledir import warm_cache
+from aesara.compile.function import function
+from aesara.compile.mode import Mode
+from aesara.link.c.cmodule import ModuleCache
+from aesara.tensor.type import dvector
+
+
+def test_warm_cache(tmp_path):
+    x = dvector("x")
+    f = function([x], [at.exp(x), at.sin(x) * 2], mode=Mode(linker="cvm"))
+
+    graphs_dir = tmp_path / "graphs"
+    graphs_dir.mkdir()
+    with open(graphs_dir / "fgraph.pkl", "wb") as file:
+        pickle.dump(f.maker.fgraph, file)
+    with open(tmp_path / "f.pkl", "wb") as file:
+        pickle.dump(f, file)
+
+    compiledir = str(tmp_path / "compiledir")
+    os.mkdir(compiledir)
+    cache = ModuleCache(compiledir)
+    compiledir_prop = aesara.config._config_var_dict["compiledir"]
+    with patch.object(compiledir_prop, "val", compiledir, create=True), patch.object(
+        aesara.link.c.cmodule, "_module_cache", cache
+    ):
+        n_compiled = warm_cache([str(graphs_dir)], n_workers=2)
+        assert n_compiled > 1
+        assert cache.stats[2] == n_compiled
+
+        # The function needs the same modules as its graph
+        assert warm_cache([str(graphs_dir), str(tmp_path / "f.pkl")]) == 0
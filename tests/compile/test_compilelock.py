@@ -8,7 +8,12 @@ import time
 import filelock
 import pytest
 
-from aesara.compile.compilelock import force_unlock, local_mem, lock_ctx
+from aesara.compile.compilelock import (
+    force_unlock,
+    local_mem,
+    lock_ctx,
+    module_lock_ctx,
+)
 
 
 def test_compilelock_force_unlock():
@@ -130,3 +135,45 @@ def test_locking_multiprocess_fork():
 def test_locking_multiprocess_spawn():
     ctx = multiprocessing.get_context("spawn")
     run_locking_test(ctx)
+
+
+def check_module_is_locked(dir_name, module_hash, q):
+    try:
+        with module_lock_ctx(module_hash, lock_dir=dir_name, timeout=0.1):
+            q.put("unlocked")
+    except filelock.Timeout:
+        q.put("locked")
+
+
+def get_subprocess_module_lock_state(ctx, dir_name, module_hash):
+    q = ctx.Queue()
+    p = ctx.Process(target=check_module_is_locked, args=(dir_name, module_hash, q))
+    p.start()
+    result = q.get()
+    p.join()
+    return result
+
+
+def test_module_lock_ctx():
+    ctx = multiprocessing.get_context("spawn")
+
+    with tempfile.TemporaryDirectory() as dir_name:
+        with module_lock_ctx("m1", lock_dir=dir_name):
+            assert get_subprocess_module_lock_state(ctx, dir_name, "m1") == "locked"
+
+            # Other modules can be locked, unless they share the lock file of
+            # the locked module
+            assert "unlocked" in [
+                get_subprocess_module_lock_state(ctx, dir_name, module_hash)
+                for module_hash in ("m2", "m3")
+            ]
+
+            # The lock of the whole directory is independent
+            assert get_subprocess_lock_state(ctx, dir_name) == "unlocked"
+
+        assert get_subprocess_module_lock_state(ctx, dir_name, "m1") == "unlocked"
+
+        # Nothing more is locked when the whole directory is locked
+        with lock_ctx(dir_name):
+            with module_lock_ctx("m1", lock_dir=dir_name):
+                assert len(local_mem._locks) == 1
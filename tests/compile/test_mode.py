@@ -1,5 +1,6 @@
 import copy
 
+import numpy as np
 import pytest
 
 from aesara.compile.function import function
@@ -7,8 +8,10 @@ from aesara.compile.mode import (
     AddFeatureOptimizer,
     Mode,
     get_default_mode,
+    get_mode,
     get_target_language,
 )
+from aesara.compile.rewrite_costs import expensive_rewrites
 from aesara.configdefaults import config
 from aesara.graph.features import NoOutputFromInplace
 from aesara.graph.rewriting.db import RewriteDatabaseQuery, SequenceDB
@@ -142,3 +145,19 @@ def test_get_target_language():
     test_mode = Mode(linker=MyLinker())
     with pytest.raises(Exception):
         get_target_language(test_mode)
+
+
+def test_BALANCED():
+    mode = get_mode("BALANCED")
+    assert set(expensive_rewrites()) <= set(mode._optimizer.exclude)
+
+    x = vector("x")
+    y = tanh(x) * 1 + dot(x, x)
+    x_val = np.linspace(-1, 1, 5).astype(config.floatX)
+    np.testing.assert_allclose(
+        function([x], y, mode=mode)(x_val), function([x], y, mode="FAST_RUN")(x_val)
+    )
+
+    with config.change_flags(mode="BALANCED", optimizer="balanced"):
+        assert config.mode == "BALANCED"
+        assert Mode()._optimizer.name == "OPT_BALANCED"
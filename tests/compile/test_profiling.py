@@ -105,3 +105,29 @@ class TestProfiling:
         finally:
             config.profile = config1
             config.profile_memory = config2
+
+    def test_rewrite_profiler(self):
+        x = fvector("x")
+        p = ProfileStats(False, gpu_checks=False)
+
+        with config.change_flags(profile_optimizer=True):
+            function([x], at.exp(at.log(x)) * 2, profile=p, mode="FAST_RUN")
+
+        assert p.rewrite_profiler is not None
+        stacks = p.rewrite_profiler.stats
+        assert any(stack[-1] == "local_exp_log" for stack in stacks)
+        assert all(stats.calls > 0 for stats in stacks.values())
+
+    def test_compile_times(self):
+        x = fvector("x")
+        p = ProfileStats(False, gpu_checks=False)
+
+        function([x], at.exp(x) * 2, profile=p, mode="FAST_RUN")
+
+        assert p.fgraph_time > 0
+        assert 0 <= p.c_compile_time <= p.linker_time
+
+        buf = StringIO()
+        p.summary(file=buf)
+        assert "FunctionGraph construction time" in buf.getvalue()
+        assert "C compilation time" in buf.getvalue()
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+import aesara.tensor as at
+from aesara.compile.function import function
+from aesara.compile.mode import get_mode
+from aesara.compile.rewrite_costs import (
+    REWRITE_COSTS,
+    benchmark_graphs,
+    excludable_rewrites,
+    expensive_rewrites,
+    measure_rewrite_costs,
+)
+from aesara.configdefaults import config
+from aesara.graph.basic import applys_between
+from aesara.scan.op import Scan
+from aesara.tensor.random.op import RandomVariable
+
+
+def test_expensive_rewrites():
+    costs = {
+        "cheap": (0.001, 0.0),
+        "useful": (0.2, 0.5),
+        "useless": (0.2, 0.01),
+        "slower_without": (-0.1, 0.0),
+    }
+    assert expensive_rewrites(costs) == {"useless"}
+    assert expensive_rewrites(costs, min_compile_cost=0.3) == set()
+    assert expensive_rewrites(costs, min_runtime_benefit=1.0) == {"useful", "useless"}
+
+    assert expensive_rewrites() <= set(REWRITE_COSTS)
+
+
+def test_excludable_rewrites():
+    excludable = excludable_rewrites()
+    assert "composite_elemwise_fusion" in excludable
+    # Sub-databases, merge and stabilization rewrites are always kept
+    assert "canonicalize" not in excludable
+    assert "merge1" not in excludable
+    assert "local_log1p" not in excludable
+    assert set(REWRITE_COSTS) <= excludable
+
+
+def test_measure_rewrite_costs():
+    x = at.vector("x")
+    graphs = [([x], [x * 1 + 0], lambda: [np.ones(5, dtype=config.floatX)])]
+    costs = measure_rewrite_costs(
+        graphs,
+        candidates=["local_mul_specialize"],
+        compile_repeat=1,
+        number=1,
+        repeat=1,
+    )
+    assert set(costs) == {"local_mul_specialize"}
+    compile_cost, runtime_benefit = costs["local_mul_specialize"]
+    assert 0 <= compile_cost <= 1
+    assert runtime_benefit >= 0
+
+
+def test_benchmark_graphs():
+    ops = {
+        type(node.op)
+        for inputs, outputs, _ in benchmark_graphs()
+        for node in applys_between(inputs, outputs)
+    }
+    # The `Scan` and random rewrites are measured too
+    assert Scan in ops
+    assert any(issubclass(op, RandomVariable) for op in ops)
+
+
+@pytest.mark.parametrize("mode", ["FAST_RUN", "BALANCED"])
+def test_compile_benchmark(mode, benchmark):
+    graphs = benchmark_graphs()
+    mode = get_mode(mode)
+
+    def compile_all():
+        for inputs, outputs, _ in graphs:
+            function(inputs, outputs, mode=mode)
+
+    # Fill the cache of compiled C modules first
+    compile_all()
+    benchmark.pedantic(compile_all, rounds=3)
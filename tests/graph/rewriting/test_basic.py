@@ -1,10 +1,12 @@
+import io
 import sys
 
 import pytest
 
+import aesara.scalar as aes
 from aesara.configdefaults import config
 from aesara.graph.basic import Apply, Constant, equal_computations
-from aesara.graph.features import Feature
+from aesara.graph.features import Feature, ReplaceValidate
 from aesara.graph.fg import FunctionGraph
 from aesara.graph.op import Op
 from aesara.graph.rewriting.basic import (
@@ -22,8 +24,10 @@ from aesara.graph.rewriting.basic import (
     pre_constant_merge,
     pre_greedy_node_rewriter,
 )
+from aesara.graph.utils import InconsistencyError
 from aesara.raise_op import assert_op
-from aesara.tensor.math import Dot, add, dot
+from aesara.tensor.elemwise import Elemwise
+from aesara.tensor.math import Dot, add, dot, exp, log
 from aesara.tensor.rewriting.basic import constant_folding
 from aesara.tensor.subtensor import AdvancedSubtensor
 from aesara.tensor.type import matrix, values_eq_approx_always_true
@@ -443,6 +447,106 @@ class TestMergeOptimizer:
         assert fg.outputs[0] is fg.outputs[1]
         assert fg.outputs[0] is not fg.outputs[2]
 
+    def test_merge_changed_inputs(self):
+        """Check that a node is merged once its inputs are changed to match another node's."""
+        x, y, z = MyVariable("x"), MyVariable("y"), MyVariable("z")
+        a = op1(x, y)
+        b = op1(x, z)
+        fg = FunctionGraph([x, y, z], [a, b], clone=False)
+        rewriter = MergeOptimizer()
+        rewriter.rewrite(fg)
+
+        merge_feature = fg.merge_feature
+        assert len(merge_feature.node_table) == 2
+        assert not merge_feature.scheduled
+
+        fg.replace(z, y)
+        assert merge_feature.scheduled
+
+        rewriter.rewrite(fg)
+        assert fg.outputs[0] is fg.outputs[1]
+        assert list(merge_feature.node_table.values()) == [[fg.outputs[0].owner]]
+
+    def test_merge_blacklisted_candidate(self):
+        """Check that the other equivalent nodes are tried when a merge fails."""
+        x, y = MyVariable("x"), MyVariable("y")
+        a, b = op1(x, y), op1(x, y)
+        fg = FunctionGraph([x, y], [a, b], clone=False)
+        rewriter = MergeOptimizer()
+        rewriter.add_requirements(fg)
+        merge_feature = fg.merge_feature
+
+        # Pretend that `b` couldn't be merged into `a`
+        merge_feature.scheduled.clear()
+        merge_feature.blacklist.add((b.owner, a.owner))
+        merge_feature.process_node(fg, b.owner)
+        key = merge_feature.node_keys[a.owner]
+        assert merge_feature.node_table[key] == [a.owner, b.owner]
+
+        # `c` falls back on `b` when it can't be merged into `a`
+        c = op1(x, y)
+        merge_feature.blacklist.add((c.owner, a.owner))
+        fg.add_output(c)
+        rewriter.apply(fg)
+        assert fg.outputs[2] is b
+
+        # `b` replaces `a` when `a` is removed from the graph
+        fg.remove_output(0)
+        assert merge_feature.node_table[key] == [b.owner]
+        d = op1(x, y)
+        fg.add_output(d)
+        rewriter.apply(fg)
+        assert fg.outputs == [b, b, b]
+
+    def test_merge_failure(self):
+        """Check that a node that couldn't be merged is a candidate for the others."""
+
+        class RejectReplacements(Feature):
+            reject = True
+
+            def validate(self, fgraph):
+                if self.reject:
+                    raise InconsistencyError("Rejected")
+
+        x, y = MyVariable("x"), MyVariable("y")
+        a, b = op1(x, y), op1(x, y)
+        fg = FunctionGraph([x, y], [a, b], clone=False)
+        rejecter = RejectReplacements()
+        fg.attach_feature(ReplaceValidate())
+        fg.attach_feature(rejecter)
+        rewriter = MergeOptimizer()
+        rewriter.rewrite(fg)
+
+        assert fg.outputs == [a, b]
+        merge_feature = fg.merge_feature
+        key = merge_feature.node_keys[a.owner]
+        assert merge_feature.node_table[key] == [a.owner, b.owner]
+
+        rejecter.reject = False
+        fg.remove_output(0)
+        c = op1(x, y)
+        fg.add_output(c)
+        rewriter.rewrite(fg)
+        assert fg.outputs == [b, b]
+
+    @pytest.mark.parametrize("n", [100, 1000])
+    def test_merge_benchmark(self, n, benchmark):
+        """Merge many duplicated nodes that all share one input."""
+
+        def setup():
+            x, y = MyVariable("x"), MyVariable("y")
+            zs = [MyVariable(f"z{i}") for i in range(n)]
+            outs = [op1(x, op2(x, z)) for z in zs]
+            outs += [op1(x, op2(x, y)) for i in range(n)]
+            fg = FunctionGraph([x, y, *zs], outs, clone=False)
+            return (fg,), {}
+
+        def merge(fg):
+            MergeOptimizer().rewrite(fg)
+            assert len(fg.apply_nodes) == 2 * n + 2
+
+        benchmark.pedantic(merge, setup=setup, rounds=3)
+
 
 class TestEquilibrium:
     def test_1(self):
@@ -482,6 +586,64 @@ class TestEquilibrium:
         rewriter.rewrite(g)
         assert str(g) == "FunctionGraph(Op2(x, y))"
 
+    @staticmethod
+    def chains_rewriter(worklist):
+        @node_rewriter([op1])
+        def local_op1_op2(fgraph, node):
+            # Rewrites `Op1(Op2(x))` into `Op2(x)`, which only enables the
+            # same rewrite in the clients of `node`
+            (inp,) = node.inputs
+            if inp.owner and inp.owner.op == op2:
+                return [inp]
+
+        return EquilibriumGraphRewriter(
+            [local_op1_op2], max_use_ratio=10, worklist=worklist
+        )
+
+    @staticmethod
+    def chains_graph(depth, width=0):
+        """Build a chain of `Op1`s over an `Op2`, next to untouched nodes."""
+        x, y = map(MyVariable, "xy")
+        out = op2(x)
+        for i in range(depth):
+            out = op1(out)
+        zs = [MyVariable(f"z{i}") for i in range(width)]
+        others = [op3(x, op4(y, z)) for z in zs]
+        return FunctionGraph([x, y, *zs], [out, *others], clone=False)
+
+    def test_worklist(self):
+        g_full = self.chains_graph(10, 5)
+        g_worklist = g_full.clone()
+
+        self.chains_rewriter(False).rewrite(g_full)
+        self.chains_rewriter(True).rewrite(g_worklist)
+
+        assert str(g_worklist.outputs[0]) == "Op2.0"
+        assert equal_computations(
+            g_full.outputs, g_worklist.outputs, g_full.inputs, g_worklist.inputs
+        )
+
+    @pytest.mark.parametrize("worklist", [False, True])
+    def test_worklist_benchmark(self, worklist, benchmark):
+        rewriter = self.chains_rewriter(worklist)
+
+        def setup():
+            return (self.chains_graph(200, 200),), {}
+
+        benchmark.pedantic(rewriter.rewrite, setup=setup, rounds=3)
+
+    def test_print_profile(self):
+        g = self.chains_graph(3, 2)
+        rewriter = self.chains_rewriter(False)
+        prof = rewriter.apply(g)
+
+        # Each `Op1` node is tried once per pass until it is removed
+        assert prof[12] == {rewriter.node_tracker.get_trackers(op1)[0]: 6}
+
+        stream = io.StringIO()
+        rewriter.print_profile(stream, prof)
+        assert "node rewriter calls 6 (3 returned False)" in stream.getvalue()
+
     @config.change_flags(on_opt_error="ignore")
     def test_low_use_ratio(self):
         x, y, z = map(MyVariable, "xyz")
@@ -705,6 +867,44 @@ class TestSequentialNodeRewriter:
             in capres.out
         )
 
+    def test_pattern_net(self):
+        x, y = MyVariable("x"), MyVariable("y")
+        o1 = op1(op2(x), y)
+        fgraph = FunctionGraph([x, y], [o1], clone=False)
+
+        tried = []
+
+        def constraint(var):
+            tried.append(var)
+            return True
+
+        rw_1 = PatternNodeRewriter((op1, (op3, "x"), "y"), (op4, "x"))
+        rw_2 = PatternNodeRewriter(
+            (op1, (op2, {"pattern": "x", "constraint": constraint}), "y"), (op5, "y")
+        )
+        seq_rewriter = SequentialNodeRewriter(rw_1, rw_2)
+        assert seq_rewriter.pattern_net.match(o1.owner) == {rw_2}
+
+        (res,) = seq_rewriter.transform(fgraph, o1.owner)
+        assert res.owner.op == op5
+        assert tried == [x]
+
+    @pytest.mark.parametrize("n_patterns", [10, 200])
+    def test_pattern_net_benchmark(self, n_patterns, benchmark):
+        ops = [MyOp(f"Op{i}") for i in range(n_patterns)]
+        seq_rewriter = SequentialNodeRewriter(
+            *[PatternNodeRewriter((op1, (op, "x"), "y"), (op2, "x")) for op in ops]
+        )
+        x, y = MyVariable("x"), MyVariable("y")
+        outs = [op1(op3(x), y) for i in range(100)]
+        fgraph = FunctionGraph([x, y], outs, clone=False)
+
+        def transform_all():
+            for out in outs:
+                assert seq_rewriter.transform(fgraph, out.owner) is None
+
+        benchmark.pedantic(transform_all, rounds=3)
+
 
 def test_node_rewriter_str():
     @node_rewriter([op1, MyOp])
@@ -830,6 +1030,49 @@ def test_OpToRewriterTracker():
     ]
 
 
+def test_OpToRewriterTracker_scalar_op():
+    @node_rewriter([(Elemwise, aes.Exp)])
+    def local_rewriter_1(fgraph, node):
+        return node.inputs
+
+    @node_rewriter([(Elemwise, (aes.Log, aes.Exp))])
+    def local_rewriter_2(fgraph, node):
+        pass
+
+    @node_rewriter([Elemwise])
+    def local_rewriter_3(fgraph, node):
+        pass
+
+    @node_rewriter([(Elemwise, aes.Log), Elemwise])
+    def local_rewriter_4(fgraph, node):
+        pass
+
+    tracker = OpToRewriterTracker()
+    for rw in (local_rewriter_1, local_rewriter_2, local_rewriter_3, local_rewriter_4):
+        tracker.add_tracker(rw)
+
+    assert tracker.get_trackers(exp) == [
+        local_rewriter_1,
+        local_rewriter_2,
+        local_rewriter_3,
+        local_rewriter_4,
+    ]
+    assert tracker.get_trackers(log) == [
+        local_rewriter_2,
+        local_rewriter_3,
+        local_rewriter_4,
+    ]
+    assert tracker.get_trackers(add) == [local_rewriter_3, local_rewriter_4]
+    assert tracker.get_trackers(exp) is tracker.get_trackers(exp)
+
+    x = matrix("x")
+    assert local_rewriter_1.transform(None, exp(x).owner) == [x]
+    assert local_rewriter_1.transform(None, log(x).owner) is False
+
+    with pytest.raises(TypeError):
+        node_rewriter([(Elemwise, "Exp")])(lambda fgraph, node: None)
+
+
 def test_deprecations():
     """Make sure we can import deprecated classes from current and deprecated modules."""
     with pytest.deprecated_call():
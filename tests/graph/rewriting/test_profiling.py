@@ -0,0 +1,114 @@
+import io
+import json
+
+import pytest
+
+from aesara.graph.features import AlreadyThere
+from aesara.graph.fg import FunctionGraph
+from aesara.graph.rewriting.basic import (
+    EquilibriumGraphRewriter,
+    SequentialGraphRewriter,
+    node_rewriter,
+)
+from aesara.graph.rewriting.profiling import RewriteProfiler
+from tests.graph.utils import MyVariable, op1, op2
+
+
+@node_rewriter([op1])
+def local_op1_op2(fgraph, node):
+    if node.inputs[0].owner and node.inputs[0].owner.op == op2:
+        return [op2(node.inputs[0].owner.inputs[0])]
+    return False
+
+
+def profiled_rewrite():
+    x = MyVariable("x")
+    fg = FunctionGraph([x], [op1(op1(op2(x)))], clone=False)
+    profiler = RewriteProfiler()
+    fg.attach_feature(profiler)
+    assert fg.rewrite_profiler is profiler
+
+    eq = EquilibriumGraphRewriter([local_op1_op2], max_use_ratio=10)
+    eq.name = "eq"
+    rewriter = SequentialGraphRewriter(eq)
+    rewriter.name = "seq"
+    rewriter.rewrite(fg)
+
+    fg.remove_feature(profiler)
+    assert not hasattr(fg, "rewrite_profiler")
+    return fg, profiler
+
+
+def test_RewriteProfiler():
+    fg, profiler = profiled_rewrite()
+    assert fg.outputs[0].owner.op == op2
+
+    stats = profiler.stats
+    assert set(stats) == {
+        ("seq",),
+        ("seq", "eq"),
+        ("seq", "eq", "local_op1_op2"),
+    }
+    assert stats[("seq",)].calls == 1
+    assert stats[("seq",)].applied == 1
+
+    local_stats = stats[("seq", "eq", "local_op1_op2")]
+    assert local_stats.applied == 2
+    assert local_stats.calls > local_stats.applied
+    assert local_stats.nodes_created == 2
+    assert local_stats.nodes_removed == 4
+    # The nodes are attributed to the innermost rewriter only
+    assert stats[("seq", "eq")].nodes_created == 0
+
+    self_times = profiler.self_times()
+    assert all(t >= 0 for t in self_times.values())
+    assert stats[("seq",)].time >= stats[("seq", "eq")].time
+
+    merged = RewriteProfiler()
+    merged.merge(profiler)
+    merged.merge(profiler)
+    assert merged.stats[("seq", "eq", "local_op1_op2")].applied == 4
+
+
+def test_RewriteProfiler_already_there():
+    x = MyVariable("x")
+    fg = FunctionGraph([x], [op1(x)], clone=False)
+    fg.attach_feature(RewriteProfiler())
+    with pytest.raises(AlreadyThere):
+        RewriteProfiler().on_attach(fg)
+
+
+def test_RewriteProfiler_export(tmp_path):
+    _, profiler = profiled_rewrite()
+
+    res = profiler.to_dict()
+    assert res["total_time"] == profiler.stats[("seq",)].time
+    (local_res,) = [r for r in res["rewrites"] if r["name"] == "local_op1_op2"]
+    assert local_res["stack"] == ["seq", "eq", "local_op1_op2"]
+    assert local_res["applied"] == 2
+
+    for line in profiler.to_collapsed_stacks():
+        stack, t = line.rsplit(" ", 1)
+        assert stack.split(";")[0] == "seq"
+        assert int(t) > 0
+
+    speedscope = profiler.to_speedscope("test")
+    frames = [f["name"] for f in speedscope["shared"]["frames"]]
+    assert set(frames) == {"seq", "eq", "local_op1_op2"}
+    (prof,) = speedscope["profiles"]
+    assert prof["name"] == "test"
+    assert len(prof["samples"]) == len(prof["weights"]) == 3
+    assert sorted(frames[i] for i in prof["samples"][-1]) == sorted(
+        ["seq", "eq", "local_op1_op2"]
+    )
+
+    path = tmp_path / "rewrites.json"
+    profiler.dump(str(path))
+    assert json.loads(path.read_text()) == json.loads(json.dumps(res))
+
+    out = io.StringIO()
+    profiler.dump(out, format="speedscope")
+    assert json.loads(out.getvalue())["exporter"] == "aesara"
+
+    with pytest.raises(ValueError, match="Unknown rewrite profile format"):
+        profiler.dump(out, format="pstats")
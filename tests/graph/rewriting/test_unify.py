@@ -11,9 +11,14 @@ import aesara.scalar as aes
 import aesara.tensor as at
 from aesara.graph.basic import Apply, Constant, equal_computations
 from aesara.graph.op import Op
-from aesara.graph.rewriting.unify import ConstrainedVar, convert_strs_to_vars
+from aesara.graph.rewriting.unify import (
+    ConstrainedVar,
+    DiscriminationNet,
+    convert_strs_to_vars,
+    pattern_symbols,
+)
 from aesara.tensor.type import TensorType
-from tests.graph.utils import MyType
+from tests.graph.utils import MyType, MyVariable, op1, op2, op3
 
 
 class CustomOp(Op):
@@ -350,6 +355,33 @@ def test_convert_strs_to_vars():
     assert np.array_equal(res[0].data, val)
 
 
+def test_pattern_symbols():
+    c = at.as_tensor_variable(1.0)
+    pattern = convert_strs_to_vars((op1, (op2, "x", c), (var("o"), "y"), "x"))
+    assert pattern_symbols(pattern) == [(op1, 3), (op2, 2), "*", "c", "*", "*"]
+
+
+def test_DiscriminationNet():
+    x, y = MyVariable("x"), MyVariable("y")
+    c = Constant(MyType(), 1.0)
+
+    net = DiscriminationNet()
+    net.add(convert_strs_to_vars((op1, "a", "b")), "any")
+    net.add(convert_strs_to_vars((op1, (op2, "a"), "a")), "op2-a")
+    net.add(convert_strs_to_vars((op1, (op2, "a"), "b")), "op2-b")
+    net.add(convert_strs_to_vars((op1, "a", Constant(MyType(), 2.0))), "const")
+    net.add(convert_strs_to_vars((op1, "a")), "unary")
+    net.add(convert_strs_to_vars((op3, "a", "b")), "op3")
+
+    assert net.match(op1(x, y).owner) == {"any"}
+    # Repeated logic variables and constant values are left to `unify`
+    assert net.match(op1(op2(x), y).owner) == {"any", "op2-a", "op2-b"}
+    assert net.match(op1(x, c).owner) == {"any", "const"}
+    assert net.match(op1(op2(x, y), c).owner) == {"any", "const"}
+    assert net.match(op1(x).owner) == {"unary"}
+    assert net.match(op2(x, y).owner) == set()
+
+
 def test_deprecations():
     """Make sure we can import deprecated classes from current and deprecated modules."""
     with pytest.deprecated_call():
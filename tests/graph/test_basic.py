@@ -1,4 +1,5 @@
 import pickle
+import tracemalloc
 from itertools import count
 
 import numpy as np
@@ -794,3 +795,59 @@ def test_NominalVariable_create_variable_type():
     assert type(ntv_unpkld) is type(ntv)
     assert ntv_unpkld.equals(ntv)
     assert ntv_unpkld is ntv
+
+
+def test_apply_tag():
+    x = vector("x")
+    node = (x + x).owner
+
+    assert not hasattr(node, "__dict__")
+    # The `Scratchpad` is only created when it's needed
+    assert node._tag is None
+    assert node.clone()._tag is None
+
+    node.tag.foo = 1
+    assert node.clone().tag.foo == 1
+    assert node.clone().tag is not node.tag
+
+    for protocol in (0, pickle.HIGHEST_PROTOCOL):
+        new_node = pickle.loads(pickle.dumps(node, protocol=protocol))
+        assert new_node.tag.foo == 1
+        assert new_node.op == node.op
+        assert new_node.outputs[0].owner is new_node
+
+
+def large_graph(n_nodes):
+    x = vector("x")
+    y = vector("y")
+    outs = [x, y]
+    for i in range(n_nodes // 2):
+        outs = [outs[0] + outs[1], outs[0] * outs[1]]
+    return [x, y], outs
+
+
+def traced_memory(fn, *args):
+    tracemalloc.start()
+    try:
+        fn(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize("n_nodes", [5000, 20000])
+def test_clone_get_equiv_benchmark(n_nodes, benchmark):
+    inputs, outputs = large_graph(n_nodes)
+
+    benchmark.extra_info["peak_memory"] = traced_memory(
+        clone_get_equiv, inputs, outputs
+    )
+    benchmark.pedantic(clone_get_equiv, args=(inputs, outputs), rounds=3)
+
+
+@pytest.mark.parametrize("n_nodes", [5000, 20000])
+def test_toposort_benchmark(n_nodes, benchmark):
+    inputs, outputs = large_graph(n_nodes)
+
+    benchmark.extra_info["peak_memory"] = traced_memory(io_toposort, inputs, outputs)
+    benchmark.pedantic(io_toposort, args=(inputs, outputs), rounds=3)
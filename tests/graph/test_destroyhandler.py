@@ -1,6 +1,7 @@
 import pickle
 from copy import copy
 
+import numpy as np
 import pytest
 
 from aesara.configdefaults import config
@@ -513,3 +514,115 @@ def test_fast_destroy():
     w = add_in_place(w, y)
     with pytest.raises(InconsistencyError):
         create_fgraph([x, y], [w], algo="fast")
+
+
+def check_order(fg):
+    """Check that the incremental order of the `DestroyHandler` is topological."""
+    order = fg._destroyhandler_order
+    assert set(order) == set(fg.apply_nodes)
+    ords = fg.destroy_handler.orderings(fg)
+    for node in fg.apply_nodes:
+        for inp in node.inputs:
+            if inp.owner:
+                assert order[inp.owner] < order[node]
+        for pred in ords.get(node, ()):
+            assert order[pred] < order[node]
+
+
+def add_grid(width, depth):
+    xs = [MyVariable(f"x{i}") for i in range(width)]
+    layer = xs
+    for d in range(depth):
+        layer = [add(layer[i], layer[(i + 1) % width]) for i in range(width)]
+    return xs, layer
+
+
+def make_inplace(fg, check=False):
+    nb_inplace = 0
+    for node in fg.toposort():
+        if node.op is not add or node not in fg.apply_nodes:
+            continue
+        try:
+            fg.replace_validate(node.outputs[0], add_in_place(*node.inputs))
+            nb_inplace += 1
+        except InconsistencyError:
+            pass
+        if check:
+            fg.validate()
+            check_order(fg)
+    return nb_inplace
+
+
+def test_incremental_order():
+    xs, outs = add_grid(4, 5)
+    fg = create_fgraph(xs, outs)
+    check_order(fg)
+
+    nb_inplace = make_inplace(fg, check=True)
+    assert 0 < nb_inplace < 20
+    assert not fg._destroyhandler_stale_order
+
+    # The same replacements give the same result with a full cycle check
+    # after each of them
+    xs, outs = add_grid(4, 5)
+    fg = create_fgraph(xs, outs)
+    validate = fg.destroy_handler.validate
+
+    def full_validate(fgraph):
+        fgraph._destroyhandler_stale_order = True
+        return validate(fgraph)
+
+    fg.destroy_handler.validate = full_validate
+    assert make_inplace(fg) == nb_inplace
+
+
+def test_incremental_order_cycle():
+    x, y, z = inputs()
+    e1 = add(x, y)
+    e2 = add(y, x)
+    g = create_fgraph([x, y, z], [e1, e2])
+    g.replace_validate(e1, add_in_place(x, y))
+    check_order(g)
+
+    # `AddInPlace(y, x)` must run before and after `AddInPlace(x, y)`
+    order = g._destroyhandler_order
+    with pytest.raises(InconsistencyError):
+        g.replace_validate(e2, add_in_place(y, x))
+
+    # The order isn't rebuilt from scratch after the change was reverted
+    g.validate()
+    assert g._destroyhandler_order is order
+    check_order(g)
+
+    # The edges that weren't checked are checked again
+    g.replace(e2, add_in_place(y, x))
+    with pytest.raises(InconsistencyError):
+        g.validate()
+    with pytest.raises(InconsistencyError):
+        g.validate()
+
+
+def test_incremental_order_no_room():
+    x, y = MyVariable("x"), MyVariable("y")
+    e1 = sigmoid(x)
+    e2 = add_in_place(e1, y)
+    g = create_fgraph([x, y], [e2])
+
+    # Leave no room between `e1.owner` and `e2.owner`
+    order = g._destroyhandler_order
+    order[e2.owner] = np.nextafter(order[e1.owner], np.inf)
+
+    g.change_node_input(e2.owner, 0, sigmoid(e1))
+    g.validate()
+    check_order(g)
+    # The order was rebuilt from scratch
+    assert g._destroyhandler_order is not order
+
+
+@pytest.mark.parametrize("width, depth", [(10, 20), (10, 80)])
+def test_inplace_benchmark(width, depth, benchmark):
+    def setup():
+        xs, outs = add_grid(width, depth)
+        return (create_fgraph(xs, outs),), {}
+
+    benchmark.pedantic(make_inplace, setup=setup, rounds=3)
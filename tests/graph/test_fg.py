@@ -681,6 +681,94 @@ class TestFunctionGraph:
         assert mop1_out_2 in fg.variables
         assert mop1_out_2 in fg.outputs
 
+    def test_toposort_cache(self):
+        var1 = MyVariable("var1")
+        var2 = MyVariable("var2")
+        var3 = op1(var2, var1)
+        var4 = op2(var3, var2)
+        var5 = op3(var4, var2, var2)
+        fg = FunctionGraph([var1, var2], [var3, var5], clone=False)
+
+        topo = fg.toposort()
+        assert topo == [var3.owner, var4.owner, var5.owner]
+
+        # The cached order is reused, but callers get their own copy
+        topo.pop()
+        assert fg.toposort() == [var3.owner, var4.owner, var5.owner]
+        assert fg._toposort is not None
+
+        var6 = op1(var3)
+        fg.change_node_input(var5.owner, 0, var6)
+        assert fg.toposort() == [var3.owner, var6.owner, var5.owner]
+
+        fg.remove_node(var6.owner)
+        assert fg.toposort() == [var3.owner]
+
+        fg.add_output(var4)
+        assert fg.toposort() == [var3.owner, var4.owner]
+
+        fg.toposort()
+        fg.invalidate_toposort()
+        assert fg._toposort is None
+
+    def test_clone_copy_on_write(self):
+        var1 = MyVariable("var1")
+        var2 = MyVariable("var2")
+        var3 = op1(var2, var1)
+        var4 = op2(var3, var2)
+        var5 = op3(var4, var2, var2)
+        fg = FunctionGraph([var1, var2], [var3, var5], clone=False)
+
+        fg_clone, equiv = fg.clone_get_equiv(copy_on_write=True)
+        assert fg_clone.outputs == fg.outputs
+        assert fg_clone.apply_nodes == fg.apply_nodes
+        assert all(equiv[v] is v for v in fg.variables)
+
+        # Changing a shared node copies it and the nodes that depend on it
+        fg_clone.change_node_input(var4.owner, 1, var1)
+        assert var4.owner.inputs == [var3, var2]
+        assert fg_clone.outputs[0] is var3
+        new_var5 = fg_clone.outputs[1]
+        assert new_var5 is not var5
+        new_var4 = new_var5.owner.inputs[0]
+        assert new_var4.owner.inputs == [var3, var1]
+        assert var4.owner not in fg_clone.apply_nodes
+        assert var5.owner not in fg_clone.apply_nodes
+        assert var3.owner in fg_clone.apply_nodes
+        fg_clone.check_integrity()
+
+        # The copies belong to the clone alone, so they're changed in place
+        fg_clone.change_node_input(new_var4.owner, 1, var2)
+        assert fg_clone.outputs[1] is new_var5
+        assert new_var4.owner.inputs == [var3, var2]
+
+        # The original graph copies its nodes too
+        fg.change_node_input(var5.owner, 1, var1)
+        assert var5.owner.inputs == [var4, var2, var2]
+        assert fg.outputs[1] is not var5
+        assert fg.outputs[1].owner.inputs == [var4, var1, var2]
+        fg.check_integrity()
+
+    def test_clone_copy_on_write_repeated_input(self):
+        var1 = MyVariable("var1")
+        var2 = MyVariable("var2")
+        var3 = op1(var1)
+        var4 = op3(var3, var2, var3)
+        fg = FunctionGraph([var1, var2], [var4], clone=False)
+
+        # `var4.owner` uses `var3` twice, so it's copied by the first change
+        # and the second one must change that copy
+        fg_clone = fg.clone(copy_on_write=True)
+        fg_clone.replace(var3, var2)
+        new_var4 = fg_clone.outputs[0]
+        assert new_var4.owner.inputs == [var2, var2, var2]
+        assert var4.owner.inputs == [var3, var2, var3]
+        assert fg_clone.apply_nodes == {new_var4.owner}
+        # The copies are only tracked during the replacement
+        assert not fg_clone._node_copies
+        fg_clone.check_integrity()
+        fg.check_integrity()
+
     def test_empty(self):
         var1 = MyVariable("var1")
         var2 = MyVariable("var2")
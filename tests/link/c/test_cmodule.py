@@ -7,6 +7,7 @@ deterministic based on the input type and the op.
 import logging
 import multiprocessing
 import os
+import pickle
 import sys
 import tempfile
 from unittest.mock import patch
@@ -17,12 +18,19 @@ import pytest
 import aesara
 import aesara.tensor as at
 from aesara.compile.function import function
+from aesara.compile.mode import Mode
 from aesara.compile.ops import DeepCopyOp
 from aesara.configdefaults import config
 from aesara.graph.basic import Apply
 from aesara.graph.fg import FunctionGraph
 from aesara.link.c.basic import CLinker
-from aesara.link.c.cmodule import GCC_compiler, ModuleCache, default_blas_ldflags
+from aesara.link.c.cmodule import (
+    GCC_compiler,
+    ModuleCache,
+    ModuleIndex,
+    default_blas_ldflags,
+    key_digest,
+)
 from aesara.link.c.exceptions import CompileError
 from aesara.link.c.op import COp
 from aesara.tensor.type import dvectors, vector
@@ -149,6 +157,165 @@ def test_cache_versioning():
         assert stats_before < cache.stats[2]
 
 
+def test_module_index():
+    x = vector("x")
+    lnk = CLinker().accept(FunctionGraph(outputs=[MyAddVersioned()(x)]))
+    key = lnk.cmodule_key()
+    # The keys are found from their digest, which must not depend on the
+    # identity of their objects
+    assert key_digest(pickle.loads(pickle.dumps(key))) == key_digest(key)
+
+    with tempfile.TemporaryDirectory() as dir_name:
+        cache = ModuleCache(dir_name)
+        cache.module_from_key(key, lnk)
+        key_pkl = os.path.join(os.path.dirname(cache.entry_from_key[key]), "key.pkl")
+
+        # The module is added to the index by the next refresh
+        cache = ModuleCache(dir_name)
+        assert key in cache.entry_from_key
+        records = ModuleIndex(cache.index.filename).load()
+        assert list(records) == [os.path.basename(os.path.dirname(key_pkl))]
+
+        # Indexed modules are only unpickled when they are used
+        with patch.object(
+            ModuleIndex, "read_key_pkl", side_effect=AssertionError
+        ), patch("aesara.link.c.cmodule.pickle.loads", wraps=pickle.loads) as m:
+            cache = ModuleCache(dir_name)
+            assert not m.called
+            assert not cache.entry_from_key
+            # The module is found without generating its code
+            with patch.object(lnk, "get_src_code", side_effect=AssertionError):
+                assert cache.module_from_key(key, lnk) is not None
+            assert m.call_count == 1
+        assert key in cache.entry_from_key
+        assert cache.stats == [0, 1, 0]
+
+        # Stale records are replaced when they are used
+        with open(key_pkl, "ab") as f:
+            f.write(b"\0")
+        cache = ModuleCache(dir_name)
+        assert cache._get_from_key(key) is not None
+        (record,) = ModuleIndex(cache.index.filename).load().values()
+        assert record[2] == os.path.getsize(key_pkl)
+
+        # A truncated index is replaced
+        with open(cache.index.filename, "ab") as f:
+            f.write(b"\x80")
+        index = ModuleIndex(cache.index.filename)
+        index.load()
+        assert not index.valid
+
+        ModuleCache(dir_name)
+        assert index.load()
+        assert index.valid
+
+        os.remove(cache.index.filename)
+        assert cache.rebuild_index() == 1
+        assert len(index.load()) == 1
+
+    with config.change_flags(
+        cmodule__index=False
+    ), tempfile.TemporaryDirectory() as dir_name:
+        cache = ModuleCache(dir_name)
+        assert not os.path.exists(cache.index.filename)
+
+
+def test_compile_modules():
+    x = vector("x")
+    outs = [at.exp(x), at.sin(x), at.cos(x), at.exp(x) + 1]
+
+    with tempfile.TemporaryDirectory() as dir_name:
+        cache = ModuleCache(dir_name)
+        compiledir_prop = aesara.config._config_var_dict["compiledir"]
+        with patch.object(compiledir_prop, "val", dir_name, create=True), patch.object(
+            aesara.link.c.cmodule, "_module_cache", cache
+        ), config.change_flags(cmodule__compile_workers=4):
+            linkers = [
+                CLinker().accept(FunctionGraph([x], [out], clone=True))
+                for out in outs[:3]
+            ]
+            # Equivalent linkers share a module
+            linkers.append(CLinker().accept(FunctionGraph([x], [outs[0]])))
+            assert cache.compile_modules(linkers) == 3
+            assert cache.stats[2] == 3
+
+            # The modules are found in the cache
+            for lnk in linkers:
+                lnk.make_thunk()
+            assert cache.stats[2] == 3
+            assert cache.compile_modules(linkers) == 0
+
+            # The linkers that make one thunk per node compile all their
+            # missing modules in parallel
+            n_compiled = []
+
+            def compile_modules(linkers):
+                n_compiled.append(ModuleCache.compile_modules(cache, linkers))
+                return n_compiled[-1]
+
+            with patch.object(cache, "compile_modules", compile_modules):
+                f = function([x], outs, mode=Mode(linker="cvm", optimizer=None))
+            assert len(n_compiled) == 1
+            assert n_compiled[0] > 1
+            assert cache.stats[2] == 3 + n_compiled[0]
+            assert np.allclose(f(np.zeros(2, dtype=x.dtype))[3], 2)
+
+
+def test_clear_lru():
+    x = vector("x")
+    outs = [at.exp(x), at.sin(x), at.cos(x)]
+
+    with tempfile.TemporaryDirectory() as dir_name:
+        cache = ModuleCache(dir_name)
+        entries = []
+        for i, out in enumerate(outs):
+            lnk = CLinker().accept(FunctionGraph([x], [out]))
+            key = lnk.cmodule_key()
+            cache.module_from_key(key, lnk)
+            entries.append(cache.entry_from_key[key])
+            os.utime(entries[-1], (i, i))
+
+        # The modules loaded by the process aren't deleted
+        assert cache.clear_lru(max_entries=1) == (0, 0)
+
+        # An unversioned module, more recent than the others
+        unversioned_dir = tempfile.mkdtemp(dir=dir_name)
+        with open(os.path.join(unversioned_dir, "mod.so"), "wb") as f:
+            f.write(b"\0" * 10)
+
+        # The statistics are saved without the compilation lock
+        with patch.object(aesara.link.c.cmodule, "lock_ctx", None):
+            cache.save_stats()
+            assert cache.load_stats() == dict(hits=0, loads=0, compiles=3)
+            cache.save_stats()
+            assert cache.load_stats()["compiles"] == 3
+
+        # The statistics of the previous processes are merged, even when no
+        # module is evicted
+        assert len(cache._stats_files()) == 1
+        cache = ModuleCache(dir_name)
+        assert not cache._stats_files()
+        assert cache.load_stats()["compiles"] == 3
+        assert cache.clear_lru(max_size=0, max_entries=0) == (0, 0)
+        cache.stats[2] += 1
+        cache.save_stats()
+        assert len(cache._stats_files()) == 1
+
+        n_removed, n_bytes = cache.clear_lru(max_entries=2)
+        assert not cache._stats_files()
+        assert cache.load_stats() == dict(hits=0, loads=0, compiles=4)
+        assert n_removed == 2
+        assert n_bytes > 10
+        assert not os.path.exists(unversioned_dir)
+        assert not os.path.exists(entries[0])
+        assert os.path.exists(entries[1])
+        assert entries[0] not in cache.entry_from_key.values()
+
+        n_removed, n_bytes = cache.clear_lru(max_size=1e-6)
+        assert n_removed == 2
+        assert not cache.entry_from_key
+
+
 def test_flag_detection():
     """
     TODO FIXME: This is a very poor test.
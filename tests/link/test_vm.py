@@ -15,9 +15,9 @@ from aesara.ifelse import ifelse
 from aesara.link.c.basic import OpWiseCLinker
 from aesara.link.c.exceptions import MissingGXX
 from aesara.link.utils import map_storage
-from aesara.link.vm import VM, Loop, Stack, VMLinker
-from aesara.tensor.math import cosh, tanh
-from aesara.tensor.type import lscalar, scalar, scalars, vector, vectors
+from aesara.link.vm import VM, Loop, Parallel, Stack, VMLinker, calculate_storage_plan
+from aesara.tensor.math import add, cosh, dot, exp, tanh
+from aesara.tensor.type import lscalar, matrix, scalar, scalars, vector, vectors
 from aesara.tensor.var import TensorConstant
 from tests import unittest_tools as utt
 
@@ -348,6 +348,75 @@ def test_reallocation():
         assert len({id(v) for v in storage_map.values()}) < len(storage_map)
 
 
+def test_calculate_storage_plan():
+    x = vector("x")
+    a = exp(x)
+    b = exp(a)
+    c = exp(b)
+    d = exp(c)
+    fg = FunctionGraph([x], [d], clone=False)
+    order = fg.toposort()
+
+    plan = calculate_storage_plan(order, fg)
+    # `a` is dead once `b` is computed, so `c` can use its buffer
+    assert plan[a] is a
+    assert plan[b] is b
+    assert plan[c] is a
+    assert d not in plan
+
+    # The users of `a` must be among the last `window` nodes
+    assert calculate_storage_plan(order, fg, window=2)[c] is a
+    assert calculate_storage_plan(order, fg, window=1)[c] is c
+
+    # A view extends the lifetime of the variable it views
+    fg = FunctionGraph([x], [exp(exp(x)[::-1]) + x], clone=True)
+    order = fg.toposort()
+    plan = calculate_storage_plan(order, fg)
+    view = next(n.outputs[0] for n in order if n.op.view_map)
+    assert view not in plan
+    assert len(set(plan.values())) == len(plan)
+
+
+@pytest.mark.parametrize(
+    "linker",
+    [
+        VMLinker(allow_gc=False, lazy=False, use_cloop=False),
+        VMLinker(allow_gc=True, lazy=False, use_cloop=False),
+        VMLinker(allow_gc=False, use_cloop=True),
+        VMLinker(allow_gc=True, use_cloop=True),
+    ],
+)
+def test_memory_planner(linker):
+    if linker.use_cloop and not config.cxx:
+        pytest.skip("G++ not available, so we need to skip this test.")
+
+    x = vector("x")
+    z = x
+    for i in range(6):
+        z = exp(z) + i
+    mode = Mode(linker=linker, optimizer="fast_compile")
+    x_val = np.linspace(0, 0.1, 5).astype(config.floatX)
+
+    with config.change_flags(vm__memory_planner=False):
+        f = function([x], z, mode=mode)
+    with config.change_flags(vm__memory_planner=True):
+        f_planned = function([x], z, mode=mode)
+
+    n_cells = len({id(v) for v in f.vm.storage_map.values()})
+    assert len({id(v) for v in f_planned.vm.storage_map.values()}) < n_cells
+    for _ in range(2):
+        utt.assert_allclose(f(x_val), f_planned(x_val))
+
+
+def test_memory_planner_lazy():
+    x = scalar("x")
+    z = ifelse(x > 0, exp(exp(x)), exp(-x))
+    with config.change_flags(vm__memory_planner=True):
+        f = function([x], z, mode=Mode(linker=VMLinker(), optimizer="fast_compile"))
+    assert len({id(v) for v in f.vm.storage_map.values()}) == len(f.vm.storage_map)
+    assert np.isclose(f(1.0), np.exp(np.exp(1.0)))
+
+
 @pytest.mark.skipif(
     not config.cxx, reason="G++ not available, so we need to skip this test."
 )
@@ -544,3 +613,87 @@ def test_Stack_updates():
 
     assert res == [np.array(1.0), np.array(2.0)]
     assert storage_map[a][0] == np.array(2.0)
+
+
+@pytest.mark.parametrize("allow_gc", [True, False])
+@pytest.mark.parametrize("c_thunks", [True, False])
+def test_Parallel(allow_gc, c_thunks):
+    if c_thunks and not config.cxx:
+        pytest.skip("G++ not available, so we need to skip this test.")
+
+    x = matrix("x")
+    branches = [tanh(dot(x, x + i)) for i in range(4)]
+    z = add(*branches)
+    linker = VMLinker(allow_gc=allow_gc, c_thunks=c_thunks, parallel=True)
+    f = function([x], [z, branches[0]], mode=Mode(linker=linker))
+    assert isinstance(f.vm, Parallel)
+
+    x_val = np.linspace(0, 1, 16).reshape(4, 4).astype(config.floatX)
+    f_ref = function([x], [z, branches[0]], mode=Mode(linker="vm"))
+    with config.change_flags(vm__parallel_threads=3):
+        for _ in range(3):
+            for res, exp_res in zip(f(x_val), f_ref(x_val)):
+                utt.assert_allclose(res, exp_res)
+
+    if allow_gc:
+        assert all(
+            f.vm.storage_map[node.outputs[0]][0] is None
+            for node in f.vm.nodes
+            if node.outputs[0] not in f.maker.fgraph.outputs
+        )
+
+
+def test_Parallel_orderings():
+    x = vector("x")
+    a = exp(x)
+    b = a * 2
+    c = a + 1
+    f = function([x], [b.sum(), c], mode=Mode(linker="vm_parallel"))
+
+    destroyers = [node for node in f.vm.nodes if node.op.destroy_map]
+    assert destroyers
+    for destroyer in destroyers:
+        destroyed = destroyer.inputs[destroyer.op.destroy_map[0][0]]
+        idx = f.vm.nodes.index(destroyer)
+        for client, _ in f.maker.fgraph.clients[destroyed]:
+            if client is not destroyer:
+                assert idx in f.vm.dependents[f.vm.nodes.index(client)]
+
+    x_val = np.arange(5).astype(config.floatX)
+    b_val, c_val = f(x_val)
+    utt.assert_allclose(b_val, (np.exp(x_val) * 2).sum())
+    utt.assert_allclose(c_val, np.exp(x_val) + 1)
+
+
+def test_Parallel_exception():
+    class BadOp(Op):
+        def perform(self, node, inputs, outputs):
+            raise ValueError("bad Op")
+
+        def make_node(self, x):
+            return Apply(self, [x], [x.type()])
+
+    a = vector("a")
+    z = add(BadOp()(exp(a)), exp(a + 1), exp(a + 2))
+    f = function([a], z, mode=Mode(optimizer=None, linker="vm_parallel"))
+
+    with config.change_flags(vm__parallel_threads=2):
+        with pytest.raises(ValueError, match=".*Apply node that caused the error.*"):
+            f(np.ones(3, dtype=config.floatX))
+
+
+@pytest.mark.parametrize("linker", ["vm", "vm_parallel"])
+def test_Parallel_speed(linker, benchmark):
+    # Independent branches, such as the members of an ensemble, can run
+    # concurrently with `Parallel`
+    x = matrix("x")
+    z = add(*(tanh(dot(x, x + i)).sum() for i in range(16)))
+    f = function([x], z, mode=Mode(linker=linker))
+    if linker == "vm_parallel":
+        assert isinstance(f.vm, Parallel)
+        # The C thunks would hold the GIL
+        assert f.maker.linker.c_thunks is False
+
+    x_val = np.random.default_rng(23).random((256, 256)).astype(config.floatX)
+    f.trust_input = True
+    benchmark(f, x_val)
@@ -301,9 +301,16 @@ class TestScan:
         scan_op_clone = scan_op.clone()
         assert scan_op_clone is not scan_op
         assert scan_op_clone.fgraph is not scan_op.fgraph
-        assert scan_op_clone.fgraph.outputs != scan_op.fgraph.outputs
         assert equal_computations(scan_op_clone.fgraph.outputs, scan_op.fgraph.outputs)
 
+        # The inner graphs are shared until one of them is changed
+        out = scan_op.fgraph.outputs[0]
+        scan_op_clone.fgraph.replace(out.owner.inputs[0], out.owner.inputs[0] + 1)
+        assert scan_op.fgraph.outputs[0] is out
+        assert not equal_computations(
+            scan_op_clone.fgraph.outputs, scan_op.fgraph.outputs
+        )
+
     @pytest.mark.skipif(
         isinstance(get_default_mode(), DebugMode),
         reason="This test fails in DebugMode, because it is not yet picklable.",
@@ -9,6 +9,7 @@ from aesara.compile.function import function
 from aesara.compile.mode import get_default_mode, get_mode
 from aesara.compile.ops import deep_copy_op
 from aesara.configdefaults import config
+from aesara.gradient import grad
 from aesara.graph.basic import Apply, Variable, equal_computations
 from aesara.graph.fg import FunctionGraph
 from aesara.graph.op import Op
@@ -44,6 +45,7 @@ from aesara.tensor.type import (
     tensor4,
     vector,
 )
+from benchmarks.compile_time import FAMILIES
 from tests import unittest_tools as utt
 
 
@@ -396,6 +398,142 @@ class TestShapeI(utt.InferShapeTester):
         self._compile_and_check([admat], [Shape_i(1)(admat)], [admat_val], Shape_i)
 
 
+def test_lazy_ShapeFeature():
+    def make_fgraph(lazy):
+        x = matrix("x")
+        y = exp(x)
+        z = y.sum(axis=0) + 1
+        fgraph = FunctionGraph([x], [z], clone=False)
+        shape_feature = ShapeFeature(lazy=lazy)
+        fgraph.attach_feature(shape_feature)
+        return fgraph, shape_feature
+
+    fgraph, shape_feature = make_fgraph(True)
+    eager_fgraph, eager_feature = make_fgraph(False)
+    x = fgraph.inputs[0]
+    z = fgraph.outputs[0]
+    y = z.owner.inputs[0].owner.inputs[0]
+
+    assert set(shape_feature.lazy_nodes) == fgraph.apply_nodes
+    assert len(shape_feature.shape_of) == 0
+    assert y in shape_feature.shape_of
+
+    # Only the shapes `y` depends on are computed
+    assert len(shape_feature.shape_of[y]) == 2
+    assert y.owner not in shape_feature.lazy_nodes
+    assert z.owner in shape_feature.lazy_nodes
+    assert x in shape_feature.shape_of.keys()
+    assert z not in shape_feature.shape_of.keys()
+
+    assert equal_computations(
+        shape_feature.shape_of[z],
+        eager_feature.shape_of[eager_fgraph.outputs[0]],
+        [x],
+        eager_fgraph.inputs,
+    )
+    assert len(shape_feature.lazy_nodes) == 0
+
+    # Replacements are tracked as in the eager mode
+    w = exp(x) * 2
+    fgraph.replace(y, w)
+    assert equal_computations(shape_feature.shape_of[w], shape_feature.shape_of[y])
+
+
+def test_lazy_ShapeFeature_replace():
+    x = matrix("x")
+    y = matrix("y")
+    x_exp = exp(x)
+    fgraph = FunctionGraph([x, y], [x_exp.sum()], clone=False)
+    shape_feature = ShapeFeature(lazy=True)
+    fgraph.attach_feature(shape_feature)
+
+    # The shapes aren't needed by the replacement, so they aren't computed
+    y_exp = exp(y)
+    fgraph.replace(x_exp, y_exp)
+    assert len(shape_feature.shape_of) == 0
+    assert [r for _, r in shape_feature.merges[y_exp]] == [x_exp]
+    assert y_exp.owner in shape_feature.lazy_nodes
+
+    # `x_exp`'s shape is used when `y_exp`'s is needed, as in the eager mode
+    assert equal_computations(
+        shape_feature.shape_of[y_exp], [Shape_i(0)(x), Shape_i(1)(x)]
+    )
+    assert x_exp in shape_feature.shape_of.keys()
+    assert y_exp.owner not in shape_feature.lazy_nodes
+
+    # The replaced inputs were put back
+    assert fgraph.outputs[0].owner.inputs == [y_exp]
+
+
+def test_lazy_ShapeFeature_rewrites():
+    x = matrix("x")
+    y = vector("y")
+    out = (exp(x) + y).shape[1] + shape(x.T)[0] + (x + 1).sum(axis=1).shape[0]
+
+    res = []
+    for lazy in (False, True):
+        with config.change_flags(tensor__lazy_shape_feature=lazy):
+            res.append(
+                rewrite_graph(
+                    FunctionGraph([x, y], [out]), include=("canonicalize", "ShapeOpt")
+                )
+            )
+
+    eager_fgraph, lazy_fgraph = res
+    assert equal_computations(
+        lazy_fgraph.outputs,
+        eager_fgraph.outputs,
+        lazy_fgraph.inputs,
+        eager_fgraph.inputs,
+    )
+
+
+def reshape_graph():
+    """A graph whose inputs and shapes are changed by the rewrites."""
+    x = matrix("x")
+    y = matrix("y")
+    v = vector("v")
+    z = exp(x) * y + at.alloc(0.0, x.shape[0], x.shape[1])
+    w = at.dot(z, z.T).sum(0) + v
+    r = reshape(w, (w.shape[0], 1)) + x[:, :1]
+    return [x, y, v], [r, z.shape, *grad(r.sum() + (z**2).sum(), [x, y])]
+
+
+@pytest.mark.parametrize(
+    "build, params",
+    [
+        (reshape_graph, {}),
+        (FAMILIES["deep_mlp"][0], {"depth": 3, "width": 4}),
+        (FAMILIES["wide_elemwise"][0], {"width": 16}),
+        (FAMILIES["nested_scans"][0], {"n_scans": 1}),
+        (FAMILIES["sparse_model"][0], {"n_layers": 3, "width": 4}),
+        (FAMILIES["constant_folding"][0], {"size": 10, "n_ops": 12}),
+    ],
+    ids=[
+        "reshape_graph",
+        "deep_mlp",
+        "wide_elemwise",
+        "nested_scans",
+        "sparse_model",
+        "constant_folding",
+    ],
+)
+def test_lazy_ShapeFeature_fast_run(build, params):
+    fgraphs = []
+    for lazy in (False, True):
+        with config.change_flags(tensor__lazy_shape_feature=lazy):
+            fn = function(*build(**params), mode="FAST_RUN")
+        fgraphs.append(fn.maker.fgraph)
+
+    eager_fgraph, lazy_fgraph = fgraphs
+    assert equal_computations(
+        lazy_fgraph.outputs,
+        eager_fgraph.outputs,
+        lazy_fgraph.inputs,
+        eager_fgraph.inputs,
+    )
+
+
 class TestSameShape:
     def test_scalar(self):
         x = scalar()